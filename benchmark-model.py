@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Load testing and benchmark harness for the AI4Bharat model and dashboard server
+
+Replays a JSONL corpus against either the KServe predict endpoint or the
+frontend server's /api/translate, closed-loop (fixed concurrency) or open-loop
+(fixed arrival rate), and reports latency percentiles, throughput and
+error/fallback rates per language pair.
+
+Examples:
+    # Against a stand-in model started in-process (no cluster needed, e.g. in CI)
+    python benchmark-model.py --local-model --requests 500 --concurrency 16
+
+    # Against the dashboard server, open-loop at 50 req/s for 30 seconds
+    python benchmark-model.py --target server --url http://localhost:5000 --rate 50 --duration 30
+
+    # Replay a JSONL corpus whose text lives in the "body" field
+    python benchmark-model.py --url http://localhost:8080 --corpus requests.jsonl --text-field body
+
+    # Run only the stand-in model so frontend/server.py can be pointed at it
+    python benchmark-model.py --serve-model --port 8080
+"""
+
+import argparse
+import itertools
+import json
+import math
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_MODEL_NAME = "ai4bharat-bert"
+
+# Used when no corpus is given, same sentences test-model.py sends
+DEFAULT_CORPUS = [
+    {"text": "नमस्ते, कैसे हो आप?", "source_language": "hi", "target_language": "en"},
+    {"text": "Hello, how are you?", "source_language": "en", "target_language": "hi"},
+    {"text": "வணக்கம், எப்படி இருக்கிறீர்கள்?", "source_language": "ta", "target_language": "en"},
+    {"text": "नमस्कार, तुम्ही कसे आहात?", "source_language": "mr", "target_language": "en"},
+]
+
+
+# ---------------------------------------------------------------------------
+# Stand-in model server
+# ---------------------------------------------------------------------------
+
+class StandInModelHandler(BaseHTTPRequestHandler):
+    """Minimal KServe V1 protocol server that echoes tagged translations"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+    model_name = DEFAULT_MODEL_NAME
+    latency_ms = 20.0
+    per_instance_ms = 2.0
+    error_rate = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, body, status=200):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == f"/v1/models/{self.model_name}":
+            self._send_json({"name": self.model_name, "ready": True})
+        else:
+            self._send_json({"error": "Not found"}, 404)
+
+    def do_POST(self):
+        base = f"/v1/models/{self.model_name}"
+        if self.path not in (f"{base}:predict", f"{base}/predict"):
+            self._send_json({"error": "Not found"}, 404)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            instances = payload["instances"]
+        except (ValueError, KeyError):
+            self._send_json({"error": "Expected {'instances': [...]}"}, 400)
+            return
+
+        # Fixed cost per call plus a per-instance cost, with some jitter
+        delay = (self.latency_ms + self.per_instance_ms * len(instances)) / 1000.0
+        time.sleep(delay * random.uniform(0.8, 1.2))
+
+        if self.error_rate and random.random() < self.error_rate:
+            self._send_json({"error": "Injected failure"}, 503)
+            return
+
+        target = payload.get("target_language", "en")
+        self._send_json({
+            "predictions": [
+                {"translation": f"[{target}] {text}", "confidence": 0.9}
+                for text in instances
+            ]
+        })
+
+
+def start_stand_in_model(host="127.0.0.1", port=0, model_name=DEFAULT_MODEL_NAME,
+                         latency_ms=20.0, per_instance_ms=2.0, error_rate=0.0):
+    """Start the stand-in model in a background thread and return (server, base_url)"""
+    handler = type("ConfiguredStandInModelHandler", (StandInModelHandler,), {
+        "model_name": model_name,
+        "latency_ms": latency_ms,
+        "per_instance_ms": per_instance_ms,
+        "error_rate": error_rate,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stand-in-model", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+# ---------------------------------------------------------------------------
+# Corpus and requests
+# ---------------------------------------------------------------------------
+
+def load_corpus(path, text_field="text", source_language="auto", target_language="en"):
+    """Load JSONL records into request items, skipping lines without text"""
+    if not path:
+        return list(DEFAULT_CORPUS)
+
+    items = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            text = record.get(text_field) if isinstance(record, dict) else record
+            if not isinstance(text, str) or not text.strip():
+                continue
+            items.append({
+                "text": text,
+                "source_language": record.get("source_language", source_language)
+                if isinstance(record, dict) else source_language,
+                "target_language": record.get("target_language", target_language)
+                if isinstance(record, dict) else target_language,
+            })
+    return items
+
+
+class RequestSender:
+    """Sends one corpus item to the chosen target and classifies the outcome"""
+
+    def __init__(self, target, url, model_name, timeout, pool_size):
+        self.target = target
+        self.url = url.rstrip("/")
+        self.model_name = model_name
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def send(self, item):
+        """Return (ok, fallback, error) for one request"""
+        try:
+            if self.target == "kserve":
+                payload = {"instances": [item["text"]]}
+                if item["source_language"] != "auto":
+                    payload["source_language"] = item["source_language"]
+                payload["target_language"] = item["target_language"]
+                response = self.session.post(
+                    f"{self.url}/v1/models/{self.model_name}:predict", json=payload, timeout=self.timeout)
+                if response.status_code != 200:
+                    return False, False, f"HTTP {response.status_code}"
+                return True, False, None
+
+            response = self.session.post(f"{self.url}/api/translate", json=item, timeout=self.timeout)
+            if response.status_code != 200:
+                return False, False, f"HTTP {response.status_code}"
+            data = response.json()
+            if not data.get("success"):
+                return False, False, data.get("error", "unsuccessful")
+            source = str(data.get("source", ""))
+            fallback = source.startswith("fallback") or str(data.get("translation", "")).startswith("[MOCK]")
+            return True, fallback, None
+
+        except requests.exceptions.Timeout:
+            return False, False, "timeout"
+        except requests.exceptions.RequestException as e:
+            return False, False, type(e).__name__
+        except ValueError:
+            return False, False, "invalid JSON"
+
+
+# ---------------------------------------------------------------------------
+# Load generation
+# ---------------------------------------------------------------------------
+
+class Recorder:
+    """Collects per-request samples from worker threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = []
+
+    def record(self, item, latency, ok, fallback, error):
+        pair = f"{item['source_language']}-{item['target_language']}"
+        with self.lock:
+            self.samples.append((pair, latency, ok, fallback, error))
+
+
+def run_closed_loop(sender, items, recorder, concurrency, total_requests, duration):
+    """Each worker sends its next request as soon as the previous one returns"""
+    counter = itertools.count()
+    deadline = time.perf_counter() + duration if duration else None
+
+    def worker():
+        while True:
+            index = next(counter)
+            if total_requests is not None and index >= total_requests:
+                return
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            item = items[index % len(items)]
+            start = time.perf_counter()
+            ok, fallback, error = sender.send(item)
+            recorder.record(item, time.perf_counter() - start, ok, fallback, error)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_open_loop(sender, items, recorder, rate, total_requests, duration, max_outstanding, arrival):
+    """
+    Requests are issued on a fixed schedule regardless of how fast responses come
+    back. Latency is measured from the scheduled send time, so queueing delay
+    under overload is not hidden (no coordinated omission).
+    """
+    if total_requests is None:
+        total_requests = int(rate * duration)
+
+    def timed_send(item, scheduled):
+        ok, fallback, error = sender.send(item)
+        recorder.record(item, time.perf_counter() - scheduled, ok, fallback, error)
+
+    start = time.perf_counter()
+    next_time = start
+    with ThreadPoolExecutor(max_workers=max_outstanding) as executor:
+        for index in range(total_requests):
+            now = time.perf_counter()
+            if next_time > now:
+                time.sleep(next_time - now)
+            executor.submit(timed_send, items[index % len(items)], next_time)
+            gap = random.expovariate(rate) if arrival == "poisson" else 1.0 / rate
+            next_time += gap
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples, elapsed):
+    groups = {"all": samples}
+    for sample in samples:
+        groups.setdefault(sample[0], []).append(sample)
+
+    report = {}
+    for name, group in groups.items():
+        latencies = sorted(sample[1] * 1000 for sample in group if sample[2])
+        errors = [sample[4] for sample in group if not sample[2]]
+        count = len(group)
+        report[name] = {
+            "requests": count,
+            "errors": len(errors),
+            "error_rate": len(errors) / count if count else 0.0,
+            "fallbacks": sum(1 for sample in group if sample[3]),
+            "fallback_rate": sum(1 for sample in group if sample[3]) / count if count else 0.0,
+            "throughput_rps": count / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 0.50),
+            "p95_ms": percentile(latencies, 0.95),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": latencies[-1] if latencies else 0.0,
+            "error_kinds": {kind: errors.count(kind) for kind in set(errors)},
+        }
+    return report
+
+
+def print_report(report, elapsed):
+    print(f"\n📊 Results ({elapsed:.2f}s)")
+    header = f"{'pair':<12}{'reqs':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'err %':>8}{'fallback %':>12}"
+    print(header)
+    print("-" * len(header))
+    names = ["all"] + sorted(name for name in report if name != "all")
+    for name in names:
+        row = report[name]
+        print(f"{name:<12}{row['requests']:>8}{row['throughput_rps']:>9.1f}"
+              f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+              f"{row['error_rate'] * 100:>8.1f}{row['fallback_rate'] * 100:>12.1f}")
+    if report["all"]["error_kinds"]:
+        print(f"\n❌ Errors: {report['all']['error_kinds']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the AI4Bharat model or dashboard server")
+    parser.add_argument("--target", choices=["kserve", "server"], default="kserve",
+                        help="kserve: POST /v1/models/<name>:predict, server: POST /api/translate")
+    parser.add_argument("--url", help="Base URL of the model or dashboard server")
+    parser.add_argument("--model-name", default=DEFAULT_MODEL_NAME)
+    parser.add_argument("--corpus", help="JSONL file to replay (defaults to built-in sample sentences)")
+    parser.add_argument("--text-field", default="text", help="JSONL field holding the text to translate")
+    parser.add_argument("--source-language", default="auto", help="Used when a record has no source_language")
+    parser.add_argument("--target-language", default="en", help="Used when a record has no target_language")
+    parser.add_argument("--concurrency", type=int, default=8, help="Closed-loop workers")
+    parser.add_argument("--rate", type=float, help="Open-loop arrival rate in requests/second")
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default="poisson")
+    parser.add_argument("--max-outstanding", type=int, default=256, help="Open-loop cap on in-flight requests")
+    parser.add_argument("--requests", type=int, help="Total requests to send")
+    parser.add_argument("--duration", type=float, help="Seconds to run (when --requests is not given)")
+    parser.add_argument("--warmup", type=int, default=0, help="Requests sent before measuring")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--json", dest="json_output", help="Write the report as JSON to this file")
+    parser.add_argument("--max-error-rate", type=float,
+                        help="Exit non-zero if the overall error rate exceeds this fraction (for CI)")
+    parser.add_argument("--local-model", action="store_true",
+                        help="Start the stand-in model in-process and benchmark it")
+    parser.add_argument("--serve-model", action="store_true", help="Only run the stand-in model server")
+    parser.add_argument("--port", type=int, default=8080, help="Port for --serve-model")
+    parser.add_argument("--model-latency-ms", type=float, default=20.0, help="Stand-in model base latency")
+    parser.add_argument("--model-error-rate", type=float, default=0.0, help="Stand-in model injected 503 rate")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.serve_model:
+        server, url = start_stand_in_model(
+            "0.0.0.0", args.port, args.model_name, args.model_latency_ms, error_rate=args.model_error_rate)
+        print(f"🧪 Stand-in model '{args.model_name}' listening on port {args.port}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+        return 0
+
+    if args.local_model:
+        _, args.url = start_stand_in_model(
+            model_name=args.model_name, latency_ms=args.model_latency_ms, error_rate=args.model_error_rate)
+        args.target = "kserve"
+    elif not args.url:
+        print("💡 Pass --url <service-url>, or --local-model to benchmark the stand-in model")
+        return 2
+
+    if args.requests is None and args.duration is None:
+        args.requests = 200
+
+    items = load_corpus(args.corpus, args.text_field, args.source_language, args.target_language)
+    if not items:
+        print("❌ Corpus is empty")
+        return 2
+
+    pool_size = args.max_outstanding if args.rate else args.concurrency
+    sender = RequestSender(args.target, args.url, args.model_name, args.timeout, pool_size)
+
+    mode = f"open-loop {args.rate:g} req/s ({args.arrival})" if args.rate else f"closed-loop x{args.concurrency}"
+    amount = f"{args.requests} requests" if args.requests is not None else f"{args.duration:g}s"
+    print("🧪 AI4Bharat benchmark")
+    print("=" * 40)
+    print(f"🎯 Target: {args.target} @ {args.url}")
+    print(f"📚 Corpus: {len(items)} items, {len(set((i['source_language'], i['target_language']) for i in items))} language pairs")
+    print(f"🚦 Load: {mode}, {amount}")
+
+    if args.warmup:
+        run_closed_loop(sender, items, Recorder(), min(args.concurrency, args.warmup), args.warmup, None)
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    if args.rate:
+        run_open_loop(sender, items, recorder, args.rate, args.requests, args.duration,
+                      args.max_outstanding, args.arrival)
+    else:
+        run_closed_loop(sender, items, recorder, args.concurrency, args.requests, args.duration)
+    elapsed = time.perf_counter() - started
+
+    report = summarize(recorder.samples, elapsed)
+    print_report(report, elapsed)
+
+    if args.json_output:
+        with open(args.json_output, "w", encoding="utf-8") as f:
+            json.dump({"elapsed_seconds": elapsed, "args": vars(args), "results": report}, f, indent=2)
+        print(f"\n💾 Report written to {args.json_output}")
+
+    if args.max_error_rate is not None and report["all"]["error_rate"] > args.max_error_rate:
+        print(f"\n❌ Error rate {report['all']['error_rate']:.1%} exceeds {args.max_error_rate:.1%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
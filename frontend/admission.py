@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Admission Control for AI4Bharat Dashboard
+Bounded, priority-aware concurrency in front of the model and per-client token-bucket
+rate limits, so overload is turned into fast 429/503 answers instead of queued timeouts
+and bulk work cannot starve interactive dashboard calls
+"""
+
+import asyncio
+import collections
+import hashlib
+import math
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is turned away; carries the HTTP status and a Retry-After hint"""
+
+    def __init__(self, status_code, reason, retry_after):
+        messages = {
+            'queue_full': 'Server is at capacity, try again shortly',
+            'queue_timeout': 'Timed out waiting for model capacity',
+            'rate_limited': 'Rate limit exceeded'
+        }
+        super().__init__(messages.get(reason, reason))
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = max(1, int(math.ceil(retry_after)))
+
+
+# Scheduling classes in front of the model, most urgent first
+PRIORITIES = ('interactive', 'bulk', 'background')
+DEFAULT_WEIGHTS = {'interactive': 8.0, 'bulk': 2.0, 'background': 1.0}
+
+
+def parse_weights(spec):
+    """Parse 'interactive=8,bulk=2,background=1' into a weights dict"""
+    weights = {}
+    for part in (spec or '').split(','):
+        if not part.strip():
+            continue
+        name, _, value = part.partition('=')
+        if name.strip() not in PRIORITIES:
+            raise ValueError(f"Unknown priority class '{name.strip()}', expected one of {PRIORITIES}")
+        weights[name.strip()] = float(value)
+    return weights
+
+
+class _LimiterBase:
+    """
+    Shared bookkeeping and scheduling for the thread and asyncio limiters.
+    Waiters queue per priority class; a freed slot goes to the class with the lowest
+    stride-scheduling pass value, so busy classes share slots in proportion to their
+    weights. The last interactive_reserve slots are only ever given to interactive calls.
+    """
+
+    def __init__(self, max_in_flight=32, max_queue=64, queue_timeout=2.0, weights=None,
+                 interactive_reserve=4, queue_timeouts=None, on_queue=None, on_admit=None):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.interactive_reserve = min(max(0, interactive_reserve), self.max_in_flight - 1)
+        self.queue_timeouts = {priority: queue_timeout for priority in PRIORITIES}
+        self.queue_timeouts.update(queue_timeouts or {})
+        # on_queue(priority, delta) and on_admit(priority, waited_seconds) feed metrics
+        self.on_queue = on_queue
+        self.on_admit = on_admit
+
+        self.in_flight = 0
+        # EWMA of how long a slot is held, used to suggest Retry-After
+        self.avg_hold = 0.0
+        self._queues = {priority: collections.deque() for priority in PRIORITIES}
+        self._pass = {priority: 0.0 for priority in PRIORITIES}
+        self._virtual_time = 0.0
+        self.stats = {
+            'admitted': 0,
+            'queued': 0,
+            'rejected_queue_full': 0,
+            'rejected_queue_timeout': 0
+        }
+        self.class_stats = {
+            priority: {'admitted': 0, 'queued': 0, 'rejected': 0, 'in_flight': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0}
+            for priority in PRIORITIES
+        }
+
+    @staticmethod
+    def _check_priority(priority):
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority class '{priority}', expected one of {PRIORITIES}")
+        return priority
+
+    def _eligible(self, priority):
+        limit = self.max_in_flight if priority == 'interactive' else self.max_in_flight - self.interactive_reserve
+        return self.in_flight < limit
+
+    def _enqueue(self, priority, waiter):
+        queue = self._queues[priority]
+        if not queue:
+            # A class that was idle rejoins at the current virtual time instead of spending saved credit
+            self._pass[priority] = max(self._pass[priority], self._virtual_time)
+        queue.append(waiter)
+        self.stats['queued'] += 1
+        self.class_stats[priority]['queued'] += 1
+        if self.on_queue is not None:
+            self.on_queue(priority, 1)
+
+    def _dequeued(self, priority):
+        if self.on_queue is not None:
+            self.on_queue(priority, -1)
+
+    def _next_class(self):
+        """Eligible class with queued waiters and the lowest pass, charged for one slot"""
+        chosen = None
+        for priority, queue in self._queues.items():
+            if queue and self._eligible(priority) and (chosen is None or self._pass[priority] < self._pass[chosen]):
+                chosen = priority
+        if chosen is not None:
+            self._virtual_time = self._pass[chosen]
+            self._pass[chosen] += 1.0 / self.weights[chosen]
+        return chosen
+
+    def _admit(self, priority, waited):
+        self.in_flight += 1
+        self.stats['admitted'] += 1
+        stats = self.class_stats[priority]
+        stats['admitted'] += 1
+        stats['in_flight'] += 1
+        stats['wait_seconds'] += waited
+        stats['max_wait_seconds'] = max(stats['max_wait_seconds'], waited)
+        if self.on_admit is not None:
+            self.on_admit(priority, waited)
+
+    def _release(self, priority, held):
+        self.in_flight -= 1
+        self.class_stats[priority]['in_flight'] -= 1
+        self._record_hold(held)
+
+    def _record_hold(self, held):
+        self.avg_hold = held if not self.avg_hold else 0.8 * self.avg_hold + 0.2 * held
+
+    def _reject(self, reason, priority):
+        self.stats[f'rejected_{reason}'] += 1
+        self.class_stats[priority]['rejected'] += 1
+        # Time for the queue ahead of us to drain through the available slots
+        retry_after = self.avg_hold * (len(self._queues[priority]) + 1) / self.max_in_flight
+        return AdmissionRejected(503, reason, retry_after)
+
+    def _stats(self):
+        stats = dict(self.stats)
+        stats.update({
+            'in_flight': self.in_flight,
+            'waiting': sum(len(queue) for queue in self._queues.values()),
+            'max_in_flight': self.max_in_flight,
+            'max_queue': self.max_queue,
+            'queue_timeout': self.queue_timeout,
+            'interactive_reserve': self.interactive_reserve,
+            'avg_hold_ms': self.avg_hold * 1000,
+            'classes': {}
+        })
+        for priority, class_stats in self.class_stats.items():
+            admitted = class_stats['admitted']
+            stats['classes'][priority] = {
+                'weight': self.weights[priority],
+                'waiting': len(self._queues[priority]),
+                'in_flight': class_stats['in_flight'],
+                'admitted': admitted,
+                'queued': class_stats['queued'],
+                'rejected': class_stats['rejected'],
+                'avg_wait_ms': (class_stats['wait_seconds'] / admitted * 1000) if admitted else 0.0,
+                'max_wait_ms': class_stats['max_wait_seconds'] * 1000,
+                'queue_timeout': self.queue_timeouts[priority]
+            }
+        return stats
+
+
+class _Waiter:
+    __slots__ = ('event', 'granted', 'enqueued_at')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+        self.enqueued_at = time.monotonic()
+
+
+class ConcurrencyLimiter(_LimiterBase):
+    """At most max_in_flight holders; up to max_queue callers per class wait, the rest are rejected"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+
+    def acquire(self, priority='interactive'):
+        priority = self._check_priority(priority)
+        queue = self._queues[priority]
+        with self._lock:
+            # Callers already queued in this class go first, so a free slot is not grabbed past them
+            if self._eligible(priority) and not queue:
+                self._admit(priority, 0.0)
+                return
+            if len(queue) >= self.max_queue:
+                raise self._reject('queue_full', priority)
+            waiter = _Waiter()
+            self._enqueue(priority, waiter)
+
+        waiter.event.wait(self.queue_timeouts[priority])
+        with self._lock:
+            # A slot handed over just as the wait timed out still counts
+            if not waiter.granted:
+                queue.remove(waiter)
+                self._dequeued(priority)
+                raise self._reject('queue_timeout', priority)
+
+    def release(self, priority='interactive', held=0.0):
+        with self._lock:
+            self._release(priority, held)
+            while True:
+                chosen = self._next_class()
+                if chosen is None:
+                    return
+                # Hand the slot straight to the chosen waiter
+                waiter = self._queues[chosen].popleft()
+                self._dequeued(chosen)
+                waiter.granted = True
+                self._admit(chosen, time.monotonic() - waiter.enqueued_at)
+                waiter.event.set()
+
+    @contextmanager
+    def slot(self, priority='interactive'):
+        self.acquire(priority)
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self.release(priority, time.time() - start_time)
+
+    def get_stats(self):
+        with self._lock:
+            return self._stats()
+
+
+class AsyncConcurrencyLimiter(_LimiterBase):
+    """asyncio counterpart of ConcurrencyLimiter; freed slots are handed straight to the chosen waiter"""
+
+    async def acquire(self, priority='interactive'):
+        priority = self._check_priority(priority)
+        queue = self._queues[priority]
+        if self._eligible(priority) and not queue:
+            self._admit(priority, 0.0)
+            return
+        if len(queue) >= self.max_queue:
+            raise self._reject('queue_full', priority)
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (waiter, time.monotonic())
+        self._enqueue(priority, entry)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeouts[priority])
+        except asyncio.TimeoutError:
+            raise self._reject('queue_timeout', priority)
+        except asyncio.CancelledError:
+            # A slot handed over just as the caller went away must be passed on
+            if waiter.done() and not waiter.cancelled():
+                self.release(priority)
+            raise
+        finally:
+            if entry in queue:
+                queue.remove(entry)
+                self._dequeued(priority)
+
+    def release(self, priority='interactive', held=0.0):
+        self._release(priority, held)
+        while True:
+            chosen = self._next_class()
+            if chosen is None:
+                return
+            waiter, enqueued_at = self._queues[chosen].popleft()
+            self._dequeued(chosen)
+            if not waiter.done():
+                self._admit(chosen, time.monotonic() - enqueued_at)
+                waiter.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, priority='interactive'):
+        await self.acquire(priority)
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self.release(priority, time.time() - start_time)
+
+    def get_stats(self):
+        return self._stats()
+
+
+class RateLimiter:
+    """Token bucket per client key: `rate` tokens per second, bursts up to `burst`"""
+
+    def __init__(self, rate=10.0, burst=20, max_clients=10000):
+        self.rate = rate
+        self.burst = max(1.0, float(burst))
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        # key -> [tokens, last refill]; least recently seen clients are dropped first
+        self._buckets = collections.OrderedDict()
+        self.stats = {
+            'allowed': 0,
+            'limited': 0
+        }
+
+    def check(self, key, cost=1.0):
+        """Take `cost` tokens; returns 0.0 when allowed, else seconds until it would be"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [self.burst, now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens >= cost:
+                bucket[0] = tokens - cost
+                self.stats['allowed'] += 1
+                return 0.0
+            bucket[0] = tokens
+            self.stats['limited'] += 1
+        return (cost - tokens) / self.rate
+
+    def enforce(self, key, cost=1.0):
+        """Raise AdmissionRejected (429) when key is over its rate"""
+        wait = self.check(key, cost)
+        if wait > 0:
+            raise AdmissionRejected(429, 'rate_limited', wait)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['clients'] = len(self._buckets)
+        stats.update({
+            'rate': self.rate,
+            'burst': self.burst
+        })
+        return stats
+
+
+def client_identity(api_key=None, remote_addr=None, forwarded_for=None, trust_forwarded=False,
+                    trusted_hops=1):
+    """Rate-limit key: a hash of the API key when given, otherwise the client IP"""
+    if api_key:
+        return 'key:' + hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+    if trust_forwarded and forwarded_for:
+        # Clients can send any X-Forwarded-For they like, so only entries appended by our own
+        # proxies count: with N trusted proxies the client address is the Nth from the right
+        hops = [hop.strip() for hop in forwarded_for.split(',') if hop.strip()]
+        if trusted_hops >= 1 and len(hops) >= trusted_hops:
+            return 'ip:' + hops[-trusted_hops]
+    return 'ip:' + (remote_addr or 'unknown')
@@ -0,0 +1,906 @@
+#!/usr/bin/env python3
+"""
+AI4Bharat Async Frontend Server
+asyncio serving mode exposing the same routes as server.py. Model calls go through a
+non-blocking aiohttp client, so pending translations wait on the event loop instead
+of each holding an OS thread.
+
+Run directly:      python async_server.py
+Or under gunicorn: gunicorn async_server:create_app --worker-class aiohttp.GunicornWebWorker
+"""
+
+import asyncio
+import functools
+import itertools
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+import metrics
+import server
+import tracing
+from server import (
+    CONFIG, TRACED_ROUTES, ModelResponseError, add_translation_metadata, finish_trace, job_results_payload,
+    job_urls, limiter_options, memory_search_payload
+)
+from job_queue import JobNotFound
+from batching import AsyncMicroBatcher
+from coalescing import AsyncSingleFlight
+from model_pool import TRANSLATION_TASK, NoEndpointError
+from admission import AdmissionRejected, AsyncConcurrencyLimiter, client_identity
+from segmentation import merge_segment_results, segment_text
+from response_shaping import (
+    COMPRESSIBLE_TYPES, StreamCompressor, choose_encoding, compress, etag_for, etag_matches,
+    parse_shaping, shape_result
+)
+from bulk_translate import (
+    BulkInputError, aiter_jobs, aiter_jsonl_items, astream_translations, iter_json_items, iter_jobs
+)
+from mock_translations import fallback_engine, get_mock_translation, get_supported_languages, get_sample_texts
+
+STATIC_ROOT = Path(__file__).resolve().parent
+# Translation memory lines serialised per executor hop during an export
+EXPORT_CHUNK_LINES = 1000
+
+
+def connection_trace_config():
+    """aiohttp hooks that report connection-limit waits and new connections as trace spans"""
+    async def started(session, context, params):
+        context.started = time.perf_counter()
+
+    def ended(name):
+        async def on_end(session, context, params):
+            tracing.add_span(name, (time.perf_counter() - context.started) * 1000)
+        return on_end
+
+    config = aiohttp.TraceConfig()
+    config.on_connection_queued_start.append(started)
+    config.on_connection_queued_end.append(ended('conn_wait'))
+    config.on_connection_create_start.append(started)
+    config.on_connection_create_end.append(ended('connect'))
+    return config
+
+
+async def run_blocking(fn, *args):
+    """Run a blocking call (sqlite, journal I/O, fuzzy scoring) on the default executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, tracing.bind(fn), *args)
+
+
+class AsyncAI4BharatClient:
+    """
+    Non-blocking counterpart of AI4BharatClient. Cache, circuit breaker and health
+    monitor are shared with the sync client so both modes report the same state.
+    """
+
+    def __init__(self, sync_client):
+        self.sync_client = sync_client
+        self.cache = sync_client.cache
+        # The in-memory cache answers in microseconds; anything else is I/O for the executor
+        self.cache_blocking = CONFIG['cache_backend'] != 'memory'
+        self.breaker = sync_client.breaker
+        self.session = None
+        self.in_flight = 0
+        self.single_flight = AsyncSingleFlight() if CONFIG['coalesce_enabled'] else None
+
+        self.limiter = None
+        if CONFIG['admission_enabled']:
+            self.limiter = AsyncConcurrencyLimiter(**limiter_options())
+
+        self.batcher = None
+        if CONFIG['batch_enabled']:
+            self.batcher = AsyncMicroBatcher(
+                self.predict,
+                max_batch_size=CONFIG['batch_max_size'],
+                max_wait_ms=CONFIG['batch_max_wait_ms']
+            )
+
+    async def start(self):
+        connector = aiohttp.TCPConnector(
+            limit=CONFIG['async_connection_limit'],
+            keepalive_timeout=30
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            trace_configs=[connection_trace_config()]
+        )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+
+    async def predict(self, instances, source_lang='auto', target_lang='en'):
+        """Send one KServe V1 predict call (hedged when enabled) and return (data, response_time_ms)"""
+        payload = self.sync_client.build_predict_payload(instances, source_lang, target_lang)
+        if self.sync_client.hedger is None:
+            data, response_time = await self.send_predict(payload, source_lang, target_lang)
+        else:
+            data, response_time = await self.hedged_predict(payload, source_lang, target_lang)
+        tracing.add_span('upstream', response_time)
+        return data, response_time
+
+    async def hedged_predict(self, payload, source_lang='auto', target_lang='en'):
+        """Race a duplicate call against one that outlives the hedge delay; first success wins"""
+        hedger = self.sync_client.hedger
+        delay = hedger.hedge_delay()
+        if delay is None:
+            return await self.send_predict(payload, source_lang, target_lang)
+
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        used = []
+        primary = asyncio.ensure_future(self.send_predict(payload, source_lang, target_lang, used))
+        done, _ = await asyncio.wait([primary], timeout=delay)
+        if done or not hedger.try_hedge():
+            return await primary
+
+        metrics.hedges_issued.inc()
+        hedge = asyncio.ensure_future(self.send_predict(payload, source_lang, target_lang, None, used))
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                    continue
+                # The slower call finishes in the background; its error is consumed there
+                for loser in pending:
+                    loser.add_done_callback(lambda t: t.cancelled() or t.exception())
+                if task is hedge:
+                    hedger.record_win()
+                    metrics.hedges_won.inc()
+                return task.result()[0], (loop.time() - start_time) * 1000
+        raise error
+
+    async def send_predict(self, payload, source_lang='auto', target_lang='en', used=None, avoid=()):
+        """One predict call through the endpoint pool; endpoints tried are appended to `used`"""
+        pool = self.sync_client.pool
+        loop = asyncio.get_running_loop()
+
+        tried = []
+        while True:
+            endpoint = pool.acquire(TRANSLATION_TASK, source_lang, target_lang, exclude=tried, avoid=avoid)
+            if used is not None:
+                used.append(endpoint)
+            start_time = loop.time()
+            ok = False
+            try:
+                async with self.session.post(self.sync_client.get_model_url('/predict', endpoint), json=payload) as response:
+                    status_code = response.status
+                    data = await response.json(content_type=None) if status_code == 200 else None
+                ok = status_code < 500
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                tried.append(endpoint)
+                # A refused connection never reached the model, so another replica can take it
+                if isinstance(e, aiohttp.ClientConnectorError) and \
+                        pool.has_candidate(TRANSLATION_TASK, source_lang, target_lang, exclude=tried):
+                    continue
+                if self.breaker is not None:
+                    self.breaker.record_failure()
+                raise
+            except Exception:
+                # e.g. a 200 whose body is not JSON
+                if self.breaker is not None:
+                    self.breaker.record_failure()
+                raise
+            finally:
+                # Always settle the endpoint, even on cancellation, or its outstanding count leaks
+                response_time = (loop.time() - start_time) * 1000  # Convert to milliseconds
+                pool.release(endpoint, response_time, ok=ok)
+
+        self.sync_client.record_upstream_status(status_code)
+
+        if status_code != 200:
+            raise ModelResponseError(status_code)
+
+        if self.sync_client.hedger is not None:
+            self.sync_client.hedger.observe(response_time)
+        return data, response_time
+
+    async def translate(self, text, source_lang='auto', target_lang='en', priority='interactive'):
+        """Translate text, detecting 'auto' sources and splitting long documents"""
+        with tracing.span('detect'):
+            source_lang, detected = self.sync_client.resolve_source_language(text, source_lang)
+
+        result = None
+        if CONFIG['segment_enabled'] and len(text) > CONFIG['segment_max_length']:
+            segments = segment_text(text, source_lang, CONFIG['segment_max_length'])
+            if len(segments) > 1:
+                result = await self.translate_segments(segments, source_lang, target_lang, priority)
+        if result is None:
+            result = await self.translate_cached(text, source_lang, target_lang, priority)
+
+        if detected is not None:
+            result['detected_language'] = detected['language']
+            result['detection_confidence'] = detected['confidence']
+        return result
+
+    async def translate_cached(self, text, source_lang='auto', target_lang='en', priority='interactive'):
+        """Translate one piece of text, serving repeated requests from the cache"""
+        key = self.sync_client.cache_key(text, source_lang, target_lang)
+        if self.cache is not None:
+            with tracing.span('cache'):
+                if self.cache_blocking:
+                    cached = await run_blocking(self.sync_client.get_cached, key)
+                else:
+                    cached = self.sync_client.get_cached(key)
+            if cached is not None:
+                return cached
+
+        if self.single_flight is None:
+            return await self.translate_uncached(key, text, source_lang, target_lang, priority)
+
+        # Callers only share a leader of their own class, so an interactive request never
+        # waits behind (or inherits the admission error of) a bulk or background one
+        result, coalesced = await self.single_flight.do(
+            (key, priority), lambda: self.translate_uncached(key, text, source_lang, target_lang, priority))
+        if coalesced:
+            result['coalesced'] = True
+            metrics.coalesced_requests.inc()
+        return result
+
+    async def translate_segments(self, segments, source_lang='auto', target_lang='en', priority='interactive'):
+        """Translate segments concurrently so the batcher groups them, then rejoin in order"""
+        start_time = time.time()
+        results = await asyncio.gather(*(
+            self.translate(segment, source_lang, target_lang, priority) for segment, _ in segments
+        ))
+        response_time = (time.time() - start_time) * 1000
+        return merge_segment_results(results, [separator for _, separator in segments], response_time)
+
+    async def translate_uncached(self, key, text, source_lang='auto', target_lang='en', priority='interactive'):
+        """Answer from translation memory or call the model (or fallback), and cache the result"""
+        memory = self.sync_client.memory
+        result = None
+        if memory is not None:
+            with tracing.span('memory'):
+                result = await run_blocking(memory.lookup, text, source_lang, target_lang)
+        if result is None:
+            if self.limiter is None:
+                result = await self.translate_with_model(text, source_lang, target_lang)
+            else:
+                queued = time.perf_counter()
+                async with self.limiter.slot(priority):
+                    tracing.add_span('queue', (time.perf_counter() - queued) * 1000)
+                    result = await self.translate_with_model(text, source_lang, target_lang)
+            if memory is not None:
+                await run_blocking(self.sync_client.remember, text, source_lang, target_lang, result)
+        if self.cache is None:
+            return result
+        if self.cache_blocking:
+            return await run_blocking(self.sync_client.store_cached, key, result)
+        return self.sync_client.store_cached(key, result)
+
+    async def translate_with_model(self, text, source_lang='auto', target_lang='en'):
+        """Translate text using the AI4Bharat model"""
+        if self.breaker is not None and not self.breaker.allow_request():
+            result = await self.mock_translation(text, source_lang, target_lang)
+            result['circuit_open'] = True
+            return result
+
+        self.in_flight += 1
+        try:
+            if self.batcher is not None:
+                submitted = time.perf_counter()
+                data, response_time, batch_size = await self.batcher.submit(text, source_lang, target_lang)
+                tracing.add_span('batch', max(0.0, (time.perf_counter() - submitted) * 1000 - response_time))
+            else:
+                data, response_time = await self.predict([text], source_lang, target_lang)
+                batch_size = 1
+
+            with tracing.span('extract'):
+                return self.sync_client.build_model_result(data, response_time, batch_size)
+
+        except ModelResponseError as e:
+            # If model responds but with error, fall back to mock
+            print(f"Model responded with error: {e.status_code}")
+            return await self.mock_translation(text, source_lang, target_lang)
+        except NoEndpointError as e:
+            print(f"{e} - using mock translation")
+            return await self.mock_translation(text, source_lang, target_lang)
+        except asyncio.TimeoutError:
+            print("Model request timeout - using mock translation")
+            return await self.mock_translation(text, source_lang, target_lang)
+        except aiohttp.ClientConnectionError:
+            print("Cannot connect to AI4Bharat model - using mock translation")
+            return await self.mock_translation(text, source_lang, target_lang)
+        except Exception as e:
+            print(f"Unexpected error connecting to model: {e}")
+            return await self.mock_translation(text, source_lang, target_lang)
+        finally:
+            self.in_flight -= 1
+
+    async def mock_translation(self, text, source_lang='auto', target_lang='en'):
+        """Fallback translation; simulated latency is awaited instead of slept on the loop"""
+        if not fallback_engine.simulate_latency:
+            return get_mock_translation(text, source_lang, target_lang)
+        start_time = time.perf_counter()
+        await asyncio.sleep(fallback_engine.simulated_delay())
+        result = fallback_engine.translate(text, source_lang, target_lang, delay=0)
+        result['response_time'] = (time.perf_counter() - start_time) * 1000
+        return result
+
+    def get_stats(self):
+        return {
+            'in_flight': self.in_flight,
+            'connection_limit': CONFIG['async_connection_limit'],
+            'batching': self.batcher.get_stats() if self.batcher else {'enabled': False},
+            'coalescing': self.single_flight.get_stats() if self.single_flight else {'enabled': False},
+            'admission': self.limiter.get_stats() if self.limiter else {'enabled': False}
+        }
+
+
+def json_response(data, status=200):
+    return web.json_response(data, status=status, dumps=json.dumps)
+
+
+def cacheable_json(request, payload, validator):
+    """JSON response browsers may cache and revalidate; validator excludes volatile fields"""
+    etag = etag_for(validator)
+    headers = {
+        'ETag': f'"{etag}"',
+        'Cache-Control': f"public, max-age={CONFIG['static_max_age']}"
+    }
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        return web.Response(status=304, headers=headers)
+    response = json_response(payload)
+    response.headers.update(headers)
+    return response
+
+
+def enforce_rate_limit(request):
+    """Charge the calling client one token; raises AdmissionRejected when it is over its rate"""
+    if server.rate_limiter is None:
+        return
+    server.rate_limiter.enforce(client_identity(
+        api_key=request.headers.get('X-API-Key'),
+        remote_addr=request.remote,
+        forwarded_for=request.headers.get('X-Forwarded-For'),
+        trust_forwarded=CONFIG['rate_limit_trust_forwarded'],
+        trusted_hops=CONFIG['rate_limit_trusted_hops']
+    ))
+
+
+def rejection_response(error):
+    """429/503 answer with a Retry-After hint"""
+    metrics.admission_rejections.inc(reason=error.reason)
+    response = json_response({
+        'success': False,
+        'error': str(error),
+        'reason': error.reason,
+        'retry_after': error.retry_after,
+        'timestamp': datetime.now().isoformat()
+    }, status=error.status_code)
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+async def index(request):
+    """Serve the main dashboard page"""
+    return web.FileResponse(STATIC_ROOT / 'index.html')
+
+
+async def static_files(request):
+    """Serve static files from the frontend directory only"""
+    path = (STATIC_ROOT / request.match_info['filename']).resolve()
+    if STATIC_ROOT not in path.parents or not path.is_file():
+        raise web.HTTPNotFound()
+    return web.FileResponse(path)
+
+
+async def api_status(request):
+    """Get the current status of the AI4Bharat service"""
+    return json_response(server.get_status_payload())
+
+
+async def api_health(request):
+    """Health check endpoint"""
+    return json_response(server.get_health_payload())
+
+
+async def api_translate(request):
+    """Translate text using the AI4Bharat model"""
+    async_client = request.app['client']
+    start_time = time.time()
+    source_lang, target_lang = 'auto', 'en'
+
+    with metrics.translate_in_flight.track():
+        try:
+            enforce_rate_limit(request)
+            with tracing.span('parse'):
+                try:
+                    data = await request.json()
+                except ValueError:
+                    data = None
+
+                if not data:
+                    metrics.observe_translate_error(source_lang, target_lang, 400)
+                    return json_response({'success': False, 'error': 'No data provided'}, status=400)
+
+                text = data.get('text', '').strip()
+                source_lang = data.get('source_language', 'auto')
+                target_lang = data.get('target_language', 'en')
+                fields, verbose = parse_shaping(request.query, data)
+
+            if not text:
+                metrics.observe_translate_error(source_lang, target_lang, 400)
+                return json_response({'success': False, 'error': 'No text provided'}, status=400)
+
+            result = await async_client.translate(text, source_lang, target_lang)
+            add_translation_metadata(result, text, source_lang, target_lang)
+
+            with tracing.span('serialize'):
+                response = json_response(shape_result(result, fields, verbose))
+            duration = time.time() - start_time
+            metrics.observe_translation(
+                source_lang, target_lang, result,
+                duration,
+                len(text.encode('utf-8')),
+                len(response.body)
+            )
+            server.status_broadcaster.record_sample(
+                duration * 1000, metrics.language_pair(source_lang, target_lang), result.get('source'))
+            return response
+
+        except AdmissionRejected as e:
+            metrics.observe_translate_error(source_lang, target_lang, e.status_code)
+            return rejection_response(e)
+        except Exception as e:
+            if CONFIG['debug']:
+                print(f"Translation API error: {e}")
+
+            metrics.observe_translate_error(source_lang, target_lang, 500)
+            return json_response({
+                'success': False,
+                'error': f'Internal server error: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, status=500)
+
+
+async def api_translate_batch(request):
+    """Translate a JSON array, JSONL upload or NDJSON body, streaming NDJSON results per chunk"""
+    async_client = request.app['client']
+    params = request.query
+    try:
+        enforce_rate_limit(request)
+    except AdmissionRejected as e:
+        return rejection_response(e)
+    defaults = {
+        'source_language': params.get('source_language', 'auto'),
+        'target_language': params.get('target_language', 'en')
+    }
+    text_field = params.get('field', 'text')
+    id_field = params.get('id_field', 'id')
+    fields, verbose = parse_shaping(params)
+
+    try:
+        chunk_size = max(1, min(int(params.get('chunk_size', CONFIG['bulk_chunk_size'])), 256))
+    except ValueError:
+        return json_response({'success': False, 'error': 'chunk_size must be an integer'}, status=400)
+
+    if request.content_type.startswith('multipart/'):
+        reader = await request.multipart()
+        part = await reader.next()
+        while part is not None and part.name != 'file':
+            part = await reader.next()
+        if part is None:
+            return json_response({'success': False, 'error': "Multipart upload needs a 'file' field"}, status=400)
+        raw_items = aiter_jsonl_items(part.readline)
+    elif request.content_type in ('application/x-ndjson', 'application/jsonl'):
+        raw_items = aiter_jsonl_items(request.content.readline)
+    else:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        if data is None:
+            return json_response({'success': False, 'error': 'Provide a JSON array body or a JSONL file upload'}, status=400)
+        if isinstance(data, dict):
+            defaults['source_language'] = data.get('source_language', defaults['source_language'])
+            defaults['target_language'] = data.get('target_language', defaults['target_language'])
+            fields, verbose = parse_shaping(params, data)
+        try:
+            raw_items = list(iter_json_items(data))
+        except BulkInputError as e:
+            return json_response({'success': False, 'error': str(e)}, status=400)
+
+    response = web.StreamResponse(headers={
+        'Content-Type': 'application/x-ndjson',
+        'X-Accel-Buffering': 'no',
+        'Vary': 'Accept-Encoding'
+    })
+    compressor = None
+    encoding = choose_encoding(request.headers.get('Accept-Encoding', '')) if CONFIG['compress_enabled'] else None
+    if encoding is not None:
+        compressor = StreamCompressor(encoding, CONFIG['compress_level'])
+        response.headers['Content-Encoding'] = encoding
+    await response.prepare(request)
+
+    async def translate_fn(text, source_lang, target_lang):
+        return shape_result(await async_client.translate(text, source_lang, target_lang, priority='bulk'), fields, verbose)
+
+    jobs = aiter_jobs(raw_items, defaults, text_field, id_field)
+    async for lines in astream_translations(jobs, translate_fn, chunk_size=chunk_size):
+        data = lines.encode('utf-8')
+        await response.write(compressor.compress(data) if compressor else data)
+
+    if compressor is not None:
+        await response.write(compressor.finish())
+    await response.write_eof()
+    return response
+
+
+def jobs_disabled():
+    return json_response({'success': False, 'error': 'Translation jobs are disabled'}, status=404)
+
+
+async def api_submit_job(request):
+    """Queue a JSON array, JSONL upload or NDJSON body for background translation"""
+    if server.job_store is None:
+        return jobs_disabled()
+    try:
+        enforce_rate_limit(request)
+    except AdmissionRejected as e:
+        return rejection_response(e)
+
+    params = request.query
+    defaults = {
+        'source_language': params.get('source_language', 'auto'),
+        'target_language': params.get('target_language', 'en')
+    }
+    text_field = params.get('field', 'text')
+    id_field = params.get('id_field', 'id')
+
+    if request.content_type.startswith('multipart/'):
+        reader = await request.multipart()
+        part = await reader.next()
+        while part is not None and part.name != 'file':
+            part = await reader.next()
+        if part is None:
+            return json_response({'success': False, 'error': "Multipart upload needs a 'file' field"}, status=400)
+        raw_items = [item async for item in aiter_jsonl_items(part.readline)]
+    elif request.content_type in ('application/x-ndjson', 'application/jsonl'):
+        raw_items = [item async for item in aiter_jsonl_items(request.content.readline)]
+    else:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        if data is None:
+            return json_response({'success': False, 'error': 'Provide a JSON array body or a JSONL file upload'}, status=400)
+        if isinstance(data, dict):
+            defaults['source_language'] = data.get('source_language', defaults['source_language'])
+            defaults['target_language'] = data.get('target_language', defaults['target_language'])
+        raw_items = data
+    try:
+        if not isinstance(raw_items, list):
+            raw_items = iter_json_items(raw_items)
+        jobs = list(iter_jobs(raw_items, defaults, text_field, id_field))
+    except BulkInputError as e:
+        return json_response({'success': False, 'error': str(e)}, status=400)
+
+    if not jobs:
+        return json_response({'success': False, 'error': 'No items provided'}, status=400)
+    if len(jobs) > CONFIG['jobs_max_items']:
+        return json_response({
+            'success': False,
+            'error': f"Jobs are limited to {CONFIG['jobs_max_items']} items"
+        }, status=413)
+
+    job_id = await run_blocking(server.job_store.submit, jobs, defaults)
+    server.job_workers.ensure_started()
+    server.job_workers.notify()
+
+    job = await run_blocking(server.job_store.get_job, job_id)
+    response = json_response(dict(job, success=True, **job_urls(job_id)), status=202)
+    response.headers['Location'] = job_urls(job_id)['status_url']
+    return response
+
+
+async def api_job(request):
+    """Progress and throughput of a job; DELETE cancels it"""
+    if server.job_store is None:
+        return jobs_disabled()
+    job_id = request.match_info['job_id']
+    try:
+        if request.method == 'DELETE':
+            job = await run_blocking(server.job_store.cancel, job_id)
+        else:
+            job = await run_blocking(server.job_store.get_job, job_id)
+    except JobNotFound:
+        return json_response({'success': False, 'error': 'Unknown job'}, status=404)
+    return json_response(dict(job, success=True, **job_urls(job_id)))
+
+
+async def api_job_results(request):
+    """Page through a job's results in submission order (?offset=&limit=)"""
+    if server.job_store is None:
+        return jobs_disabled()
+    job_id = request.match_info['job_id']
+    params = request.query
+    try:
+        offset = max(0, int(params.get('offset', 0)))
+        limit = max(1, min(int(params.get('limit', 100)), 1000))
+    except ValueError:
+        return json_response({'success': False, 'error': 'offset and limit must be integers'}, status=400)
+    fields, verbose = parse_shaping(params)
+
+    try:
+        job = await run_blocking(server.job_store.get_job, job_id)
+        items = await run_blocking(server.job_store.get_results, job_id, offset, limit)
+    except JobNotFound:
+        return json_response({'success': False, 'error': 'Unknown job'}, status=404)
+    return json_response(job_results_payload(job, items, offset, fields, verbose))
+
+
+def memory_disabled():
+    return json_response({'success': False, 'error': 'Translation memory is disabled'}, status=404)
+
+
+async def api_memory_search(request):
+    """Closest translation memory entries for a text"""
+    memory = server.client.memory
+    if memory is None:
+        return memory_disabled()
+
+    params = request.query
+    text = params.get('text', '').strip()
+    source_lang = params.get('source_language', '')
+    target_lang = params.get('target_language', 'en')
+    if not text or not source_lang:
+        return json_response({'success': False, 'error': 'text and source_language are required'}, status=400)
+    try:
+        limit = max(1, min(int(params.get('limit', 5)), 50))
+        threshold = float(params.get('threshold', memory.fuzzy_threshold))
+    except ValueError:
+        return json_response({'success': False, 'error': 'limit and threshold must be numbers'}, status=400)
+
+    matches = await run_blocking(functools.partial(
+        memory.search, text, source_lang, target_lang, limit=limit, threshold=threshold))
+    return json_response(memory_search_payload(matches, source_lang, target_lang))
+
+
+async def api_memory_export(request):
+    """Download the translation memory as JSONL"""
+    memory = server.client.memory
+    if memory is None:
+        return memory_disabled()
+
+    response = web.StreamResponse(headers={
+        'Content-Type': 'application/x-ndjson',
+        'Content-Disposition': 'attachment; filename=translation-memory.jsonl'
+    })
+    await response.prepare(request)
+    lines = await run_blocking(memory.export, request.query.get('language_pair'))
+    while True:
+        # Serialise a chunk at a time off the loop; the export is a snapshot, so this is safe
+        chunk = await run_blocking(lambda: ''.join(itertools.islice(lines, EXPORT_CHUNK_LINES)))
+        if not chunk:
+            break
+        await response.write(chunk.encode('utf-8'))
+    await response.write_eof()
+    return response
+
+
+async def api_memory_import(request):
+    """Add JSONL records (body or 'file' upload) to the translation memory"""
+    memory = server.client.memory
+    if memory is None:
+        return memory_disabled()
+
+    readline = request.content.readline
+    if request.content_type.startswith('multipart/'):
+        reader = await request.multipart()
+        part = await reader.next()
+        while part is not None and part.name != 'file':
+            part = await reader.next()
+        if part is None:
+            return json_response({'success': False, 'error': "Multipart upload needs a 'file' field"}, status=400)
+        readline = part.readline
+    items = [item async for item in aiter_jsonl_items(readline)]
+    imported, errors = await run_blocking(memory.import_records, items)
+    return json_response({
+        'success': not errors,
+        'imported': imported,
+        'errors': errors[:100],
+        'error_count': len(errors)
+    }, status=200 if imported or not errors else 400)
+
+
+async def api_languages(request):
+    """Get supported languages"""
+    languages = get_supported_languages()
+
+    return cacheable_json(request, {
+        'languages': languages,
+        'count': len(languages),
+        'timestamp': datetime.now().isoformat()
+    }, languages)
+
+
+async def api_stream(request):
+    """Server-Sent Events feed of status, metrics and recent translate latencies"""
+    response = web.StreamResponse(headers={
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    await response.prepare(request)
+
+    frames = server.status_broadcaster.asubscribe()
+    try:
+        async for frame in frames:
+            await response.write(frame.encode('utf-8'))
+    except ConnectionResetError:
+        # Dashboard went away; the finally below unsubscribes it
+        pass
+    finally:
+        await frames.aclose()
+    return response
+
+
+async def api_metrics(request):
+    """Get current metrics"""
+    # Cache and job stats are sqlite queries when those backends are on disk
+    payload = await run_blocking(server.get_metrics_payload)
+    payload['serving_mode'] = 'async'
+    payload['async_client'] = request.app['client'].get_stats()
+    return json_response(payload)
+
+
+async def prometheus_metrics(request):
+    """Prometheus text exposition of the server-side metrics"""
+    return web.Response(
+        text=metrics.registry.expose(),
+        headers={'Content-Type': metrics.EXPOSITION_CONTENT_TYPE}
+    )
+
+
+async def api_samples(request):
+    """Get sample texts for testing"""
+    samples = get_sample_texts()
+
+    return cacheable_json(request, {
+        'samples': samples,
+        'timestamp': datetime.now().isoformat()
+    }, samples)
+
+
+@web.middleware
+async def cors_middleware(request, handler):
+    """Mirror flask_cors defaults: allow any origin"""
+    if request.method == 'OPTIONS':
+        response = web.Response()
+        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+        response.headers['Access-Control-Allow-Headers'] = request.headers.get(
+            'Access-Control-Request-Headers', 'Content-Type')
+    else:
+        response = await handler(request)
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
+
+@web.middleware
+async def compression_middleware(request, handler):
+    """gzip/brotli-encode complete JSON bodies when the client accepts it"""
+    response = await handler(request)
+    if not CONFIG['compress_enabled'] or not isinstance(response, web.Response):
+        return response
+    if response.content_type not in COMPRESSIBLE_TYPES or 'Content-Encoding' in response.headers:
+        return response
+
+    response.headers.add('Vary', 'Accept-Encoding')
+    encoding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+    body = response.body
+    if encoding is None or not isinstance(body, bytes) or len(body) < CONFIG['compress_min_bytes']:
+        return response
+
+    with tracing.span('compress'):
+        response.body = compress(body, encoding, CONFIG['compress_level'])
+    response.headers['Content-Encoding'] = encoding
+    etag = response.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        response.headers['ETag'] = 'W/' + etag
+    return response
+
+
+@web.middleware
+async def metrics_middleware(request, handler):
+    """Count every request by route so /metrics covers the whole API"""
+    start_time = time.time()
+    status = 500
+    try:
+        response = await handler(request)
+        status = response.status
+        return response
+    except web.HTTPException as e:
+        status = e.status
+        raise
+    finally:
+        resource = request.match_info.route.resource
+        route = resource.canonical if resource is not None else 'unmatched'
+        if route == '/{filename}':
+            route = 'static'
+        metrics.observe_http_request(route, request.method, status, time.time() - start_time)
+
+
+@web.middleware
+async def tracing_middleware(request, handler):
+    """Trace the routes in TRACED_ROUTES and report their stages in a Server-Timing header"""
+    if not CONFIG['trace_enabled'] or request.path not in TRACED_ROUTES:
+        return await handler(request)
+
+    trace, token = tracing.begin(request.path, request.headers.get('X-Request-ID'))
+    # The sampled thread is the event loop, so the stacks include other requests' work
+    profile = server.profiler.start() if server.profiler is not None else None
+    try:
+        response = await handler(request)
+        trace.attributes['status'] = response.status
+        response.headers['Server-Timing'] = trace.server_timing()
+        return response
+    finally:
+        try:
+            finish_trace(trace, profile)
+        finally:
+            tracing.end(token)
+
+
+async def on_startup(app):
+    await app['client'].start()
+    server.client.health_monitor.ensure_started()
+    if server.job_workers is not None:
+        # Jobs are drained by the shared worker threads through the sync client
+        server.job_workers.ensure_started()
+
+
+async def on_cleanup(app):
+    await app['client'].close()
+
+
+def create_app():
+    """Build the aiohttp application"""
+    app = web.Application(middlewares=[cors_middleware, metrics_middleware, tracing_middleware, compression_middleware])
+    app['client'] = AsyncAI4BharatClient(server.client)
+
+    app.router.add_get('/', index)
+    app.router.add_get('/api/status', api_status)
+    app.router.add_post('/api/translate', api_translate)
+    app.router.add_post('/api/translate/batch', api_translate_batch)
+    app.router.add_get('/api/health', api_health)
+    app.router.add_post('/api/jobs', api_submit_job)
+    app.router.add_get('/api/jobs/{job_id}', api_job)
+    app.router.add_delete('/api/jobs/{job_id}', api_job)
+    app.router.add_get('/api/jobs/{job_id}/results', api_job_results)
+    app.router.add_get('/api/memory/search', api_memory_search)
+    app.router.add_get('/api/memory/export', api_memory_export)
+    app.router.add_post('/api/memory/import', api_memory_import)
+    app.router.add_get('/api/languages', api_languages)
+    app.router.add_get('/api/stream', api_stream)
+    app.router.add_get('/api/metrics', api_metrics)
+    app.router.add_get('/api/samples', api_samples)
+    app.router.add_get('/metrics', prometheus_metrics)
+    app.router.add_get('/{filename:.+}', static_files)
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+if __name__ == '__main__':
+    port = int(os.getenv('PORT', '5000'))
+
+    print("🚀 Starting AI4Bharat Frontend Server (async mode)")
+    print(f"📍 Model Endpoint: {CONFIG['model_endpoint']}")
+    print(f"🔧 Debug Mode: {CONFIG['debug']}")
+    print(f"🌐 Server will be available at: http://localhost:{port}")
+    print("=" * 50)
+
+    web.run_app(create_app(), host='0.0.0.0', port=port)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Micro-batching Scheduler for AI4Bharat Dashboard
+Collects concurrent translations for the same language pair into one multi-instance predict call.
+Spans recorded while a batch is sent are added to the trace of every request in it.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import tracing
+from admission import PRIORITIES
+
+
+class BatchResponseError(Exception):
+    """Raised when a batched predict response cannot be fanned back out"""
+
+
+def split_predictions(data, count):
+    """
+    Split a multi-instance predict response into one single-prediction view per
+    instance, so response parsing stays unchanged for each waiter.
+    """
+    predictions = data.get('predictions') if isinstance(data, dict) else None
+    if not isinstance(predictions, list) or len(predictions) != count:
+        raise BatchResponseError(
+            f"Expected {count} predictions, got "
+            f"{len(predictions) if isinstance(predictions, list) else 'none'}"
+        )
+
+    items = []
+    for prediction in predictions:
+        item = dict(data)
+        item['predictions'] = [prediction]
+        items.append(item)
+    return items
+
+
+def _batch_stats(stats, max_batch_size, max_wait, pending):
+    stats['pending'] = pending
+    stats['max_batch_size'] = max_batch_size
+    stats['max_wait_ms'] = max_wait * 1000.0
+    stats['average_batch_size'] = (stats['items'] / stats['batches']) if stats['batches'] else 0.0
+    return stats
+
+
+class MicroBatcher:
+    """
+    Groups requests per (source, target) pair and priority class within a small
+    time/size window. Ready batches are sent most urgent class first, and the first
+    reserved_workers senders only take interactive batches, so bulk and background
+    batches can never occupy every sender.
+    """
+
+    def __init__(self, send_fn, max_batch_size=16, max_wait_ms=10, max_workers=4, reserved_workers=1):
+        # send_fn(instances, source_lang, target_lang) -> (response_data, response_time_ms)
+        self.send_fn = send_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms / 1000.0)
+        self.max_workers = max(1, max_workers)
+        self.reserved_workers = min(max(0, reserved_workers), self.max_workers - 1)
+
+        self._lock = threading.Lock()
+        # The dispatcher waits on _cond; senders on _work (any class) or _reserved (interactive only)
+        self._cond = threading.Condition(self._lock)
+        self._work = threading.Condition(self._lock)
+        self._reserved = threading.Condition(self._lock)
+        self._pending = {}
+        self._deadlines = {}
+        self._ready = {priority: deque() for priority in PRIORITIES}
+        self._thread = None
+
+        self.stats = {
+            'batches': 0,
+            'items': 0,
+            'largest_batch': 0,
+            'failed_batches': 0
+        }
+
+    def _ensure_started(self):
+        # Caller must hold self._lock
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='batch-dispatcher', daemon=True)
+            self._thread.start()
+            for index in range(self.max_workers):
+                reserved = index < self.reserved_workers
+                threading.Thread(target=self._send_loop, args=(reserved,),
+                                 name=f'batcher_{index}', daemon=True).start()
+
+    def submit(self, text, source_lang, target_lang, priority='interactive'):
+        """Queue one instance and block until its batch returns (data, response_time, batch_size)"""
+        future = Future()
+        key = (source_lang, target_lang, priority if priority in self._ready else PRIORITIES[-1])
+
+        with self._cond:
+            self._ensure_started()
+            batch = self._pending.setdefault(key, [])
+            if not batch:
+                self._deadlines[key] = time.monotonic() + self.max_wait
+            batch.append((text, future, tracing.current()))
+
+            if len(batch) >= self.max_batch_size:
+                self._dispatch(key)
+            else:
+                self._cond.notify()
+
+        return future.result()
+
+    def _dispatch(self, key):
+        # Caller must hold self._lock
+        batch = self._pending.pop(key, [])
+        self._deadlines.pop(key, None)
+        if not batch:
+            return
+        priority = key[2]
+        self._ready[priority].append((key, batch))
+        self._work.notify()
+        if priority == PRIORITIES[0]:
+            self._reserved.notify()
+
+    def _next_batch(self, reserved):
+        # Caller must hold self._lock
+        for priority in PRIORITIES[:1] if reserved else PRIORITIES:
+            if self._ready[priority]:
+                return self._ready[priority].popleft()
+        return None
+
+    def _send_loop(self, reserved):
+        waiting = self._reserved if reserved else self._work
+        while True:
+            with self._lock:
+                ready = self._next_batch(reserved)
+                while ready is None:
+                    waiting.wait()
+                    ready = self._next_batch(reserved)
+            self._send_batch(*ready)
+
+    def _run(self):
+        with self._cond:
+            while True:
+                if not self._deadlines:
+                    self._cond.wait()
+                    continue
+
+                now = time.monotonic()
+                for key, deadline in list(self._deadlines.items()):
+                    if deadline <= now:
+                        self._dispatch(key)
+
+                if self._deadlines:
+                    self._cond.wait(max(0.0, min(self._deadlines.values()) - now))
+
+    def _send_batch(self, key, batch):
+        source_lang, target_lang, _ = key
+        instances = [text for text, _, _ in batch]
+
+        try:
+            with tracing.attach([trace for _, _, trace in batch]):
+                data, response_time = self.send_fn(instances, source_lang, target_lang)
+            items = split_predictions(data, len(batch))
+        except Exception as e:
+            with self._lock:
+                self.stats['failed_batches'] += 1
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            self.stats['batches'] += 1
+            self.stats['items'] += len(batch)
+            self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+
+        for item, (_, future, _) in zip(items, batch):
+            future.set_result((item, response_time, len(batch)))
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            pending = sum(len(batch) for batch in self._pending.values())
+            stats['ready_batches'] = {priority: len(ready) for priority, ready in self._ready.items()}
+        stats['workers'] = self.max_workers
+        stats['reserved_workers'] = self.reserved_workers
+        return _batch_stats(stats, self.max_batch_size, self.max_wait, pending)
+
+
+class AsyncMicroBatcher:
+    """asyncio counterpart of MicroBatcher for the async serving mode"""
+
+    def __init__(self, send_fn, max_batch_size=16, max_wait_ms=10):
+        # send_fn is a coroutine function with the same signature as MicroBatcher's
+        self.send_fn = send_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms / 1000.0)
+
+        self._pending = {}
+        self._timers = {}
+        self._tasks = set()
+        self.stats = {
+            'batches': 0,
+            'items': 0,
+            'largest_batch': 0,
+            'failed_batches': 0
+        }
+
+    async def submit(self, text, source_lang, target_lang):
+        """Queue one instance and wait for its batch to return (data, response_time, batch_size)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (source_lang, target_lang)
+
+        batch = self._pending.setdefault(key, [])
+        batch.append((text, future, tracing.current()))
+        if len(batch) == 1:
+            self._timers[key] = loop.call_later(self.max_wait, self._dispatch, key)
+        if len(batch) >= self.max_batch_size:
+            self._dispatch(key)
+
+        return await future
+
+    def _dispatch(self, key):
+        batch = self._pending.pop(key, None)
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        if batch:
+            task = asyncio.ensure_future(self._send_batch(key, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, key, batch):
+        source_lang, target_lang = key
+        instances = [text for text, _, _ in batch]
+
+        try:
+            with tracing.attach([trace for _, _, trace in batch]):
+                data, response_time = await self.send_fn(instances, source_lang, target_lang)
+            items = split_predictions(data, len(batch))
+        except Exception as e:
+            self.stats['failed_batches'] += 1
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.stats['batches'] += 1
+        self.stats['items'] += len(batch)
+        self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+
+        for item, (_, future, _) in zip(items, batch):
+            # A waiter may have been cancelled by a client disconnect
+            if not future.done():
+                future.set_result((item, response_time, len(batch)))
+
+    def get_stats(self):
+        pending = sum(len(batch) for batch in self._pending.values())
+        return _batch_stats(dict(self.stats), self.max_batch_size, self.max_wait, pending)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Bulk Translation Helpers for AI4Bharat Dashboard
+Parses JSON arrays or JSONL uploads and streams chunked translations back as NDJSON
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from datetime import datetime
+
+
+class BulkInputError(ValueError):
+    """Raised when a bulk translation item cannot be parsed"""
+
+
+def iter_json_items(data):
+    """Yield raw items from a JSON array or an {'items': [...]} object"""
+    if isinstance(data, dict):
+        data = data.get('items')
+    if not isinstance(data, list):
+        raise BulkInputError("Expected a JSON array or an object with an 'items' array")
+    for item in data:
+        yield item
+
+
+def parse_jsonl_line(line, line_number):
+    """Parse one JSONL line; returns None for blank lines and a BulkInputError for bad JSON"""
+    if isinstance(line, bytes):
+        line = line.decode('utf-8')
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        return BulkInputError(f"Line {line_number}: invalid JSON ({e.msg})")
+
+
+def iter_jsonl_items(stream):
+    """Yield raw items from a JSONL byte stream one line at a time"""
+    for line_number, line in enumerate(stream, 1):
+        item = parse_jsonl_line(line, line_number)
+        if item is not None:
+            yield item
+
+
+async def aiter_jsonl_items(readline):
+    """Async variant of iter_jsonl_items driven by an awaitable readline()"""
+    line_number = 0
+    while True:
+        line = await readline()
+        if not line:
+            return
+        line_number += 1
+        item = parse_jsonl_line(line, line_number)
+        if item is not None:
+            yield item
+
+
+def normalize_item(item, index, defaults, text_field='text', id_field='id'):
+    """Turn a raw item into a translation job dict"""
+    if isinstance(item, BulkInputError):
+        raise item
+    if isinstance(item, str):
+        return {
+            'index': index,
+            'id': None,
+            'text': item.strip(),
+            'source_language': defaults['source_language'],
+            'target_language': defaults['target_language']
+        }
+    if not isinstance(item, dict):
+        raise BulkInputError(f"Item {index}: expected a string or an object")
+
+    text = item.get(text_field)
+    if not isinstance(text, str):
+        raise BulkInputError(f"Item {index}: missing '{text_field}' field")
+
+    return {
+        'index': index,
+        'id': item.get(id_field),
+        'text': text.strip(),
+        'source_language': item.get('source_language', defaults['source_language']),
+        'target_language': item.get('target_language', defaults['target_language'])
+    }
+
+
+def iter_jobs(raw_items, defaults, text_field='text', id_field='id'):
+    """Yield job dicts; unparseable items become jobs carrying an 'error'"""
+    for index, item in enumerate(raw_items):
+        yield _job_or_error(item, index, defaults, text_field, id_field)
+
+
+async def aiter_jobs(raw_items, defaults, text_field='text', id_field='id'):
+    """Async variant of iter_jobs accepting a sync or async iterable of raw items"""
+    index = 0
+    if hasattr(raw_items, '__aiter__'):
+        async for item in raw_items:
+            yield _job_or_error(item, index, defaults, text_field, id_field)
+            index += 1
+    else:
+        for item in raw_items:
+            yield _job_or_error(item, index, defaults, text_field, id_field)
+            index += 1
+
+
+def _job_or_error(item, index, defaults, text_field, id_field):
+    try:
+        return normalize_item(item, index, defaults, text_field, id_field)
+    except BulkInputError as e:
+        return {'index': index, 'error': str(e)}
+
+
+def chunked(iterable, size):
+    """Yield lists of at most size items without materialising the input"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _translate_job(translate_fn, job):
+    if 'error' in job:
+        return {'success': False, 'error': job['error']}
+    if not job['text']:
+        return {'success': False, 'error': 'No text provided'}
+    return translate_fn(job['text'], job['source_language'], job['target_language'])
+
+
+async def _atranslate_job(translate_fn, job):
+    if 'error' in job:
+        return {'success': False, 'error': job['error']}
+    if not job['text']:
+        return {'success': False, 'error': 'No text provided'}
+    return await translate_fn(job['text'], job['source_language'], job['target_language'])
+
+
+def _format_line(job, result):
+    line = {'index': job['index']}
+    if 'error' not in job:
+        line.update({
+            'id': job['id'],
+            'source_language': job['source_language'],
+            'target_language': job['target_language'],
+            'text_length': len(job['text'])
+        })
+    line.update(result)
+    return json.dumps(line, ensure_ascii=False) + '\n'
+
+
+def stream_translations(jobs, translate_fn, executor, chunk_size=16, max_chunks_in_flight=2):
+    """
+    Translate jobs in bounded chunks and yield NDJSON lines in input order.
+    The next chunk is submitted before the current one is drained so the
+    model stays busy while results are written out.
+    """
+    started = time.time()
+    count = 0
+    failures = 0
+    in_flight = deque()
+
+    def drain_oldest():
+        nonlocal count, failures
+        chunk, futures = in_flight.popleft()
+        lines = []
+        for job, future in zip(chunk, futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+            if not result.get('success'):
+                failures += 1
+            count += 1
+            lines.append(_format_line(job, result))
+        return ''.join(lines)
+
+    for chunk in chunked(jobs, chunk_size):
+        futures = [executor.submit(_translate_job, translate_fn, job) for job in chunk]
+        in_flight.append((chunk, futures))
+        if len(in_flight) >= max_chunks_in_flight:
+            yield drain_oldest()
+
+    while in_flight:
+        yield drain_oldest()
+
+    yield _summary_line(count, failures, started)
+
+
+async def astream_translations(jobs, translate_fn, chunk_size=16, max_chunks_in_flight=2):
+    """Async variant of stream_translations; translate_fn is a coroutine function"""
+    started = time.time()
+    count = 0
+    failures = 0
+    in_flight = deque()
+
+    async def drain_oldest():
+        nonlocal count, failures
+        chunk, tasks = in_flight.popleft()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        lines = []
+        for job, result in zip(chunk, results):
+            if isinstance(result, Exception):
+                result = {'success': False, 'error': str(result)}
+            if not result.get('success'):
+                failures += 1
+            count += 1
+            lines.append(_format_line(job, result))
+        return ''.join(lines)
+
+    chunk = []
+    async for job in jobs:
+        chunk.append(job)
+        if len(chunk) < chunk_size:
+            continue
+        in_flight.append((chunk, [asyncio.ensure_future(_atranslate_job(translate_fn, job)) for job in chunk]))
+        chunk = []
+        if len(in_flight) >= max_chunks_in_flight:
+            yield await drain_oldest()
+
+    if chunk:
+        in_flight.append((chunk, [asyncio.ensure_future(_atranslate_job(translate_fn, job)) for job in chunk]))
+    while in_flight:
+        yield await drain_oldest()
+
+    yield _summary_line(count, failures, started)
+
+
+def _summary_line(count, failures, started):
+    return json.dumps({
+        'done': True,
+        'count': count,
+        'failed': failures,
+        'elapsed_ms': (time.time() - started) * 1000,
+        'timestamp': datetime.now().isoformat()
+    }) + '\n'
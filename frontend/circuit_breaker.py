@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Circuit Breaker for AI4Bharat Dashboard
+Stops sending requests to the model during outages so callers fall back immediately
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker driven by the failure rate of recent upstream calls"""
+
+    def __init__(self, failure_rate_threshold=0.5, minimum_calls=5, window_size=20,
+                 cool_down=15.0, half_open_probes=1, name='model'):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_size = window_size
+        self.cool_down = cool_down
+        self.half_open_probes = half_open_probes
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window_size)  # True for success
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_started_at = 0.0
+        self.transitions = deque(maxlen=20)
+        self.stats = {
+            'short_circuited': 0,
+            'successes': 0,
+            'failures': 0,
+            'times_opened': 0
+        }
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def _transition(self, new_state, reason):
+        # Caller must hold self._lock
+        old_state = self._state
+        if old_state == new_state:
+            return
+        self._state = new_state
+        if new_state == OPEN:
+            self._opened_at = time.time()
+            self.stats['times_opened'] += 1
+        if new_state != HALF_OPEN:
+            self._probes_in_flight = 0
+        self.transitions.append({
+            'from': old_state,
+            'to': new_state,
+            'reason': reason,
+            'timestamp': datetime.now().isoformat()
+        })
+        print(f"Circuit breaker '{self.name}': {old_state} -> {new_state} ({reason})")
+
+    def allow_request(self):
+        """Return True if a call may go upstream, False to short-circuit to the fallback"""
+        now = time.time()
+        with self._lock:
+            if self._state == OPEN:
+                if now - self._opened_at < self.cool_down:
+                    self.stats['short_circuited'] += 1
+                    return False
+                self._transition(HALF_OPEN, 'cool-down elapsed')
+
+            if self._state == HALF_OPEN:
+                # A probe that never reported back must not wedge the breaker half-open
+                stale = now - self._probe_started_at >= self.cool_down
+                if self._probes_in_flight >= self.half_open_probes and not stale:
+                    self.stats['short_circuited'] += 1
+                    return False
+                if stale:
+                    self._probes_in_flight = 0
+                self._probes_in_flight += 1
+                self._probe_started_at = now
+
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.stats['successes'] += 1
+            if self._state == HALF_OPEN:
+                self._outcomes.clear()
+                self._transition(CLOSED, 'probe succeeded')
+                return
+            self._outcomes.append(True)
+
+    def record_failure(self):
+        with self._lock:
+            self.stats['failures'] += 1
+            if self._state == HALF_OPEN:
+                self._transition(OPEN, 'probe failed')
+                return
+            if self._state == OPEN:
+                return
+
+            self._outcomes.append(False)
+            calls = len(self._outcomes)
+            failure_rate = self._outcomes.count(False) / calls
+            if calls >= self.minimum_calls and failure_rate >= self.failure_rate_threshold:
+                self._outcomes.clear()
+                self._transition(OPEN, f"failure rate {failure_rate:.0%} over last {calls} calls")
+
+    def get_stats(self):
+        with self._lock:
+            calls = len(self._outcomes)
+            stats = dict(self.stats)
+            stats.update({
+                'state': self._state,
+                'window_calls': calls,
+                'window_failure_rate': (self._outcomes.count(False) / calls) if calls else 0.0,
+                'seconds_until_half_open': max(0.0, self.cool_down - (time.time() - self._opened_at))
+                    if self._state == OPEN else 0.0,
+                'transitions': list(self.transitions)
+            })
+        stats.update({
+            'failure_rate_threshold': self.failure_rate_threshold,
+            'minimum_calls': self.minimum_calls,
+            'window_size': self.window_size,
+            'cool_down': self.cool_down
+        })
+        return stats
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Request Coalescing for AI4Bharat Dashboard
+Concurrent identical translations wait on one in-flight upstream call (single-flight)
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Runs fn once per key at a time; callers arriving meanwhile share its result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {
+            'leaders': 0,
+            'coalesced': 0
+        }
+
+    def do(self, key, fn):
+        """Return (result, coalesced); every caller gets its own copy of the result dict"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.stats['leaders'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            return dict(future.result()), True
+
+        try:
+            result = fn()
+            future.set_result(result)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+        return dict(result), False
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['in_flight'] = len(self._calls)
+        return stats
+
+
+class AsyncSingleFlight:
+    """asyncio counterpart of SingleFlight for the async serving mode"""
+
+    def __init__(self):
+        self._calls = {}
+        self.stats = {
+            'leaders': 0,
+            'coalesced': 0
+        }
+
+    async def do(self, key, coro_fn):
+        """Return (result, coalesced); every caller gets its own copy of the result dict"""
+        task = self._calls.get(key)
+        if task is not None:
+            self.stats['coalesced'] += 1
+            # Shield so one follower disconnecting does not cancel the shared call
+            return dict(await asyncio.shield(task)), True
+
+        self.stats['leaders'] += 1
+        task = asyncio.ensure_future(coro_fn())
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._release(key, done))
+        return dict(await asyncio.shield(task)), False
+
+    def _release(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['in_flight'] = len(self._calls)
+        return stats
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Background Health Monitor for AI4Bharat Dashboard
+Probes the model on its own schedule so status endpoints can answer from cached state
+"""
+
+import os
+import random
+import threading
+import time
+
+
+class HealthMonitor:
+    """Single background prober with jittered exponential backoff while the model is down"""
+
+    def __init__(self, probe_fn, interval=10.0, max_interval=60.0, jitter=0.2, debug=False):
+        # probe_fn() -> bool, raising is treated as unhealthy
+        self.probe_fn = probe_fn
+        self.interval = interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.debug = debug
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+
+        self.state = {
+            'healthy': False,
+            'last_check': 0,
+            'last_latency_ms': None,
+            'consecutive_failures': 0,
+            'consecutive_successes': 0,
+            'last_change': time.time(),
+            'last_error': None,
+            'probes': 0
+        }
+
+    def ensure_started(self):
+        """Start the probe thread once per process (forked workers get their own)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='health-monitor', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.probe_once()
+            self._stop.wait(self.next_delay())
+
+    def probe_once(self):
+        """Run one probe now and record the outcome"""
+        start_time = time.time()
+        error = None
+        try:
+            healthy = bool(self.probe_fn())
+        except Exception as e:
+            healthy = False
+            error = str(e)
+        latency = (time.time() - start_time) * 1000
+
+        with self._lock:
+            state = self.state
+            if healthy != state['healthy']:
+                state['last_change'] = time.time()
+                print(f"Model health changed: {'healthy' if healthy else 'unhealthy'}")
+            state['healthy'] = healthy
+            state['last_check'] = time.time()
+            state['last_latency_ms'] = latency
+            state['last_error'] = error
+            state['probes'] += 1
+            if healthy:
+                state['consecutive_failures'] = 0
+                state['consecutive_successes'] += 1
+            else:
+                state['consecutive_failures'] += 1
+                state['consecutive_successes'] = 0
+
+        if error and self.debug:
+            print(f"Health check failed: {error}")
+        return healthy
+
+    def next_delay(self):
+        """Regular interval while healthy, doubling per consecutive failure while down"""
+        with self._lock:
+            failures = self.state['consecutive_failures']
+        delay = self.interval
+        if failures:
+            delay = min(self.max_interval, self.interval * (2 ** (failures - 1)))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    @property
+    def is_healthy(self):
+        return self.state['healthy']
+
+    @property
+    def last_check(self):
+        return self.state['last_check']
+
+    def get_state(self):
+        with self._lock:
+            state = dict(self.state)
+        state['seconds_since_change'] = time.time() - state['last_change']
+        state['running'] = self._thread is not None and self._thread.is_alive()
+        state['interval'] = self.interval
+        return state
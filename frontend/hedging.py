@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Request Hedging for AI4Bharat Dashboard
+When a predict call is slower than a percentile of recent upstream latency, a duplicate
+is sent to another replica and the first answer wins; a token budget caps the extra load
+"""
+
+import collections
+import threading
+
+
+class HedgePolicy:
+    """Decides when to hedge: delay from recent latencies, permission from a hedge budget"""
+
+    def __init__(self, percentile=95.0, max_hedge_rate=0.05, burst=10.0, min_delay_ms=5.0,
+                 min_samples=20, window=500):
+        self.percentile = percentile
+        self.max_hedge_rate = max_hedge_rate
+        self.burst = burst
+        self.min_delay_ms = min_delay_ms
+        self.min_samples = min_samples
+
+        self._lock = threading.Lock()
+        self._latencies = collections.deque(maxlen=window)
+        self._sorted = None
+        # Every primary call earns max_hedge_rate tokens; a hedge spends one
+        self._tokens = burst
+        self.stats = {
+            'calls': 0,
+            'hedges_issued': 0,
+            'hedges_won': 0,
+            'budget_exhausted': 0
+        }
+
+    def observe(self, latency_ms):
+        """Record the latency of one completed upstream call"""
+        with self._lock:
+            self._latencies.append(latency_ms)
+            self._sorted = None
+
+    def hedge_delay(self):
+        """Seconds to wait before hedging a new call, or None while there is too little history"""
+        with self._lock:
+            self.stats['calls'] += 1
+            self._tokens = min(self.burst, self._tokens + self.max_hedge_rate)
+            if len(self._latencies) < self.min_samples:
+                return None
+            if self._sorted is None:
+                self._sorted = sorted(self._latencies)
+            index = min(len(self._sorted) - 1, int(len(self._sorted) * self.percentile / 100.0))
+            return max(self._sorted[index], self.min_delay_ms) / 1000.0
+
+    def try_hedge(self):
+        """Spend one hedge token; False when the budget is used up"""
+        with self._lock:
+            if self._tokens < 1.0:
+                self.stats['budget_exhausted'] += 1
+                return False
+            self._tokens -= 1.0
+            self.stats['hedges_issued'] += 1
+            return True
+
+    def record_win(self):
+        with self._lock:
+            self.stats['hedges_won'] += 1
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats.update({
+                'percentile': self.percentile,
+                'max_hedge_rate': self.max_hedge_rate,
+                'samples': len(self._latencies),
+                'tokens': self._tokens,
+                'hedge_rate': (stats['hedges_issued'] / stats['calls']) if stats['calls'] else 0.0,
+                'win_rate': (stats['hedges_won'] / stats['hedges_issued']) if stats['hedges_issued'] else 0.0
+            })
+        return stats
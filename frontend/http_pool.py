@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Session for AI4Bharat Dashboard
+Keeps keep-alive connections to the model endpoint open across Flask's threaded workers.
+Checking a connection out of the pool and opening a new one are timed as trace spans.
+"""
+
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+import tracing
+
+# Only these methods are safe to resend after a failure
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+# Upstream statuses that are worth retrying for idempotent requests
+RETRY_STATUSES = frozenset([502, 503, 504])
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        with tracing.span('connect'):
+            super().connect()
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        with tracing.span('connect'):
+            super().connect()
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+    def _get_conn(self, timeout=None):
+        # Includes the wait for a free connection when pool_block is set
+        with tracing.span('conn_wait'):
+            return super()._get_conn(timeout)
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+    def _get_conn(self, timeout=None):
+        with tracing.span('conn_wait'):
+            return super()._get_conn(timeout)
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools report connection checkout and connect time to the current trace"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool
+        }
+
+
+class PooledSession:
+    """Thread-safe pooled connection layer shared by all requests to the model"""
+
+    def __init__(self, pool_connections=10, pool_maxsize=20, pool_block=False,
+                 max_retries=2, backoff_factor=0.2, backoff_max=2.0):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+
+        # Retries are handled here so they only ever apply to idempotent calls
+        self.adapter = TimedHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=0
+        )
+        self.session = requests.Session()
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        self.session.headers.update({'Connection': 'keep-alive'})
+
+        self._lock = threading.Lock()
+        self.stats = {
+            'requests': 0,
+            'errors': 0,
+            'retries': 0
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def backoff_delay(self, attempt):
+        """Exponential backoff with full jitter for the given retry attempt"""
+        delay = min(self.backoff_max, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, delay)
+
+    def request(self, method, url, **kwargs):
+        """Send a request over the pool, retrying idempotent methods with backoff"""
+        method = method.upper()
+        retries = self.max_retries if method in IDEMPOTENT_METHODS else 0
+        attempt = 0
+
+        while True:
+            self._count('requests')
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self._count('errors')
+                if attempt >= retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    return response
+                response.close()
+
+            self._count('retries')
+            time.sleep(self.backoff_delay(attempt))
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    @staticmethod
+    def _idle_connections(pool):
+        # urllib3 pads the queue with None placeholders, only real entries are idle sockets
+        if pool.pool is None:
+            return 0
+        return sum(1 for conn in list(pool.pool.queue) if conn is not None)
+
+    def pool_stats(self):
+        """Snapshot of request counters and per-host connection pool usage"""
+        hosts = {}
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{key.key_scheme}://{key.key_host}:{key.key_port}"
+            hosts[host] = {
+                'connections_created': pool.num_connections,
+                'requests': pool.num_requests,
+                'idle_connections': self._idle_connections(pool),
+                'max_size': self.pool_maxsize
+            }
+
+        with self._lock:
+            stats = dict(self.stats)
+
+        stats.update({
+            'pool_connections': self.pool_connections,
+            'pool_maxsize': self.pool_maxsize,
+            'pool_block': self.pool_block,
+            'hosts': hosts
+        })
+        return stats
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Translation Job Queue for AI4Bharat Dashboard
+Large jobs are stored item by item in a sqlite file and drained by background workers,
+so a submit returns at once, progress survives restarts and failed items are retried.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+
+ACTIVE_STATES = ('queued', 'running')
+
+
+class JobNotFound(KeyError):
+    """Raised for an unknown job id"""
+
+
+class JobStore:
+    """
+    Durable job and item state in sqlite, safe to share between worker processes.
+    Items are claimed with a lease; a worker that dies leaves its lease to expire and
+    the items are picked up again, which is how work survives a restart.
+    """
+
+    def __init__(self, path, max_attempts=3, retry_backoff=2.0, lease_seconds=120.0):
+        self.path = path
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff = retry_backoff
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            'id TEXT PRIMARY KEY, status TEXT NOT NULL, total INTEGER NOT NULL, '
+            'done INTEGER NOT NULL DEFAULT 0, failed INTEGER NOT NULL DEFAULT 0, '
+            'retries INTEGER NOT NULL DEFAULT 0, options TEXT NOT NULL, created_at REAL NOT NULL, '
+            'started_at REAL, finished_at REAL)'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS items ('
+            'job_id TEXT NOT NULL, idx INTEGER NOT NULL, item_id TEXT, text TEXT NOT NULL, '
+            'source_language TEXT NOT NULL, target_language TEXT NOT NULL, status TEXT NOT NULL, '
+            'attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL DEFAULT 0, '
+            'lease_until REAL NOT NULL DEFAULT 0, result TEXT, error TEXT, '
+            'PRIMARY KEY (job_id, idx))'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS items_ready ON items (status, next_attempt_at)')
+
+    def _connection(self):
+        # sqlite connections cannot be shared across threads, so keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def submit(self, jobs, options=None):
+        """Store bulk_translate job dicts as a new job; returns its id"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        rows = []
+        for job in jobs:
+            item_id = job.get('id')
+            rows.append((
+                job_id, job['index'], None if item_id is None else json.dumps(item_id),
+                job.get('text', ''), job.get('source_language', 'auto'), job.get('target_language', 'en'),
+                # Items that could not be parsed are failed up front and never reach a worker
+                'failed' if 'error' in job or not job.get('text') else 'pending',
+                job.get('error') or (None if job.get('text') else 'No text provided')
+            ))
+        failed = sum(1 for row in rows if row[6] == 'failed')
+        status = 'queued' if failed < len(rows) else 'completed_with_errors'
+
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT INTO jobs (id, status, total, failed, options, created_at, finished_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job_id, status, len(rows), failed, json.dumps(options or {}), now,
+                 None if status == 'queued' else now)
+            )
+            conn.executemany(
+                'INSERT INTO items (job_id, idx, item_id, text, source_language, target_language, status, error) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return job_id
+
+    def claim(self, limit=1):
+        """Lease up to `limit` ready items (pending and due, or with an expired lease)"""
+        now = time.time()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(
+                'SELECT items.job_id, idx, text, source_language, target_language, attempts FROM items '
+                'JOIN jobs ON jobs.id = items.job_id '
+                "WHERE (items.status = 'pending' AND next_attempt_at <= ?) "
+                "OR (items.status = 'running' AND lease_until < ?) "
+                'ORDER BY jobs.created_at, idx LIMIT ?',
+                (now, now, limit)
+            ).fetchall()
+            for job_id, idx, _, _, _, _ in rows:
+                conn.execute(
+                    "UPDATE items SET status = 'running', attempts = attempts + 1, lease_until = ? "
+                    'WHERE job_id = ? AND idx = ?',
+                    (now + self.lease_seconds, job_id, idx)
+                )
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', started_at = COALESCE(started_at, ?) "
+                    "WHERE id = ? AND status = 'queued'",
+                    (now, job_id)
+                )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return [{
+            'job_id': job_id,
+            'index': idx,
+            'text': text,
+            'source_language': source_lang,
+            'target_language': target_lang,
+            'attempt': attempts + 1
+        } for job_id, idx, text, source_lang, target_lang, attempts in rows]
+
+    def complete(self, item, result):
+        """Store a translated item"""
+        self._finish(item, 'done', json.dumps(result, ensure_ascii=False, default=str), None)
+
+    def fail(self, item, error, retry_after=None, final=False):
+        """Schedule a retry with exponential backoff, or fail the item once attempts run out"""
+        if final or item['attempt'] >= self.max_attempts:
+            self._finish(item, 'failed', None, error)
+            return False
+
+        delay = retry_after if retry_after is not None else self.retry_backoff * (2 ** (item['attempt'] - 1))
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                "UPDATE items SET status = 'pending', next_attempt_at = ?, lease_until = 0, error = ? "
+                "WHERE job_id = ? AND idx = ? AND status = 'running'",
+                (time.time() + delay, error, item['job_id'], item['index'])
+            )
+            conn.execute('UPDATE jobs SET retries = retries + 1 WHERE id = ?', (item['job_id'],))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return True
+
+    def release(self, item, retry_after=None):
+        """
+        Give a claimed item back without spending an attempt (e.g. the server was saturated).
+        It is not claimable again for retry_after seconds, and never sooner than retry_backoff.
+        """
+        delay = max(retry_after or 0.0, self.retry_backoff)
+        conn = self._connection()
+        conn.execute(
+            "UPDATE items SET status = 'pending', attempts = attempts - 1, next_attempt_at = ?, lease_until = 0 "
+            "WHERE job_id = ? AND idx = ? AND status = 'running'",
+            (time.time() + delay, item['job_id'], item['index'])
+        )
+
+    def _finish(self, item, status, result, error):
+        now = time.time()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # A lease that expired and was re-claimed elsewhere may already have finished the item
+            updated = conn.execute(
+                'UPDATE items SET status = ?, result = ?, error = ?, lease_until = 0 '
+                "WHERE job_id = ? AND idx = ? AND status = 'running'",
+                (status, result, error, item['job_id'], item['index'])
+            ).rowcount
+            if updated:
+                column = 'done' if status == 'done' else 'failed'
+                conn.execute(f'UPDATE jobs SET {column} = {column} + 1 WHERE id = ?', (item['job_id'],))
+                conn.execute(
+                    "UPDATE jobs SET finished_at = ?, status = CASE WHEN failed > 0 "
+                    "THEN 'completed_with_errors' ELSE 'completed' END "
+                    "WHERE id = ? AND done + failed >= total AND status IN ('queued', 'running')",
+                    (now, item['job_id'])
+                )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def cancel(self, job_id):
+        """Stop a job; items already translated keep their results"""
+        now = time.time()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if conn.execute('SELECT 1 FROM jobs WHERE id = ?', (job_id,)).fetchone() is None:
+                raise JobNotFound(job_id)
+            conn.execute(
+                "UPDATE items SET status = 'cancelled' WHERE job_id = ? AND status IN ('pending', 'running')",
+                (job_id,)
+            )
+            conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+                (now, job_id)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return self.get_job(job_id)
+
+    def get_job(self, job_id):
+        """Progress and throughput for one job"""
+        row = self._connection().execute(
+            'SELECT id, status, total, done, failed, retries, options, created_at, started_at, finished_at '
+            'FROM jobs WHERE id = ?', (job_id,)
+        ).fetchone()
+        if row is None:
+            raise JobNotFound(job_id)
+        job_id, status, total, done, failed, retries, options, created_at, started_at, finished_at = row
+
+        now = time.time()
+        elapsed = ((finished_at or now) - started_at) if started_at else 0.0
+        throughput = done / elapsed if elapsed > 0 else 0.0
+        remaining = total - done - failed
+        return {
+            'job_id': job_id,
+            'status': status,
+            'total': total,
+            'done': done,
+            'failed': failed,
+            'remaining': remaining if status in ACTIVE_STATES else 0,
+            'retries': retries,
+            'progress': (done + failed) / total if total else 1.0,
+            'throughput_per_second': throughput,
+            'eta_seconds': remaining / throughput if throughput and status in ACTIVE_STATES else None,
+            'elapsed_seconds': elapsed,
+            'queued_seconds': (started_at or now) - created_at,
+            'options': json.loads(options),
+            'created_at': created_at,
+            'started_at': started_at,
+            'finished_at': finished_at
+        }
+
+    def get_results(self, job_id, offset=0, limit=100):
+        """One page of item results in submission order"""
+        self.get_job(job_id)
+        rows = self._connection().execute(
+            'SELECT idx, item_id, source_language, target_language, status, attempts, result, error '
+            'FROM items WHERE job_id = ? AND idx >= ? ORDER BY idx LIMIT ?',
+            (job_id, offset, limit)
+        ).fetchall()
+        items = []
+        for idx, item_id, source_lang, target_lang, status, attempts, result, error in rows:
+            item = {
+                'index': idx,
+                'id': None if item_id is None else json.loads(item_id),
+                'status': status,
+                'attempts': attempts,
+                'source_language': source_lang,
+                'target_language': target_lang
+            }
+            if result is not None:
+                item['result'] = json.loads(result)
+            if error is not None:
+                item['error'] = error
+            items.append(item)
+        return items
+
+    def purge(self, older_than):
+        """Delete finished jobs that ended before `older_than` (epoch seconds)"""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            ids = [row[0] for row in conn.execute(
+                "SELECT id FROM jobs WHERE status NOT IN ('queued', 'running') AND finished_at < ?",
+                (older_than,)
+            )]
+            for job_id in ids:
+                conn.execute('DELETE FROM items WHERE job_id = ?', (job_id,))
+                conn.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return len(ids)
+
+    def get_stats(self):
+        conn = self._connection()
+        items = dict(conn.execute(
+            "SELECT status, COUNT(*) FROM items WHERE status IN ('pending', 'running') GROUP BY status"
+        ).fetchall())
+        jobs = dict(conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+        return {
+            'path': self.path,
+            'jobs': jobs,
+            'pending_items': items.get('pending', 0),
+            'running_items': items.get('running', 0),
+            'max_attempts': self.max_attempts
+        }
+
+
+class JobWorkerPool:
+    """Background threads draining a JobStore through translate_fn(text, source_lang, target_lang)"""
+
+    def __init__(self, store, translate_fn, workers=4, poll_interval=1.0, retry_fallbacks=True,
+                 retention_seconds=86400.0):
+        self.store = store
+        self.translate_fn = translate_fn
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        # A fallback answer means the model was unavailable, so try again before accepting it
+        self.retry_fallbacks = retry_fallbacks
+        self.retention_seconds = retention_seconds
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._stop = threading.Event()
+        self._threads = []
+        self._pid = None
+        self._last_purge = 0.0
+        self.stats = {
+            'processed': 0,
+            'succeeded': 0,
+            'retried': 0,
+            'failed': 0,
+            'deferred': 0
+        }
+
+    def ensure_started(self):
+        """Start the workers once per process (forked workers get their own)"""
+        with self._lock:
+            if self._pid == os.getpid() and any(thread.is_alive() for thread in self._threads):
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(target=self._run, name=f'job-worker-{i}', daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.notify()
+
+    def notify(self):
+        """Wake idle workers, e.g. after a submit"""
+        with self._wakeup:
+            self._wakeup.notify_all()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._maybe_purge()
+                items = self.store.claim(1)
+            except sqlite3.Error as e:
+                print(f"Job queue error: {e}")
+                items = []
+            if not items:
+                # Polling also picks up retries coming due and jobs submitted by other processes
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+                continue
+            for item in items:
+                try:
+                    self.process(item)
+                except Exception as e:
+                    # The item's lease runs out and another claim retries it
+                    print(f"Job queue error on {item['job_id']}[{item['index']}]: {e}")
+
+    def process(self, item):
+        """Translate one claimed item and record the outcome"""
+        self._count('processed')
+        try:
+            result = self.translate_fn(item['text'], item['source_language'], item['target_language'])
+        except Exception as e:
+            retry_after = getattr(e, 'retry_after', None)
+            if retry_after is not None:
+                # Turned away by admission control: come back later without spending an attempt
+                self.store.release(item, retry_after)
+                self._count('deferred')
+                return
+            self._record_failure(item, str(e))
+            return
+
+        if not result.get('success'):
+            self._record_failure(item, result.get('error', 'Translation failed'))
+        elif self.retry_fallbacks and str(result.get('source', '')).startswith('fallback') \
+                and item['attempt'] < self.store.max_attempts:
+            self._record_failure(item, 'Model unavailable, served by fallback')
+        else:
+            self.store.complete(item, result)
+            self._count('succeeded')
+
+    def _record_failure(self, item, error):
+        if self.store.fail(item, error):
+            self._count('retried')
+        else:
+            self._count('failed')
+
+    def _maybe_purge(self):
+        now = time.time()
+        if now - self._last_purge < 3600:
+            return
+        self._last_purge = now
+        purged = self.store.purge(now - self.retention_seconds)
+        if purged:
+            print(f"Purged {purged} finished translation jobs")
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats.update(self.store.get_stats())
+        stats['workers'] = self.workers
+        stats['running'] = any(thread.is_alive() for thread in self._threads)
+        return stats
+
+
+def default_job_path():
+    return os.path.join(tempfile.gettempdir(), 'ai4bharat-translation-jobs.sqlite3')
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Language Detection for AI4Bharat Dashboard
+Local script detection from Unicode blocks, with marker-word and suffix scoring
+to tell apart languages that share a script (Hindi, Marathi, Nepali)
+"""
+
+import re
+
+from mock_translations import get_supported_languages
+
+# Indic blocks are 128 code points wide and aligned, so codepoint >> 7 names the block
+SCRIPT_BLOCKS = {
+    0x0900 >> 7: 'Devanagari',
+    0x0980 >> 7: 'Bengali',
+    0x0A00 >> 7: 'Gurmukhi',
+    0x0A80 >> 7: 'Gujarati',
+    0x0B80 >> 7: 'Tamil',
+    0x0C00 >> 7: 'Telugu',
+    0x0C80 >> 7: 'Kannada',
+    0x0D00 >> 7: 'Malayalam'
+}
+
+# Devanagari Extended, for the rare characters outside the main block
+EXTENDED_BLOCKS = {
+    0xA8E0 >> 5: 'Devanagari'
+}
+
+# Only this many characters are inspected; enough to settle the script
+SAMPLE_CHARS = 256
+
+# Punctuation shared by several scripts (danda, double danda) is not evidence
+SHARED_CHARS = {'।', '॥'}
+
+# Common function words and suffixes that separate Devanagari languages.
+# Words score when they match a whole token, suffixes when a token ends with them.
+DEVANAGARI_MARKERS = {
+    'hi': {
+        'words': {
+            'है': 3, 'हैं': 3, 'और': 2, 'का': 1, 'की': 1, 'के': 1, 'में': 2, 'से': 1,
+            'नहीं': 2, 'आप': 1, 'मैं': 2, 'हूं': 2, 'हूँ': 2, 'यह': 2, 'था': 2, 'थी': 2,
+            'कैसे': 2, 'हो': 1, 'क्या': 2, 'भी': 1, 'लिए': 2, 'आपका': 2, 'बहुत': 2
+        },
+        'suffixes': {'ता': 1, 'ती': 1, 'ना': 1}
+    },
+    'mr': {
+        'words': {
+            'आहे': 3, 'आहेत': 3, 'आणि': 3, 'नाही': 2, 'मी': 2, 'तुम्ही': 3, 'काय': 2,
+            'कसे': 2, 'आम्ही': 3, 'होते': 2, 'माझे': 3, 'तुमचे': 3, 'हे': 1, 'व': 1,
+            'नमस्कार': 2, 'आहात': 3, 'खूप': 2
+        },
+        'suffixes': {'च्या': 2, 'चा': 1, 'ची': 1, 'चे': 1, 'ला': 1, 'ळ': 1, 'ात': 1}
+    },
+    'ne': {
+        'words': {
+            'छ': 3, 'छन्': 3, 'छु': 3, 'र': 2, 'मा': 1, 'को': 1, 'लाई': 3, 'तपाईं': 3,
+            'तपाईँ': 3, 'हुनुहुन्छ': 4, 'म': 2, 'भयो': 3, 'पनि': 2, 'थियो': 3, 'हुन्छ': 3,
+            'गर्नुहोस्': 3, 'होइन': 3
+        },
+        'suffixes': {'्छ': 2, '्छन्': 2, 'ेको': 2, 'हरू': 2, 'ियो': 1}
+    }
+}
+
+DEFAULT_FOR_SCRIPT = {'Devanagari': 'hi'}
+
+TOKEN = re.compile(r'[ऀ-ॣ०-ॿ꣠-ꣿ]+')
+
+
+def _language_for_script():
+    mapping = {}
+    for code, info in get_supported_languages().items():
+        mapping.setdefault(info['script'], code)
+    mapping.update(DEFAULT_FOR_SCRIPT)
+    return mapping
+
+
+LANGUAGE_FOR_SCRIPT = _language_for_script()
+
+
+def script_counts(text, limit=SAMPLE_CHARS):
+    """Count letters per script in the first `limit` characters"""
+    counts = {}
+    for char in text[:limit]:
+        codepoint = ord(char)
+        if codepoint < 0x80:
+            if char.isalpha():
+                counts['Latin'] = counts.get('Latin', 0) + 1
+            continue
+        if char in SHARED_CHARS:
+            continue
+        script = SCRIPT_BLOCKS.get(codepoint >> 7) or EXTENDED_BLOCKS.get(codepoint >> 5)
+        if script is None and char.isalpha() and codepoint < 0x0250:
+            script = 'Latin'
+        if script is not None:
+            counts[script] = counts.get(script, 0) + 1
+    return counts
+
+
+def score_devanagari(text, limit=SAMPLE_CHARS):
+    """Marker scores per Devanagari language"""
+    scores = {language: 0 for language in DEVANAGARI_MARKERS}
+    for token in TOKEN.findall(text[:limit]):
+        for language, markers in DEVANAGARI_MARKERS.items():
+            weight = markers['words'].get(token)
+            if weight:
+                scores[language] += weight
+                continue
+            for suffix, suffix_weight in markers['suffixes'].items():
+                if len(token) > len(suffix) and token.endswith(suffix):
+                    scores[language] += suffix_weight
+                    break
+    return scores
+
+
+def detect_language(text, limit=SAMPLE_CHARS):
+    """
+    Return (language code, confidence) for text, or (None, 0.0) when it has no
+    letters of a known script. Confidence is the dominant script's share of letters,
+    scaled down when same-script disambiguation is close.
+    """
+    counts = script_counts(text, limit)
+    if not counts:
+        return None, 0.0
+
+    script, letters = max(counts.items(), key=lambda item: item[1])
+    confidence = letters / sum(counts.values())
+    language = LANGUAGE_FOR_SCRIPT.get(script)
+
+    if script == 'Devanagari':
+        scores = score_devanagari(text, limit)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        best, best_score = ranked[0]
+        runner_up = ranked[1][1]
+        if best_score > runner_up:
+            language = best
+            confidence *= best_score / (best_score + runner_up)
+        else:
+            # No distinguishing markers: keep the script default with reduced confidence
+            confidence *= 0.5
+
+    return language, round(confidence, 3)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Server-side Metrics for AI4Bharat Dashboard
+Counters, gauges and histograms with Prometheus text exposition.
+
+Each metric keeps one dict of label values -> sample behind its own lock; a
+recording holds it for a dict update only, and reads copy the dict under it.
+"""
+
+import bisect
+import threading
+
+from mock_translations import get_supported_languages
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+EXPOSITION_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Language codes arrive from request bodies; anything else is labelled 'other' so a client
+# cannot mint unbounded label sets (and memory) with made-up codes
+LABEL_LANGUAGES = frozenset(get_supported_languages()) | {'auto'}
+
+
+class _Metric:
+    """Base class holding one dict of label values -> sample"""
+
+    type_name = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _label_key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def values(self):
+        """Snapshot of every label set's sample"""
+        with self._lock:
+            return self._copy(self._values)
+
+    def _format_labels(self, key, extra=None):
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.extend(extra)
+        if not pairs:
+            return ''
+        body = ','.join(f'{name}="{_escape(value)}"' for name, value in pairs)
+        return '{' + body + '}'
+
+    def expose(self):
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.type_name}'
+        ]
+        lines.extend(self._expose_samples())
+        return lines
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    @staticmethod
+    def _copy(values):
+        return dict(values)
+
+    def _expose_samples(self):
+        return [f'{self.name}{self._format_labels(key)} {_format_number(value)}'
+                for key, value in sorted(self.values().items())]
+
+
+class Gauge(Counter):
+    """Up/down gauge sharing Counter's storage; dec() is a negative inc()"""
+
+    type_name = 'gauge'
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def track(self, **labels):
+        return _GaugeTracker(self, labels)
+
+
+class _GaugeTracker:
+    def __init__(self, gauge, labels):
+        self.gauge = gauge
+        self.labels = labels
+
+    def __enter__(self):
+        self.gauge.inc(**self.labels)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.gauge.dec(**self.labels)
+        return False
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            sample = self._values.get(key)
+            if sample is None:
+                # Per-bucket counts (non-cumulative), +Inf last, then sum and count
+                sample = [0] * (len(self.buckets) + 1) + [0.0, 0]
+                self._values[key] = sample
+            sample[index] += 1
+            sample[-2] += value
+            sample[-1] += 1
+
+    @staticmethod
+    def _copy(values):
+        return {key: list(sample) for key, sample in values.items()}
+
+    def summary(self, quantiles=(0.5, 0.95, 0.99)):
+        """Count, mean and bucket-interpolated quantiles per label set"""
+        result = {}
+        for key, sample in self.values().items():
+            count = sample[-1]
+            label = ','.join(key) if key else 'all'
+            result[label] = {
+                'count': count,
+                'mean': (sample[-2] / count) if count else 0.0
+            }
+            for quantile in quantiles:
+                result[label][f'p{int(quantile * 100)}'] = self._quantile(sample, quantile)
+        return result
+
+    def _quantile(self, sample, quantile):
+        count = sample[-1]
+        if not count:
+            return 0.0
+        rank = quantile * count
+        seen = 0
+        lower = 0.0
+        for index, upper in enumerate(self.buckets):
+            in_bucket = sample[index]
+            if seen + in_bucket >= rank and in_bucket:
+                return lower + (upper - lower) * ((rank - seen) / in_bucket)
+            seen += in_bucket
+            lower = upper
+        return self.buckets[-1]
+
+    def _expose_samples(self):
+        lines = []
+        for key, sample in sorted(self.values().items()):
+            cumulative = 0
+            for index, upper in enumerate(self.buckets):
+                cumulative += sample[index]
+                lines.append(f'{self.name}_bucket{self._format_labels(key, [("le", _format_number(upper))])} {cumulative}')
+            cumulative += sample[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{self._format_labels(key, [("le", "+Inf")])} {cumulative}')
+            lines.append(f'{self.name}_sum{self._format_labels(key)} {_format_number(sample[-2])}')
+            lines.append(f'{self.name}_count{self._format_labels(key)} {sample[-1]}')
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric and renders the exposition text"""
+
+    def __init__(self, prefix='ai4bharat_'):
+        self.prefix = prefix
+        self._metrics = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(self.prefix + name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(self.prefix + name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(self.prefix + name, documentation, labelnames, buckets))
+
+    def expose(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.expose())
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_number(value):
+    if isinstance(value, float) and value.is_integer():
+        return repr(value)
+    return str(value)
+
+
+# Translate-path instrumentation shared by the sync and async servers
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    'http_requests_total', 'HTTP requests handled, by route, method and status', ('route', 'method', 'status'))
+http_request_duration = registry.histogram(
+    'http_request_duration_seconds', 'HTTP request handling time by route', ('route',))
+translate_requests = registry.counter(
+    'translate_requests_total', 'Translate requests by language pair and result source', ('language_pair', 'source'))
+translate_errors = registry.counter(
+    'translate_errors_total', 'Translate requests that returned an error status', ('language_pair', 'status'))
+translate_fallbacks = registry.counter(
+    'translate_fallbacks_total', 'Translate requests answered by the fallback engine', ('language_pair',))
+coalesced_requests = registry.counter(
+    'translate_coalesced_total', 'Translate requests that shared an identical in-flight upstream call')
+admission_rejections = registry.counter(
+    'admission_rejections_total', 'Requests turned away by admission control or rate limits', ('reason',))
+hedges_issued = registry.counter(
+    'upstream_hedges_issued_total', 'Duplicate predict calls sent because the first was slow')
+hedges_won = registry.counter(
+    'upstream_hedges_won_total', 'Hedged predict calls that answered before the original')
+scheduler_queue_depth = registry.gauge(
+    'scheduler_queue_depth', 'Translations waiting for a model slot, by priority class', ('priority',))
+scheduler_wait = registry.histogram(
+    'scheduler_wait_seconds', 'Time spent waiting for a model slot, by priority class', ('priority',))
+translate_in_flight = registry.gauge(
+    'translate_in_flight', 'Translate requests currently being processed')
+translate_duration = registry.histogram(
+    'translate_duration_seconds', 'End-to-end translate handling time', ('language_pair',))
+upstream_duration = registry.histogram(
+    'translate_upstream_duration_seconds', 'Model predict time for translate requests', ('language_pair',))
+overhead_duration = registry.histogram(
+    'translate_server_overhead_seconds', 'Translate handling time not spent waiting on the model', ('language_pair',))
+request_bytes = registry.histogram(
+    'translate_request_bytes', 'Translate request text size in bytes', ('language_pair',), SIZE_BUCKETS)
+response_bytes = registry.histogram(
+    'translate_response_bytes', 'Translate response body size in bytes', ('language_pair',), SIZE_BUCKETS)
+
+
+def _language_label(code):
+    return code if code in LABEL_LANGUAGES else 'other'
+
+
+def language_pair(source_lang, target_lang):
+    return f"{_language_label(source_lang or 'auto')}-{_language_label(target_lang)}"
+
+
+def observe_translation(source_lang, target_lang, result, duration, text_bytes, body_bytes):
+    """Record one completed /api/translate call"""
+    pair = language_pair(source_lang, target_lang)
+    source = 'cache' if result.get('cache_hit') else result.get('source', 'unknown')
+
+    translate_requests.inc(language_pair=pair, source=source)
+    if str(source).startswith('fallback'):
+        translate_fallbacks.inc(language_pair=pair)
+
+    translate_duration.observe(duration, language_pair=pair)
+    upstream = 0.0
+    if source == 'ai4bharat_model':
+        upstream = result.get('response_time', 0) / 1000.0
+        upstream_duration.observe(upstream, language_pair=pair)
+    overhead_duration.observe(max(0.0, duration - upstream), language_pair=pair)
+    request_bytes.observe(text_bytes, language_pair=pair)
+    response_bytes.observe(body_bytes, language_pair=pair)
+
+
+def observe_translate_error(source_lang, target_lang, status):
+    translate_errors.inc(language_pair=language_pair(source_lang, target_lang), status=status)
+
+
+def observe_http_request(route, method, status, duration):
+    http_requests.inc(route=route, method=method, status=status)
+    http_request_duration.observe(duration, route=route)
+
+
+def get_summary():
+    """JSON-friendly digest of the translate metrics for /api/metrics"""
+    return {
+        'in_flight': sum(translate_in_flight.values().values()),
+        'requests': {','.join(key): value for key, value in translate_requests.values().items()},
+        'errors': {','.join(key): value for key, value in translate_errors.values().items()},
+        'fallbacks': {','.join(key): value for key, value in translate_fallbacks.values().items()},
+        'coalesced': sum(coalesced_requests.values().values()),
+        'rejections': {','.join(key): value for key, value in admission_rejections.values().items()},
+        'hedges': {
+            'issued': sum(hedges_issued.values().values()),
+            'won': sum(hedges_won.values().values())
+        },
+        'latency_seconds': translate_duration.summary(),
+        'upstream_seconds': upstream_duration.summary(),
+        'server_overhead_seconds': overhead_duration.summary(),
+        'routes': {','.join(key): value for key, value in http_requests.values().items()}
+    }
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Model Endpoint Pool for AI4Bharat Dashboard
+Routes predict calls by task and language pair across several InferenceServices/replicas,
+balancing on outstanding requests weighted by latency (EWMA) and ejecting failing endpoints
+"""
+
+import json
+import os
+import threading
+import time
+
+TRANSLATION_TASK = 'translation'
+
+
+class NoEndpointError(Exception):
+    """Raised when no configured endpoint serves the requested task and language pair"""
+
+
+class ModelEndpoint:
+    """One predictor (InferenceService or replica) and its live load/latency state"""
+
+    def __init__(self, url, model, tasks=('translation',), languages=('*',), weight=1.0, name=None):
+        self.url = url.rstrip('/')
+        self.model = model
+        self.tasks = tuple(tasks)
+        # Patterns like 'hi-en', '*-en', 'hi-*' or '*'
+        self.languages = tuple(languages)
+        self.weight = max(0.01, float(weight))
+        self.name = name or f'{model}@{self.url}'
+
+        self.outstanding = 0
+        self.ewma_latency_ms = None
+        self.consecutive_failures = 0
+        self.ejections_in_row = 0
+        self.ejected_until = 0.0
+        self.healthy = None
+        self.stats = {
+            'requests': 0,
+            'failures': 0,
+            'ejections': 0
+        }
+
+    def model_url(self, path=''):
+        return f"{self.url}/v1/models/{self.model}{path}"
+
+    def serves(self, task, source_lang, target_lang):
+        if task not in self.tasks:
+            return False
+        for pattern in self.languages:
+            if pattern == '*':
+                return True
+            source, _, target = pattern.partition('-')
+            if source in ('*', source_lang) and target in ('*', target_lang):
+                return True
+        return False
+
+    def is_ejected(self, now):
+        return self.ejected_until > now
+
+    def get_stats(self, now):
+        stats = dict(self.stats)
+        stats.update({
+            'name': self.name,
+            'url': self.url,
+            'model': self.model,
+            'tasks': list(self.tasks),
+            'languages': list(self.languages),
+            'weight': self.weight,
+            'outstanding': self.outstanding,
+            'ewma_latency_ms': self.ewma_latency_ms,
+            'consecutive_failures': self.consecutive_failures,
+            'healthy': self.healthy,
+            'ejected': self.is_ejected(now),
+            'seconds_until_return': max(0.0, self.ejected_until - now)
+        })
+        return stats
+
+
+def parse_endpoints(spec, default_url, default_model):
+    """
+    Build endpoints from MODEL_ENDPOINTS: a JSON list (or a path to a JSON file) of
+    {"url", "model", "tasks", "languages", "weight", "name"} objects. Missing fields
+    fall back to the single AI4BHARAT_ENDPOINT / model_name configuration.
+    """
+    if not spec:
+        return [ModelEndpoint(default_url, default_model)]
+
+    if not spec.lstrip().startswith('[') and os.path.exists(spec):
+        with open(spec, encoding='utf-8') as f:
+            spec = f.read()
+    entries = json.loads(spec)
+    if not isinstance(entries, list) or not entries:
+        raise ValueError('MODEL_ENDPOINTS must be a non-empty JSON list')
+
+    endpoints = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {'url': entry}
+        endpoints.append(ModelEndpoint(
+            entry.get('url', default_url),
+            entry.get('model', default_model),
+            tasks=entry.get('tasks', ('translation',)),
+            languages=entry.get('languages', ('*',)),
+            weight=entry.get('weight', 1.0),
+            name=entry.get('name')
+        ))
+    return endpoints
+
+
+class EndpointPool:
+    """Least-outstanding-requests balancing, weighted by EWMA latency, with outlier ejection"""
+
+    def __init__(self, endpoints, ewma_alpha=0.3, eject_after=3, eject_seconds=30.0, max_eject_seconds=300.0):
+        self.endpoints = list(endpoints)
+        self.ewma_alpha = ewma_alpha
+        self.eject_after = max(1, eject_after)
+        self.eject_seconds = eject_seconds
+        self.max_eject_seconds = max_eject_seconds
+        self._lock = threading.Lock()
+
+    @property
+    def primary(self):
+        return self.endpoints[0]
+
+    def _score(self, endpoint, default_latency):
+        # Expected wait if we join this endpoint's queue, scaled down for bigger replicas
+        latency = endpoint.ewma_latency_ms if endpoint.ewma_latency_ms is not None else default_latency
+        return (endpoint.outstanding + 1) * max(latency, 1.0) / endpoint.weight
+
+    def has_candidate(self, task, source_lang, target_lang, exclude=()):
+        """True when some endpoint outside `exclude` serves the task and pair"""
+        return any(
+            endpoint not in exclude and endpoint.serves(task, source_lang, target_lang)
+            for endpoint in self.endpoints
+        )
+
+    def acquire(self, task, source_lang, target_lang, exclude=(), avoid=()):
+        """
+        Pick an endpoint for one call and count it as outstanding; pair with release().
+        Endpoints in `exclude` are never used, those in `avoid` only when nothing else is left.
+        """
+        now = time.time()
+        with self._lock:
+            candidates = [
+                endpoint for endpoint in self.endpoints
+                if endpoint not in exclude and endpoint.serves(task, source_lang, target_lang)
+            ]
+            if not candidates:
+                raise NoEndpointError(f"No endpoint serves {task} for {source_lang}-{target_lang}")
+
+            available = [endpoint for endpoint in candidates if not endpoint.is_ejected(now)]
+            if not available:
+                # Everything is ejected: fail open to the endpoint due back soonest
+                available = [min(candidates, key=lambda endpoint: endpoint.ejected_until)]
+            preferred = [endpoint for endpoint in available if endpoint not in avoid]
+            if preferred:
+                available = preferred
+
+            known = [endpoint.ewma_latency_ms for endpoint in available if endpoint.ewma_latency_ms is not None]
+            # Unmeasured endpoints look as fast as the best one so they get tried
+            default_latency = min(known) if known else 1.0
+            chosen = min(available, key=lambda endpoint: self._score(endpoint, default_latency))
+            chosen.outstanding += 1
+            chosen.stats['requests'] += 1
+            return chosen
+
+    def release(self, endpoint, latency_ms, ok):
+        """Record the outcome of a call started with acquire()"""
+        with self._lock:
+            endpoint.outstanding -= 1
+            if ok:
+                if endpoint.ewma_latency_ms is None:
+                    endpoint.ewma_latency_ms = latency_ms
+                else:
+                    endpoint.ewma_latency_ms += self.ewma_alpha * (latency_ms - endpoint.ewma_latency_ms)
+                self._mark_success(endpoint)
+            else:
+                endpoint.stats['failures'] += 1
+                self._mark_failure(endpoint)
+
+    def record_probe(self, endpoint, healthy):
+        """Feed a health probe result; a passing probe brings an ejected endpoint back"""
+        with self._lock:
+            endpoint.healthy = healthy
+            if healthy:
+                self._mark_success(endpoint)
+            else:
+                self._mark_failure(endpoint)
+
+    def _mark_success(self, endpoint):
+        endpoint.consecutive_failures = 0
+        endpoint.ejections_in_row = 0
+        endpoint.ejected_until = 0.0
+
+    def _mark_failure(self, endpoint):
+        endpoint.consecutive_failures += 1
+        now = time.time()
+        if endpoint.consecutive_failures >= self.eject_after and not endpoint.is_ejected(now):
+            endpoint.ejections_in_row += 1
+            endpoint.stats['ejections'] += 1
+            duration = min(self.max_eject_seconds, self.eject_seconds * (2 ** (endpoint.ejections_in_row - 1)))
+            endpoint.ejected_until = now + duration
+            # One more failure after the ejection ends re-ejects it straight away
+            endpoint.consecutive_failures = self.eject_after - 1
+            print(f"Ejected model endpoint {endpoint.name} for {duration:.0f}s")
+
+    def get_stats(self):
+        now = time.time()
+        with self._lock:
+            endpoints = [endpoint.get_stats(now) for endpoint in self.endpoints]
+        return {
+            'endpoints': endpoints,
+            'available': sum(1 for endpoint in endpoints if not endpoint['ejected']),
+            'eject_after': self.eject_after,
+            'eject_seconds': self.eject_seconds
+        }
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Sampling Profiler for AI4Bharat Dashboard
+Opt-in: while a traced request runs, a background thread samples its serving thread's
+stack every few milliseconds. Requests slower than the threshold have their samples
+written as collapsed stacks ("frame;frame;frame count"), the input flamegraph.pl and
+speedscope expect; faster requests are discarded.
+"""
+
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+
+# Trace ids can come from a client's X-Request-ID, so only these characters reach a filename
+UNSAFE_FILENAME_CHARS = re.compile(r'[^A-Za-z0-9_-]')
+
+
+def collapse_stack(frame):
+    """Root-first 'function (file:line)' frames joined with ';'"""
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(frames))
+
+
+class _Profile:
+    __slots__ = ('thread_id', 'samples')
+
+    def __init__(self, thread_id):
+        self.thread_id = thread_id
+        self.samples = Counter()
+
+
+class SamplingProfiler:
+    """Samples the threads of in-progress requests and keeps the stacks of slow ones"""
+
+    def __init__(self, interval_ms=5.0, slow_ms=1000.0, output_dir=None, max_files=100):
+        self.interval = max(0.001, interval_ms / 1000.0)
+        self.slow_ms = slow_ms
+        self.output_dir = output_dir or os.path.join(tempfile.gettempdir(), 'ai4bharat-profiles')
+        self.max_files = max_files
+
+        self._cond = threading.Condition()
+        self._active = set()
+        self._written = deque()
+        self._thread = None
+        self._pid = None
+        self.stats = {
+            'profiled_requests': 0,
+            'samples': 0,
+            'profiles_written': 0
+        }
+
+    def _ensure_started(self):
+        # Caller must hold self._cond; a forked worker needs its own sampler thread
+        if self._thread is None or self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+            self._thread.start()
+
+    def start(self, thread_id=None):
+        """Begin sampling a thread (the calling one by default); returns a handle for stop()"""
+        profile = _Profile(thread_id or threading.get_ident())
+        with self._cond:
+            self._ensure_started()
+            self._active.add(profile)
+            self.stats['profiled_requests'] += 1
+            self._cond.notify()
+        return profile
+
+    def stop(self, profile, trace):
+        """Stop sampling; writes the stacks and returns their path if the request was slow"""
+        with self._cond:
+            self._active.discard(profile)
+            samples = dict(profile.samples)
+        if trace.finish() < self.slow_ms or not samples:
+            return None
+        try:
+            return self._write(trace, samples)
+        except OSError as e:
+            print(f"Could not write profile for trace {trace.trace_id!r}: {e}")
+            return None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._active:
+                    self._cond.wait()
+                profiles = list(self._active)
+            frames = sys._current_frames()
+            with self._cond:
+                for profile in profiles:
+                    frame = frames.get(profile.thread_id)
+                    if frame is not None:
+                        profile.samples[collapse_stack(frame)] += 1
+                        self.stats['samples'] += 1
+            del frames
+            time.sleep(self.interval)
+
+    def _write(self, trace, samples):
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(trace.started_at))
+        name = UNSAFE_FILENAME_CHARS.sub('_', trace.trace_id)
+        path = os.path.join(self.output_dir, f'{stamp}-{name}.folded')
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(samples.items()):
+                f.write(f'{stack} {count}\n')
+
+        with self._cond:
+            self.stats['profiles_written'] += 1
+            self._written.append(path)
+            expired = []
+            while len(self._written) > self.max_files:
+                expired.append(self._written.popleft())
+        for old in expired:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+        return path
+
+    def get_stats(self):
+        with self._cond:
+            stats = dict(self.stats)
+            stats['active'] = len(self._active)
+        stats.update({
+            'interval_ms': self.interval * 1000.0,
+            'slow_ms': self.slow_ms,
+            'output_dir': self.output_dir
+        })
+        return stats
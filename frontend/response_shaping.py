@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Response Shaping for AI4Bharat Dashboard
+Compact translate payloads, Accept-Encoding negotiation and validators for static API data
+"""
+
+import gzip
+import hashlib
+import json
+import zlib
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip is always available
+    brotli = None
+
+# Dropped from translate results unless the caller asks for verbose output
+VERBOSE_FIELDS = (
+    'raw_response',
+    'segment_sources',
+    'upstream_response_time',
+    'note',
+    'matched_source',
+    'text_length',
+    'timestamp'
+)
+
+# Kept even when an explicit field list leaves them out
+ALWAYS_FIELDS = ('success', 'error')
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson')
+
+# Preferred first when the client weighs them equally
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def _as_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() not in ('0', 'false', 'no', 'off', '')
+
+
+def _as_fields(value):
+    if isinstance(value, str):
+        value = value.split(',')
+    fields = [str(field).strip() for field in value if str(field).strip()]
+    return fields or None
+
+
+def parse_shaping(*sources):
+    """
+    Read `fields` and `verbose` from request parameter mappings (query string,
+    JSON body, ...); later sources win. Returns (fields, verbose).
+    """
+    fields, verbose = None, True
+    for source in sources:
+        if not isinstance(source, dict) and not hasattr(source, 'get'):
+            continue
+        if source.get('verbose') is not None:
+            verbose = _as_bool(source.get('verbose'))
+        if source.get('fields') is not None:
+            fields = _as_fields(source.get('fields'))
+    return fields, verbose
+
+
+def shape_result(result, fields=None, verbose=True):
+    """Return the result reduced to `fields`, or without VERBOSE_FIELDS when not verbose"""
+    if fields:
+        wanted = set(fields).union(ALWAYS_FIELDS)
+        return {key: value for key, value in result.items() if key in wanted}
+    if not verbose:
+        return {key: value for key, value in result.items() if key not in VERBOSE_FIELDS}
+    return result
+
+
+def choose_encoding(accept_encoding):
+    """Pick the best supported content coding from an Accept-Encoding header, or None"""
+    if not accept_encoding:
+        return None
+
+    offered = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        offered[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = offered.get(encoding, offered.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body, encoding, level=6):
+    """Compress a complete response body"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=min(level, 11))
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class StreamCompressor:
+    """Incremental compressor that flushes after every chunk, so streamed lines arrive promptly"""
+
+    def __init__(self, encoding, level=6):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=min(level, 11))
+        else:
+            # wbits 31 = gzip container
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if self.encoding == 'br':
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def compress_stream(chunks, encoding, level=6):
+    """Wrap an iterable of str/bytes chunks in a compressed stream"""
+    compressor = StreamCompressor(encoding, level)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def etag_for(data):
+    """Stable validator for JSON-serialisable data"""
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()[:20]
+
+
+def etag_matches(if_none_match, etag):
+    """True when an If-None-Match header covers etag (weak comparison)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
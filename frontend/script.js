@@ -16,6 +16,10 @@ class AI4BharatDashboard {
         this.startTime = Date.now();
         this.requestCount = 0;
         this.lastMinuteRequests = [];
+        this.serverLatencies = [];
+        this.statusStream = null;
+        this.statusPollTimer = null;
+        this.streamRetryTimer = null;
         
         this.initializeEventListeners();
         this.initializeCharts();
@@ -72,17 +76,7 @@ class AI4BharatDashboard {
             // Check our Flask backend API status
             const response = await fetch('/api/status');
             if (response.ok) {
-                const data = await response.json();
-                this.apiEndpoint = data.endpoint;
-                this.isConnected = true;
-                this.updateConnectionStatus(true);
-                
-                // Update model status based on backend health
-                if (data.status === 'connected') {
-                    this.updateModelStatus('Connected to AI4Bharat Model');
-                } else {
-                    this.updateModelStatus('Using Mock Translation Service');
-                }
+                this.applyStatus(await response.json());
             } else {
                 this.isConnected = false;
                 this.updateConnectionStatus(false);
@@ -98,6 +92,80 @@ class AI4BharatDashboard {
         this.updateSystemStatus();
     }
 
+    applyStatus(data) {
+        this.apiEndpoint = data.endpoint;
+        this.isConnected = true;
+        this.updateConnectionStatus(true);
+        
+        // Update model status based on backend health
+        if (data.status === 'connected') {
+            this.updateModelStatus('Connected to AI4Bharat Model');
+        } else {
+            this.updateModelStatus('Using Mock Translation Service');
+        }
+    }
+
+    connectStatusStream() {
+        if (!window.EventSource) {
+            this.startStatusPolling();
+            return;
+        }
+
+        // One push connection per tab; the server builds each snapshot once for all viewers
+        this.statusStream = new EventSource('/api/stream');
+
+        this.statusStream.addEventListener('open', () => {
+            this.stopStatusPolling();
+        });
+
+        this.statusStream.addEventListener('status', (event) => {
+            const data = JSON.parse(event.data);
+            if (data.status) {
+                this.applyStatus(data.status);
+            }
+            this.addServerLatencySamples(data.samples || []);
+            this.updateSystemStatus();
+        });
+
+        this.statusStream.addEventListener('error', () => {
+            // Poll while the stream is down, then try to reconnect
+            this.statusStream.close();
+            this.statusStream = null;
+            this.startStatusPolling();
+            if (!this.streamRetryTimer) {
+                this.streamRetryTimer = setTimeout(() => {
+                    this.streamRetryTimer = null;
+                    this.connectStatusStream();
+                }, 30000);
+            }
+        });
+    }
+
+    startStatusPolling() {
+        if (!this.statusPollTimer) {
+            this.statusPollTimer = setInterval(() => {
+                this.checkConnection();
+            }, 5000);
+        }
+    }
+
+    stopStatusPolling() {
+        if (this.statusPollTimer) {
+            clearInterval(this.statusPollTimer);
+            this.statusPollTimer = null;
+        }
+    }
+
+    addServerLatencySamples(samples) {
+        if (samples.length === 0) {
+            return;
+        }
+        samples.forEach(sample => this.serverLatencies.push(Math.round(sample.latency_ms)));
+        // Keep only last 50 server-side samples
+        this.serverLatencies = this.serverLatencies.slice(-50);
+        this.updateCharts();
+    }
+
     async translateText() {
         const sourceText = document.getElementById('sourceText').value.trim();
         const sourceLanguage = document.getElementById('sourceLanguage').value;
@@ -135,11 +203,14 @@ class AI4BharatDashboard {
                 // Update confidence score
                 this.updateConfidenceScore(response.confidence);
                 
+                // With 'auto', record the language the server detected
+                const resolvedLanguage = response.detected_language || sourceLanguage;
+                
                 // Add to translation history
-                this.addToTranslationHistory(sourceText, response.translation, sourceLanguage, targetLanguage, responseTime);
+                this.addToTranslationHistory(sourceText, response.translation, resolvedLanguage, targetLanguage, responseTime);
                 
                 // Update metrics
-                this.updateMetrics(responseTime, true, sourceLanguage, targetLanguage);
+                this.updateMetrics(responseTime, true, resolvedLanguage, targetLanguage);
                 
                 // Show success animation
                 document.getElementById('targetText').classList.add('success-animation');
@@ -167,7 +238,9 @@ class AI4BharatDashboard {
         const payload = {
             text: text,
             source_language: sourceLang,
-            target_language: targetLang
+            target_language: targetLang,
+            // The dashboard never shows raw_response and the other verbose fields
+            verbose: false
         };
 
         try {
@@ -191,7 +264,8 @@ class AI4BharatDashboard {
                 translation: data.translation || 'Translation not available',
                 confidence: data.confidence || 0.85,
                 response_time: data.response_time || 0,
-                source: data.source || 'unknown'
+                source: data.source || 'unknown',
+                detected_language: data.detected_language
             };
         } catch (error) {
             return {
@@ -471,6 +545,13 @@ class AI4BharatDashboard {
                     backgroundColor: 'rgba(0, 123, 255, 0.1)',
                     tension: 0.4,
                     fill: true
+                }, {
+                    label: 'Server, all clients (ms)',
+                    data: [],
+                    borderColor: '#6c757d',
+                    backgroundColor: 'rgba(108, 117, 125, 0.1)',
+                    tension: 0.4,
+                    fill: false
                 }]
             },
             options: {
@@ -532,10 +613,12 @@ class AI4BharatDashboard {
 
     updateCharts() {
         // Update Response Time Chart
-        if (this.metrics.responseTimes.length > 0) {
-            const labels = this.metrics.responseTimes.map((_, index) => `#${index + 1}`);
+        const points = Math.max(this.metrics.responseTimes.length, this.serverLatencies.length);
+        if (points > 0) {
+            const labels = Array.from({ length: points }, (_, index) => `#${index + 1}`);
             this.charts.responseTime.data.labels = labels;
             this.charts.responseTime.data.datasets[0].data = this.metrics.responseTimes;
+            this.charts.responseTime.data.datasets[1].data = this.serverLatencies;
             this.charts.responseTime.update();
         }
 
@@ -552,7 +635,10 @@ class AI4BharatDashboard {
     }
 
     startMonitoring() {
-        // Update system status every second
+        // Status arrives over the push stream; polling only runs while it is down
+        this.connectStatusStream();
+
+        // Tick the local uptime clock every second (no server request)
         setInterval(() => {
             this.updateSystemStatus();
         }, 1000);
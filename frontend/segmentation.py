@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Sentence Segmentation for AI4Bharat Dashboard
+Script-aware splitting of long inputs into segments the model can translate independently
+"""
+
+import re
+
+from mock_translations import get_supported_languages
+
+# Sentence-ending punctuation per script, as named by get_supported_languages()
+SCRIPT_TERMINATORS = {
+    'Latin': '.?!',
+    'Devanagari': '।॥.?!',
+    'Bengali': '।॥.?!',
+    'Gurmukhi': '।॥.?!',
+    'Gujarati': '।॥.?!',
+    'Tamil': '.?!',
+    'Telugu': '.?!',
+    'Kannada': '.?!',
+    'Malayalam': '.?!'
+}
+
+# Quotes and brackets that may trail a terminator and still belong to the sentence
+CLOSERS = "\"'”’»)]"
+
+# Clause punctuation used to break a single overlong sentence
+CLAUSE_BREAKS = re.compile(r'[,;:،](?=\s)')
+
+# Titles never end a sentence; other abbreviations only when the next word is capitalised
+TITLE = re.compile(r'(?:^|\s)(?:Mr|Mrs|Ms|Dr|Prof|Sr|Jr|St|Shri|Smt)\.$')
+ABBREVIATION = re.compile(r'(?:^|\s|\.)(?:vs|etc|e\.g|i\.e|[A-Z])\.$')
+
+_patterns = {}
+
+
+def terminators_for(language):
+    """Terminator characters for a language code; 'auto' or unknown codes get all of them"""
+    info = get_supported_languages().get(language)
+    if info is None:
+        return ''.join(sorted(set(''.join(SCRIPT_TERMINATORS.values()))))
+    return SCRIPT_TERMINATORS.get(info['script'], SCRIPT_TERMINATORS['Latin'])
+
+
+def _boundary_pattern(language):
+    terminators = terminators_for(language)
+    pattern = _patterns.get(terminators)
+    if pattern is None:
+        pattern = re.compile(
+            r'[' + re.escape(terminators) + r']+[' + re.escape(CLOSERS) + r']*(\s+)|(\s*\n\s*)'
+        )
+        _patterns[terminators] = pattern
+    return pattern
+
+
+def split_sentences(text, language='auto'):
+    """
+    Split text into [(sentence, separator)] pairs, where separator is the
+    whitespace that followed the sentence, so ''.join(s + sep) == text.
+    """
+    pieces = []
+    position = 0
+    for match in _boundary_pattern(language).finditer(text):
+        if match.group(1) is not None:
+            end, separator_start = match.start(1), match.start(1)
+        else:
+            end, separator_start = match.start(2), match.start(2)
+        sentence = text[position:end]
+
+        # 'Dr. Rao' or 'U.S. policy' should not end a sentence
+        if match.group(1) is not None and sentence.endswith('.'):
+            if TITLE.search(sentence):
+                continue
+            following = text[match.end():match.end() + 1]
+            if ABBREVIATION.search(sentence) and following and not following.isupper():
+                continue
+
+        if sentence.strip():
+            pieces.append((sentence, text[separator_start:match.end()]))
+        elif pieces:
+            # Fold stray whitespace into the previous separator
+            last_sentence, last_separator = pieces[-1]
+            pieces[-1] = (last_sentence, last_separator + text[position:match.end()])
+        else:
+            # Leading whitespace stays with the first sentence
+            continue
+        position = match.end()
+
+    if position < len(text):
+        pieces.append((text[position:], ''))
+    return pieces
+
+
+def _split_long(sentence, max_length):
+    """Break one overlong sentence at clause punctuation, then whitespace, then hard cuts"""
+    parts = []
+    remaining = sentence
+    while len(remaining) > max_length:
+        # Every cut leaves a head of at most max_length characters
+        cut = -1
+        for match in CLAUSE_BREAKS.finditer(remaining[:max_length + 1]):
+            if match.end() <= max_length:
+                cut = match.end()
+        if cut <= 0:
+            cut = remaining[:max_length + 1].rfind(' ')
+        if cut <= 0:
+            cut = max_length
+        head, remaining = remaining[:cut], remaining[cut:]
+        stripped = remaining.lstrip()
+        parts.append((head.rstrip(), head[len(head.rstrip()):] + remaining[:len(remaining) - len(stripped)]))
+        remaining = stripped
+    if remaining:
+        parts.append((remaining, ''))
+    return parts
+
+
+def segment_text(text, language='auto', max_length=400):
+    """
+    Group sentences into segments of at most max_length characters.
+    Returns [(segment, separator)]; translating each segment and joining
+    translation + separator rebuilds the document in order.
+    """
+    segments = []
+    current = ''
+    current_separator = ''
+
+    for sentence, separator in split_sentences(text, language):
+        if len(sentence) > max_length:
+            if current:
+                segments.append((current, current_separator))
+                current, current_separator = '', ''
+            long_parts = _split_long(sentence, max_length)
+            long_parts[-1] = (long_parts[-1][0], long_parts[-1][1] + separator)
+            segments.extend(long_parts)
+            continue
+
+        # Paragraph breaks always end a segment so layout survives reassembly
+        if current and len(current) + len(current_separator) + len(sentence) <= max_length \
+                and '\n' not in current_separator:
+            current = current + current_separator + sentence
+            current_separator = separator
+        else:
+            if current:
+                segments.append((current, current_separator))
+            current, current_separator = sentence, separator
+
+    if current:
+        segments.append((current, current_separator))
+    return segments
+
+
+def merge_segment_results(results, separators, response_time):
+    """Reassemble per-segment translate results, in order, into one document result"""
+    translation = ''.join(
+        result.get('translation', '') + separator for result, separator in zip(results, separators)
+    )
+    # Weight confidence by how much of the output each segment produced
+    weights = [max(len(result.get('translation', '')), 1) for result in results]
+    confidence = sum(
+        weight * result.get('confidence', 0.0) for weight, result in zip(weights, results)
+    ) / sum(weights)
+
+    sources = {result.get('source', 'unknown') for result in results}
+    return {
+        'success': all(result.get('success') for result in results),
+        'translation': translation,
+        'confidence': confidence,
+        'response_time': response_time,
+        'source': sources.pop() if len(sources) == 1 else 'mixed',
+        'segments': len(results),
+        'segment_sources': [result.get('source', 'unknown') for result in results],
+        'cache_hits': sum(1 for result in results if result.get('cache_hit')),
+        'cache_hit': False
+    }
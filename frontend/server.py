@@ -7,11 +7,34 @@ Serves the web dashboard and handles API calls to the AI4Bharat model
 import os
 import json
 import time
+import threading
 import requests
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from flask import Flask, Response, g, render_template, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
-from mock_translations import get_mock_translation, get_supported_languages, get_sample_texts
+import metrics
+import tracing
+from mock_translations import fallback_engine, get_mock_translation, get_supported_languages, get_sample_texts
+from http_pool import PooledSession
+from model_pool import TRANSLATION_TASK, EndpointPool, NoEndpointError, parse_endpoints
+from hedging import HedgePolicy
+from profiler import SamplingProfiler
+from health_monitor import HealthMonitor
+from circuit_breaker import CircuitBreaker
+from coalescing import SingleFlight
+from status_stream import StatusBroadcaster
+from admission import AdmissionRejected, ConcurrencyLimiter, RateLimiter, client_identity, parse_weights
+from batching import MicroBatcher
+from translation_cache import create_cache_backend, make_cache_key
+from translation_memory import create_translation_memory
+from job_queue import JobNotFound, JobStore, JobWorkerPool, default_job_path
+from segmentation import merge_segment_results, segment_text
+from language_detection import detect_language
+from response_shaping import (
+    COMPRESSIBLE_TYPES, choose_encoding, compress, compress_stream, etag_for, parse_shaping, shape_result
+)
+from bulk_translate import BulkInputError, iter_json_items, iter_jsonl_items, iter_jobs, stream_translations
 
 app = Flask(__name__)
 CORS(app)
@@ -20,88 +43,492 @@ CORS(app)
 CONFIG = {
     'model_endpoint': os.getenv('AI4BHARAT_ENDPOINT', 'http://localhost:8080'),
     'model_name': 'ai4bharat-bert',
-    'debug': os.getenv('DEBUG', 'false').lower() == 'true'
+    'model_endpoints': os.getenv('MODEL_ENDPOINTS'),
+    'pool_eject_after': int(os.getenv('POOL_EJECT_AFTER', '3')),
+    'pool_eject_seconds': float(os.getenv('POOL_EJECT_SECONDS', '30')),
+    'hedge_enabled': os.getenv('HEDGE_ENABLED', 'false').lower() == 'true',
+    'hedge_percentile': float(os.getenv('HEDGE_PERCENTILE', '95')),
+    'hedge_max_rate': float(os.getenv('HEDGE_MAX_RATE', '0.05')),
+    'hedge_min_delay_ms': float(os.getenv('HEDGE_MIN_DELAY_MS', '5')),
+    'hedge_workers': int(os.getenv('HEDGE_WORKERS', '0')),
+    'debug': os.getenv('DEBUG', 'false').lower() == 'true',
+    'http_pool_connections': int(os.getenv('HTTP_POOL_CONNECTIONS', '10')),
+    'http_pool_maxsize': int(os.getenv('HTTP_POOL_MAXSIZE', '20')),
+    'http_pool_block': os.getenv('HTTP_POOL_BLOCK', 'false').lower() == 'true',
+    'health_retries': int(os.getenv('HEALTH_RETRIES', '2')),
+    'health_backoff': float(os.getenv('HEALTH_BACKOFF', '0.2')),
+    'health_interval': float(os.getenv('HEALTH_INTERVAL', '10')),
+    'health_max_interval': float(os.getenv('HEALTH_MAX_INTERVAL', '60')),
+    'breaker_enabled': os.getenv('BREAKER_ENABLED', 'true').lower() == 'true',
+    'breaker_failure_rate': float(os.getenv('BREAKER_FAILURE_RATE', '0.5')),
+    'breaker_minimum_calls': int(os.getenv('BREAKER_MINIMUM_CALLS', '5')),
+    'breaker_window_size': int(os.getenv('BREAKER_WINDOW_SIZE', '20')),
+    'breaker_cool_down': float(os.getenv('BREAKER_COOL_DOWN', '15')),
+    'breaker_half_open_probes': int(os.getenv('BREAKER_HALF_OPEN_PROBES', '1')),
+    'batch_enabled': os.getenv('BATCH_ENABLED', 'true').lower() == 'true',
+    'batch_max_size': int(os.getenv('BATCH_MAX_SIZE', '16')),
+    'batch_max_wait_ms': float(os.getenv('BATCH_MAX_WAIT_MS', '10')),
+    'batch_workers': int(os.getenv('BATCH_WORKERS', '0')),
+    'bulk_chunk_size': int(os.getenv('BULK_CHUNK_SIZE', '16')),
+    'bulk_workers': int(os.getenv('BULK_WORKERS', '16')),
+    'async_connection_limit': int(os.getenv('ASYNC_CONNECTION_LIMIT', '100')),
+    'coalesce_enabled': os.getenv('COALESCE_ENABLED', 'true').lower() == 'true',
+    'cache_enabled': os.getenv('CACHE_ENABLED', 'true').lower() == 'true',
+    'cache_backend': os.getenv('CACHE_BACKEND', 'memory'),
+    'cache_path': os.getenv('CACHE_PATH'),
+    'cache_max_entries': int(os.getenv('CACHE_MAX_ENTRIES', '10000')),
+    'cache_max_bytes': int(os.getenv('CACHE_MAX_BYTES', str(32 * 1024 * 1024))),
+    'cache_ttl_seconds': float(os.getenv('CACHE_TTL_SECONDS', '3600')),
+    'memory_enabled': os.getenv('MEMORY_ENABLED', 'true').lower() == 'true',
+    'memory_path': os.getenv('MEMORY_PATH'),
+    'memory_fuzzy': os.getenv('MEMORY_FUZZY', 'false').lower() == 'true',
+    'memory_fuzzy_threshold': float(os.getenv('MEMORY_FUZZY_THRESHOLD', '0.9')),
+    'memory_max_entries': int(os.getenv('MEMORY_MAX_ENTRIES', '100000')),
+    'segment_enabled': os.getenv('SEGMENT_ENABLED', 'true').lower() == 'true',
+    'segment_max_length': int(os.getenv('SEGMENT_MAX_LENGTH', '400')),
+    'segment_workers': int(os.getenv('SEGMENT_WORKERS', '16')),
+    'detect_language': os.getenv('DETECT_LANGUAGE', 'true').lower() == 'true',
+    'detect_min_confidence': float(os.getenv('DETECT_MIN_CONFIDENCE', '0.5')),
+    'compress_enabled': os.getenv('COMPRESS_ENABLED', 'true').lower() == 'true',
+    'compress_min_bytes': int(os.getenv('COMPRESS_MIN_BYTES', '1024')),
+    'compress_level': int(os.getenv('COMPRESS_LEVEL', '6')),
+    'static_max_age': int(os.getenv('STATIC_MAX_AGE', '3600')),
+    'stream_interval': float(os.getenv('STREAM_INTERVAL', '2')),
+    'stream_heartbeat': float(os.getenv('STREAM_HEARTBEAT', '15')),
+    'admission_enabled': os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true',
+    'admission_max_in_flight': int(os.getenv('ADMISSION_MAX_IN_FLIGHT', '32')),
+    'admission_max_queue': int(os.getenv('ADMISSION_MAX_QUEUE', '64')),
+    'admission_queue_timeout': float(os.getenv('ADMISSION_QUEUE_TIMEOUT', '2')),
+    'admission_bulk_queue_timeout': float(os.getenv('ADMISSION_BULK_QUEUE_TIMEOUT', '30')),
+    'admission_background_queue_timeout': float(os.getenv('ADMISSION_BACKGROUND_QUEUE_TIMEOUT', '60')),
+    'admission_weights': parse_weights(os.getenv('ADMISSION_WEIGHTS', 'interactive=8,bulk=2,background=1')),
+    'admission_interactive_reserve': int(os.getenv('ADMISSION_INTERACTIVE_RESERVE', '4')),
+    'jobs_enabled': os.getenv('JOBS_ENABLED', 'true').lower() == 'true',
+    'jobs_path': os.getenv('JOBS_PATH'),
+    'jobs_workers': int(os.getenv('JOBS_WORKERS', '4')),
+    'jobs_max_items': int(os.getenv('JOBS_MAX_ITEMS', '10000')),
+    'jobs_max_attempts': int(os.getenv('JOBS_MAX_ATTEMPTS', '3')),
+    'jobs_retry_backoff': float(os.getenv('JOBS_RETRY_BACKOFF', '2')),
+    'jobs_retention_hours': float(os.getenv('JOBS_RETENTION_HOURS', '24')),
+    'rate_limit_enabled': os.getenv('RATE_LIMIT_ENABLED', 'false').lower() == 'true',
+    'rate_limit_rps': float(os.getenv('RATE_LIMIT_RPS', '10')),
+    'rate_limit_burst': int(os.getenv('RATE_LIMIT_BURST', '20')),
+    'rate_limit_trust_forwarded': os.getenv('RATE_LIMIT_TRUST_FORWARDED', 'false').lower() == 'true',
+    'rate_limit_trusted_hops': int(os.getenv('RATE_LIMIT_TRUSTED_HOPS', '1')),
+    'trace_enabled': os.getenv('TRACE_ENABLED', 'true').lower() == 'true',
+    'trace_sample_rate': float(os.getenv('TRACE_SAMPLE_RATE', '0.01')),
+    'trace_slow_ms': float(os.getenv('TRACE_SLOW_MS', '1000')),
+    'profile_enabled': os.getenv('PROFILE_ENABLED', 'false').lower() == 'true',
+    'profile_interval_ms': float(os.getenv('PROFILE_INTERVAL_MS', '5')),
+    'profile_slow_ms': float(os.getenv('PROFILE_SLOW_MS', '1000')),
+    'profile_dir': os.getenv('PROFILE_DIR'),
+    'profile_max_files': int(os.getenv('PROFILE_MAX_FILES', '100'))
 }
 
+# Routes that get a per-request trace and a Server-Timing header
+TRACED_ROUTES = ('/api/translate',)
+
+class ModelResponseError(Exception):
+    """Raised when the model answers with a non-200 status"""
+    def __init__(self, status_code):
+        super().__init__(f"Model responded with status {status_code}")
+        self.status_code = status_code
+
+def limiter_options():
+    """ConcurrencyLimiter settings shared by the sync and async clients"""
+    return {
+        'max_in_flight': CONFIG['admission_max_in_flight'],
+        'max_queue': CONFIG['admission_max_queue'],
+        'queue_timeout': CONFIG['admission_queue_timeout'],
+        'queue_timeouts': {
+            'bulk': CONFIG['admission_bulk_queue_timeout'],
+            'background': CONFIG['admission_background_queue_timeout']
+        },
+        'weights': CONFIG['admission_weights'],
+        'interactive_reserve': CONFIG['admission_interactive_reserve'],
+        'on_queue': lambda priority, delta: metrics.scheduler_queue_depth.inc(delta, priority=priority),
+        'on_admit': lambda priority, waited: metrics.scheduler_wait.observe(waited, priority=priority)
+    }
+
 class AI4BharatClient:
     def __init__(self, endpoint):
         self.endpoint = endpoint
         self.model_name = CONFIG['model_name']
-        self.health_check_interval = 30  # seconds
-        self.last_health_check = 0
-        self.is_healthy = False
+        # Every predictor we may route to; the first entry doubles as the default
+        self.pool = EndpointPool(
+            parse_endpoints(CONFIG['model_endpoints'], endpoint, self.model_name),
+            eject_after=CONFIG['pool_eject_after'],
+            eject_seconds=CONFIG['pool_eject_seconds']
+        )
+        # Slow predict calls get a duplicate on another replica, within a small budget
+        self.hedger = None
+        self.hedge_executor = None
+        if CONFIG['hedge_enabled']:
+            self.hedger = HedgePolicy(
+                percentile=CONFIG['hedge_percentile'],
+                max_hedge_rate=CONFIG['hedge_max_rate'],
+                min_delay_ms=CONFIG['hedge_min_delay_ms']
+            )
+            # Every concurrent sender may hold a primary and a hedge at once; a smaller pool
+            # queues primaries, and a queued primary would look slow and trigger needless hedges
+            senders = (CONFIG['batch_enabled'] and CONFIG['batch_workers']) or CONFIG['admission_max_in_flight']
+            self.hedge_executor = ThreadPoolExecutor(
+                max_workers=max(CONFIG['hedge_workers'], 2 * senders), thread_name_prefix='hedge')
+        # One pooled session shared by every Flask worker thread
+        self.http = PooledSession(
+            pool_connections=CONFIG['http_pool_connections'],
+            pool_maxsize=CONFIG['http_pool_maxsize'],
+            pool_block=CONFIG['http_pool_block'],
+            max_retries=CONFIG['health_retries'],
+            backoff_factor=CONFIG['health_backoff']
+        )
+        # Health is probed in the background; status endpoints read the cached state
+        self.health_monitor = HealthMonitor(
+            self.probe_health,
+            interval=CONFIG['health_interval'],
+            max_interval=CONFIG['health_max_interval'],
+            debug=CONFIG['debug']
+        )
+        # While the model is failing, skip straight to the fallback instead of waiting on timeouts
+        self.breaker = None
+        if CONFIG['breaker_enabled']:
+            self.breaker = CircuitBreaker(
+                failure_rate_threshold=CONFIG['breaker_failure_rate'],
+                minimum_calls=CONFIG['breaker_minimum_calls'],
+                window_size=CONFIG['breaker_window_size'],
+                cool_down=CONFIG['breaker_cool_down'],
+                half_open_probes=CONFIG['breaker_half_open_probes']
+            )
+        # Concurrent requests for the same language pair share one predict call
+        self.batcher = None
+        if CONFIG['batch_enabled']:
+            self.batcher = MicroBatcher(
+                self.predict,
+                max_batch_size=CONFIG['batch_max_size'],
+                max_wait_ms=CONFIG['batch_max_wait_ms'],
+                # One sender per model slot by default, so admitted calls never queue again here
+                max_workers=CONFIG['batch_workers'] or CONFIG['admission_max_in_flight'],
+                reserved_workers=CONFIG['admission_interactive_reserve'] if CONFIG['admission_enabled'] else 0
+            )
+        # Identical requests already in flight share one upstream call
+        self.single_flight = SingleFlight() if CONFIG['coalesce_enabled'] else None
+        # Repeated requests are answered without touching the model
+        self.cache = None
+        if CONFIG['cache_enabled']:
+            self.cache = create_cache_backend(
+                CONFIG['cache_backend'],
+                path=CONFIG['cache_path'],
+                max_entries=CONFIG['cache_max_entries'],
+                max_bytes=CONFIG['cache_max_bytes'],
+                ttl_seconds=CONFIG['cache_ttl_seconds']
+            )
+        # Known sentences (and close variants) are answered from the durable translation memory
+        self.memory = None
+        if CONFIG['memory_enabled']:
+            self.memory = create_translation_memory(
+                CONFIG['memory_path'],
+                fuzzy_enabled=CONFIG['memory_fuzzy'],
+                fuzzy_threshold=CONFIG['memory_fuzzy_threshold'],
+                max_entries=CONFIG['memory_max_entries']
+            )
+        # Translations waiting on the model are capped and scheduled by priority class;
+        # beyond the queue, callers get a fast 503
+        self.limiter = None
+        if CONFIG['admission_enabled']:
+            self.limiter = ConcurrencyLimiter(**limiter_options())
+        # Long documents are split into sentences translated side by side
+        self.segment_executor = None
+        if CONFIG['segment_enabled']:
+            self.segment_executor = ThreadPoolExecutor(
+                max_workers=CONFIG['segment_workers'], thread_name_prefix='segment')
         
-    def get_model_url(self, path=''):
-        """Get the full model URL"""
-        return f"{self.endpoint}/v1/models/{self.model_name}{path}"
+    def get_model_url(self, path='', endpoint=None):
+        """Get the full model URL, for the default endpoint unless one is given"""
+        return (endpoint or self.pool.primary).model_url(path)
+    
+    @property
+    def is_healthy(self):
+        return self.health_monitor.is_healthy
+    
+    @property
+    def last_health_check(self):
+        return self.health_monitor.last_check
+    
+    def probe_health(self):
+        """Probe every model endpoint once; healthy when any of them answers"""
+        any_healthy = False
+        for endpoint in self.pool.endpoints:
+            try:
+                response = self.http.get(
+                    self.get_model_url(endpoint=endpoint),
+                    timeout=5
+                )
+                healthy = response.status_code == 200
+            except requests.exceptions.RequestException:
+                if len(self.pool.endpoints) == 1:
+                    self.pool.record_probe(endpoint, False)
+                    raise
+                healthy = False
+            self.pool.record_probe(endpoint, healthy)
+            any_healthy = any_healthy or healthy
+        return any_healthy
     
     def check_health(self, force=False):
-        """Check if the model is healthy"""
-        current_time = time.time()
+        """Check if the model is healthy, probing synchronously only when forced"""
+        if force:
+            return self.health_monitor.probe_once()
         
-        if not force and (current_time - self.last_health_check) < self.health_check_interval:
-            return self.is_healthy
-            
-        try:
-            response = requests.get(
-                self.get_model_url(),
-                timeout=5
-            )
-            self.is_healthy = response.status_code == 200
-            self.last_health_check = current_time
-            return self.is_healthy
-        except Exception as e:
-            if CONFIG['debug']:
-                print(f"Health check failed: {e}")
-            self.is_healthy = False
-            self.last_health_check = current_time
-            return False
+        self.health_monitor.ensure_started()
+        return self.is_healthy
+    
+    def build_predict_payload(self, instances, source_lang='auto', target_lang='en'):
+        """Build a KServe V1 predict request body"""
+        payload = {
+            'instances': list(instances)
+        }
+        
+        # Add language information if available
+        if source_lang != 'auto':
+            payload['source_language'] = source_lang
+        if target_lang:
+            payload['target_language'] = target_lang
+        
+        return payload
+    
+    def record_upstream_status(self, status_code):
+        """Feed an upstream response status into the circuit breaker"""
+        if self.breaker is None:
+            return
+        # Only server-side errors count against the model; a 4xx means it is up
+        if status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+    
+    def predict(self, instances, source_lang='auto', target_lang='en'):
+        """Send one KServe V1 predict call (hedged when enabled) and return (data, response_time_ms)"""
+        payload = self.build_predict_payload(instances, source_lang, target_lang)
+        if self.hedger is None:
+            data, response_time = self.send_predict(payload, source_lang, target_lang)
+        else:
+            data, response_time = self.hedged_predict(payload, source_lang, target_lang)
+        tracing.add_span('upstream', response_time)
+        return data, response_time
+    
+    def hedged_predict(self, payload, source_lang='auto', target_lang='en'):
+        """Race a duplicate call against one that outlives the hedge delay; first success wins"""
+        delay = self.hedger.hedge_delay()
+        if delay is None:
+            return self.send_predict(payload, source_lang, target_lang)
+        
+        used = []
+        started = threading.Event()
+        
+        def send_primary():
+            started.set()
+            return self.send_predict(payload, source_lang, target_lang, used)
+        
+        primary = self.hedge_executor.submit(tracing.bind(send_primary))
+        # The hedge delay counts from when the primary is actually sent, not from when it queued
+        started.wait()
+        start_time = time.time()
+        done, _ = wait([primary], timeout=delay)
+        if done or not self.hedger.try_hedge():
+            return primary.result()
+        
+        metrics.hedges_issued.inc()
+        hedge = self.hedge_executor.submit(
+            tracing.bind(self.send_predict), payload, source_lang, target_lang, None, used)
+        error = None
+        # The slower call is left to finish in the background so pool accounting stays exact
+        for future in as_completed([primary, hedge]):
+            try:
+                data, _ = future.result()
+            except Exception as e:
+                error = e
+                continue
+            if future is hedge:
+                self.hedger.record_win()
+                metrics.hedges_won.inc()
+            return data, (time.time() - start_time) * 1000
+        raise error
+    
+    def send_predict(self, payload, source_lang='auto', target_lang='en', used=None, avoid=()):
+        """One predict call through the endpoint pool; endpoints tried are appended to `used`"""
+        tried = []
+        while True:
+            endpoint = self.pool.acquire(TRANSLATION_TASK, source_lang, target_lang, exclude=tried, avoid=avoid)
+            if used is not None:
+                used.append(endpoint)
+            start_time = time.time()
+            try:
+                response = self.http.post(
+                    self.get_model_url('/predict', endpoint),
+                    json=payload,
+                    headers={'Content-Type': 'application/json'},
+                    timeout=30
+                )
+                break
+            except requests.exceptions.RequestException as e:
+                self.pool.release(endpoint, (time.time() - start_time) * 1000, ok=False)
+                tried.append(endpoint)
+                # A refused connection never reached the model, so another replica can take it
+                if isinstance(e, requests.exceptions.ConnectionError) and \
+                        self.pool.has_candidate(TRANSLATION_TASK, source_lang, target_lang, exclude=tried):
+                    continue
+                if self.breaker is not None:
+                    self.breaker.record_failure()
+                raise
+        
+        response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+        
+        self.pool.release(endpoint, response_time, ok=response.status_code < 500)
+        self.record_upstream_status(response.status_code)
+        
+        if response.status_code != 200:
+            raise ModelResponseError(response.status_code)
+        
+        if self.hedger is not None:
+            self.hedger.observe(response_time)
+        return response.json(), response_time
+    
+    def cache_key(self, text, source_lang, target_lang):
+        return make_cache_key(text, source_lang, target_lang, self.model_name)
+    
+    def get_cached(self, key):
+        """Return a cached result marked as a hit, or None"""
+        start_time = time.time()
+        cached = self.cache.get(key)
+        if cached is not None:
+            cached['upstream_response_time'] = cached['response_time']
+            cached['response_time'] = (time.time() - start_time) * 1000
+            cached['cache_hit'] = True
+        return cached
+    
+    def store_cached(self, key, result):
+        """Cache a fresh result and mark it as a miss"""
+        # Mock fallbacks are never cached so real answers replace them once the model is back
+        if result.get('success') and result.get('source') == 'ai4bharat_model':
+            self.cache.set(key, result)
+        result['cache_hit'] = False
+        return result
+    
+    def remember(self, text, source_lang, target_lang, result):
+        """Add a fresh model translation to the translation memory"""
+        if self.memory is not None and result.get('success') and result.get('source') == 'ai4bharat_model':
+            self.memory.record(source_lang, target_lang, text, result['translation'],
+                               result.get('confidence', 0.9), self.model_name)
+    
+    def resolve_source_language(self, text, source_lang):
+        """Replace 'auto' with a locally detected language; returns (source_lang, detected)"""
+        if source_lang != 'auto' or not CONFIG['detect_language']:
+            return source_lang, None
+        
+        language, confidence = detect_language(text)
+        if language is None or confidence < CONFIG['detect_min_confidence']:
+            return source_lang, None
+        return language, {'language': language, 'confidence': confidence}
     
-    def translate(self, text, source_lang='auto', target_lang='en'):
+    def translate(self, text, source_lang='auto', target_lang='en', priority='interactive'):
+        """
+        Translate text, detecting 'auto' sources and splitting long documents.
+        priority picks the scheduling class: 'interactive', 'bulk' or 'background'.
+        """
+        with tracing.span('detect'):
+            source_lang, detected = self.resolve_source_language(text, source_lang)
+        
+        result = None
+        if self.segment_executor is not None and len(text) > CONFIG['segment_max_length']:
+            segments = segment_text(text, source_lang, CONFIG['segment_max_length'])
+            if len(segments) > 1:
+                result = self.translate_segments(segments, source_lang, target_lang, priority)
+        if result is None:
+            result = self.translate_cached(text, source_lang, target_lang, priority)
+        
+        if detected is not None:
+            result['detected_language'] = detected['language']
+            result['detection_confidence'] = detected['confidence']
+        return result
+    
+    def translate_cached(self, text, source_lang='auto', target_lang='en', priority='interactive'):
+        """Translate one piece of text, serving repeated requests from the cache"""
+        key = self.cache_key(text, source_lang, target_lang)
+        if self.cache is not None:
+            with tracing.span('cache'):
+                cached = self.get_cached(key)
+            if cached is not None:
+                return cached
+        
+        if self.single_flight is None:
+            return self.translate_uncached(key, text, source_lang, target_lang, priority)
+        
+        # Callers only share a leader of their own class, so an interactive request never
+        # waits behind (or inherits the admission error of) a bulk or background one
+        result, coalesced = self.single_flight.do(
+            (key, priority), lambda: self.translate_uncached(key, text, source_lang, target_lang, priority))
+        if coalesced:
+            result['coalesced'] = True
+            metrics.coalesced_requests.inc()
+        return result
+    
+    def translate_segments(self, segments, source_lang='auto', target_lang='en', priority='interactive'):
+        """Translate segments concurrently so the batcher groups them, then rejoin in order"""
+        start_time = time.time()
+        futures = [
+            self.segment_executor.submit(tracing.bind(self.translate), segment, source_lang, target_lang, priority)
+            for segment, _ in segments
+        ]
+        results = [future.result() for future in futures]
+        response_time = (time.time() - start_time) * 1000
+        return merge_segment_results(results, [separator for _, separator in segments], response_time)
+    
+    def translate_uncached(self, key, text, source_lang='auto', target_lang='en', priority='interactive'):
+        """Answer from translation memory or call the model (or fallback), and cache the result"""
+        result = None
+        if self.memory is not None:
+            with tracing.span('memory'):
+                result = self.memory.lookup(text, source_lang, target_lang)
+        if result is None:
+            if self.limiter is None:
+                result = self.translate_with_model(text, source_lang, target_lang, priority)
+            else:
+                queued = time.perf_counter()
+                with self.limiter.slot(priority):
+                    tracing.add_span('queue', (time.perf_counter() - queued) * 1000)
+                    result = self.translate_with_model(text, source_lang, target_lang, priority)
+            self.remember(text, source_lang, target_lang, result)
+        if self.cache is None:
+            return result
+        return self.store_cached(key, result)
+    
+    def translate_with_model(self, text, source_lang='auto', target_lang='en', priority='interactive'):
         """Translate text using the AI4Bharat model"""
+        if self.breaker is not None and not self.breaker.allow_request():
+            result = get_mock_translation(text, source_lang, target_lang)
+            result['circuit_open'] = True
+            return result
+        
         # First try to connect to the real model
         try:
-            payload = {
-                'instances': [text]
-            }
-            
-            # Add language information if available
-            if source_lang != 'auto':
-                payload['source_language'] = source_lang
-            if target_lang:
-                payload['target_language'] = target_lang
-            
-            start_time = time.time()
-            
-            response = requests.post(
-                self.get_model_url('/predict'),
-                json=payload,
-                headers={'Content-Type': 'application/json'},
-                timeout=30
-            )
-            
-            response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Extract translation from response
-                translation = self.extract_translation(data)
-                confidence = self.extract_confidence(data)
-                
-                return {
-                    'success': True,
-                    'translation': translation,
-                    'confidence': confidence,
-                    'response_time': response_time,
-                    'raw_response': data,
-                    'source': 'ai4bharat_model'
-                }
+            if self.batcher is not None:
+                submitted = time.perf_counter()
+                data, response_time, batch_size = self.batcher.submit(text, source_lang, target_lang, priority)
+                # Time spent waiting for the batch to fill and be picked up by a sender
+                tracing.add_span('batch', max(0.0, (time.perf_counter() - submitted) * 1000 - response_time))
             else:
-                # If model responds but with error, fall back to mock
-                print(f"Model responded with error: {response.status_code}")
-                return get_mock_translation(text, source_lang, target_lang)
+                data, response_time = self.predict([text], source_lang, target_lang)
+                batch_size = 1
+            
+            with tracing.span('extract'):
+                return self.build_model_result(data, response_time, batch_size)
                 
+        except ModelResponseError as e:
+            # If model responds but with error, fall back to mock
+            print(f"Model responded with error: {e.status_code}")
+            return get_mock_translation(text, source_lang, target_lang)
+        except NoEndpointError as e:
+            print(f"{e} - using mock translation")
+            return get_mock_translation(text, source_lang, target_lang)
         except requests.exceptions.Timeout:
             print("Model request timeout - using mock translation")
             return get_mock_translation(text, source_lang, target_lang)
@@ -112,6 +539,22 @@ class AI4BharatClient:
             print(f"Unexpected error connecting to model: {e}")
             return get_mock_translation(text, source_lang, target_lang)
     
+    def build_model_result(self, data, response_time, batch_size=1):
+        """Turn a (single-prediction) model response into a translate result"""
+        # Extract translation from response
+        translation = self.extract_translation(data)
+        confidence = self.extract_confidence(data)
+        
+        return {
+            'success': True,
+            'translation': translation,
+            'confidence': confidence,
+            'response_time': response_time,
+            'batch_size': batch_size,
+            'raw_response': data,
+            'source': 'ai4bharat_model'
+        }
+    
     def extract_translation(self, data):
         """Extract translation from model response"""
         try:
@@ -169,6 +612,295 @@ class AI4BharatClient:
 # Initialize the AI4Bharat client
 client = AI4BharatClient(CONFIG['model_endpoint'])
 
+# Shared workers for bulk requests, sized so one chunk can fill a model batch
+bulk_executor = ThreadPoolExecutor(max_workers=CONFIG['bulk_workers'], thread_name_prefix='bulk')
+
+def translate_job_item(text, source_lang, target_lang):
+    """Translate one queued job item; the raw model response is not worth keeping on disk"""
+    result = client.translate(text, source_lang, target_lang, priority='background')
+    result.pop('raw_response', None)
+    return add_translation_metadata(result, text, source_lang, target_lang)
+
+# Large jobs are queued on disk and drained in the background
+job_store = None
+job_workers = None
+if CONFIG['jobs_enabled']:
+    job_store = JobStore(
+        CONFIG['jobs_path'] or default_job_path(),
+        max_attempts=CONFIG['jobs_max_attempts'],
+        retry_backoff=CONFIG['jobs_retry_backoff']
+    )
+    job_workers = JobWorkerPool(
+        job_store,
+        translate_job_item,
+        workers=CONFIG['jobs_workers'],
+        retention_seconds=CONFIG['jobs_retention_hours'] * 3600
+    )
+
+def get_status_payload():
+    """Current model status, answered from the background health monitor"""
+    if job_workers is not None:
+        # Resume queued jobs left over from before a restart
+        job_workers.ensure_started()
+    is_healthy = client.check_health()
+    health = client.health_monitor.get_state()
+    
+    return {
+        'endpoint': CONFIG['model_endpoint'],
+        'model_name': CONFIG['model_name'],
+        'healthy': is_healthy,
+        'last_check': datetime.fromtimestamp(health['last_check']).isoformat(),
+        'last_latency_ms': health['last_latency_ms'],
+        'consecutive_failures': health['consecutive_failures'],
+        'seconds_since_change': health['seconds_since_change'],
+        'timestamp': datetime.now().isoformat(),
+        'status': 'connected' if is_healthy else 'fallback_to_mock'
+    }
+
+def get_health_payload():
+    """Short health summary for load balancers and probes"""
+    is_healthy = client.check_health()
+    health = client.health_monitor.get_state()
+    
+    return {
+        'healthy': is_healthy,
+        'last_latency_ms': health['last_latency_ms'],
+        'consecutive_failures': health['consecutive_failures'],
+        'seconds_since_change': health['seconds_since_change'],
+        'timestamp': datetime.now().isoformat(),
+        'endpoint': CONFIG['model_endpoint'],
+        'status': 'connected' if is_healthy else 'fallback_to_mock'
+    }
+
+def get_metrics_payload():
+    """Server-side metrics for the client and everything in front of the model"""
+    return {
+        'endpoint': CONFIG['model_endpoint'],
+        'model_name': CONFIG['model_name'],
+        'healthy': client.is_healthy,
+        'last_health_check': datetime.fromtimestamp(client.last_health_check).isoformat(),
+        'timestamp': datetime.now().isoformat(),
+        'status': 'connected' if client.is_healthy else 'fallback_to_mock',
+        'health': client.health_monitor.get_state(),
+        'connection_pool': client.http.pool_stats(),
+        'model_pool': client.pool.get_stats(),
+        'hedging': client.hedger.get_stats() if client.hedger else {'enabled': False},
+        'batching': client.batcher.get_stats() if client.batcher else {'enabled': False},
+        'cache': client.cache.get_stats() if client.cache else {'enabled': False},
+        'translation_memory': client.memory.get_stats() if client.memory else {'enabled': False},
+        'coalescing': client.single_flight.get_stats() if client.single_flight else {'enabled': False},
+        'circuit_breaker': client.breaker.get_stats() if client.breaker else {'enabled': False},
+        'fallback': fallback_engine.get_stats(),
+        'admission': client.limiter.get_stats() if client.limiter else {'enabled': False},
+        'rate_limit': rate_limiter.get_stats() if rate_limiter else {'enabled': False},
+        'jobs': job_workers.get_stats() if job_workers else {'enabled': False},
+        'status_stream': status_broadcaster.get_stats(),
+        'tracing': get_tracing_stats(),
+        'translate': metrics.get_summary()
+    }
+
+def get_stream_payload():
+    """Compact snapshot pushed to dashboards over /api/stream"""
+    summary = metrics.get_summary()
+    return {
+        'status': get_status_payload(),
+        'translate': {
+            'in_flight': summary['in_flight'],
+            'requests': sum(summary['requests'].values()),
+            'errors': sum(summary['errors'].values()),
+            'fallbacks': sum(summary['fallbacks'].values()),
+            'latency_seconds': summary['latency_seconds']
+        },
+        'cache_hit_rate': client.cache.get_stats()['hit_rate'] if client.cache else None,
+        'circuit_breaker': client.breaker.get_stats()['state'] if client.breaker else None,
+        'subscribers': status_broadcaster.subscribers
+    }
+
+# Per-client token buckets for the translate endpoints
+rate_limiter = None
+if CONFIG['rate_limit_enabled']:
+    rate_limiter = RateLimiter(rate=CONFIG['rate_limit_rps'], burst=CONFIG['rate_limit_burst'])
+
+def enforce_rate_limit():
+    """Charge the calling client one token; raises AdmissionRejected when it is over its rate"""
+    if rate_limiter is None:
+        return
+    rate_limiter.enforce(client_identity(
+        api_key=request.headers.get('X-API-Key'),
+        remote_addr=request.remote_addr,
+        forwarded_for=request.headers.get('X-Forwarded-For'),
+        trust_forwarded=CONFIG['rate_limit_trust_forwarded'],
+        trusted_hops=CONFIG['rate_limit_trusted_hops']
+    ))
+
+def rejection_response(error):
+    """429/503 answer with a Retry-After hint"""
+    metrics.admission_rejections.inc(reason=error.reason)
+    response = jsonify({
+        'success': False,
+        'error': str(error),
+        'reason': error.reason,
+        'retry_after': error.retry_after,
+        'timestamp': datetime.now().isoformat()
+    })
+    response.status_code = error.status_code
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+# Sampled trace logs for the traced routes, plus stack profiles of slow requests when enabled
+trace_logger = tracing.TraceLogger(sample_rate=CONFIG['trace_sample_rate'], slow_ms=CONFIG['trace_slow_ms'])
+profiler = None
+if CONFIG['profile_enabled']:
+    profiler = SamplingProfiler(
+        interval_ms=CONFIG['profile_interval_ms'],
+        slow_ms=CONFIG['profile_slow_ms'],
+        output_dir=CONFIG['profile_dir'],
+        max_files=CONFIG['profile_max_files']
+    )
+
+def finish_trace(trace, profile=None):
+    """Keep the profile of a slow request and log the trace if it is sampled"""
+    if profile is not None:
+        path = profiler.stop(profile, trace)
+        if path is not None:
+            trace.attributes['profile'] = path
+    trace_logger.record(trace)
+
+def get_tracing_stats():
+    stats = trace_logger.get_stats()
+    stats['enabled'] = CONFIG['trace_enabled']
+    stats['profiler'] = profiler.get_stats() if profiler else {'enabled': False}
+    return stats
+
+# One producer feeds every connected dashboard
+status_broadcaster = StatusBroadcaster(
+    get_stream_payload,
+    interval=CONFIG['stream_interval'],
+    heartbeat=CONFIG['stream_heartbeat']
+)
+
+def add_translation_metadata(result, text, source_lang, target_lang):
+    """Stamp request metadata onto a translate result"""
+    result['timestamp'] = datetime.now().isoformat()
+    result['source_language'] = source_lang
+    result['target_language'] = target_lang
+    result['text_length'] = len(text)
+    return result
+
+def job_results_payload(job, items, offset, fields, verbose):
+    """One page of job results; next_offset is None once the page reaches the end"""
+    for item in items:
+        if 'result' in item:
+            item['result'] = shape_result(item['result'], fields, verbose)
+    next_offset = offset + len(items)
+    return {
+        'success': True,
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'offset': offset,
+        'items': items,
+        'next_offset': next_offset if next_offset < job['total'] else None
+    }
+
+def job_urls(job_id):
+    return {
+        'status_url': f'/api/jobs/{job_id}',
+        'results_url': f'/api/jobs/{job_id}/results'
+    }
+
+def memory_search_payload(matches, source_lang, target_lang):
+    return {
+        'success': True,
+        'source_language': source_lang,
+        'target_language': target_lang,
+        'matches': [{
+            'source': entry.source,
+            'translation': entry.translation,
+            'score': round(score, 4),
+            'confidence': entry.confidence,
+            'origin': entry.origin
+        } for entry, score in matches]
+    }
+
+def cacheable_json(payload, validator):
+    """JSON response browsers may cache and revalidate; validator excludes volatile fields"""
+    response = jsonify(payload)
+    response.set_etag(etag_for(validator))
+    response.cache_control.public = True
+    response.cache_control.max_age = CONFIG['static_max_age']
+    return response.make_conditional(request)
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.time()
+
+@app.before_request
+def start_trace():
+    if not CONFIG['trace_enabled'] or request.url_rule is None or request.url_rule.rule not in TRACED_ROUTES:
+        return
+    g.trace, g.trace_token = tracing.begin(request.url_rule.rule, request.headers.get('X-Request-ID'))
+    if profiler is not None:
+        g.profile = profiler.start()
+
+# Registered before the other after_request hooks so it runs last and times compression too
+@app.after_request
+def add_server_timing(response):
+    trace = g.get('trace')
+    if trace is not None:
+        trace.attributes['status'] = response.status_code
+        response.headers['Server-Timing'] = trace.server_timing()
+    return response
+
+@app.teardown_request
+def end_trace(error=None):
+    trace = g.pop('trace', None)
+    if trace is None:
+        return
+    try:
+        finish_trace(trace, g.pop('profile', None))
+    finally:
+        tracing.end(g.pop('trace_token'))
+
+@app.after_request
+def record_request_metrics(response):
+    """Count every request by route so /metrics covers the whole API"""
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    if route == '/<path:filename>':
+        route = 'static'
+    duration = time.time() - g.get('request_start', time.time())
+    metrics.observe_http_request(route, request.method, response.status_code, duration)
+    return response
+
+@app.after_request
+def compress_response(response):
+    """gzip/brotli-encode JSON and NDJSON bodies when the client accepts it"""
+    if not CONFIG['compress_enabled'] or response.mimetype not in COMPRESSIBLE_TYPES:
+        return response
+    if response.status_code == 304 or 'Content-Encoding' in response.headers:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+    if encoding is None:
+        return response
+    
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding, CONFIG['compress_level'])
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < CONFIG['compress_min_bytes']:
+            return response
+        with tracing.span('compress'):
+            response.set_data(compress(body, encoding, CONFIG['compress_level']))
+    
+    response.headers['Content-Encoding'] = encoding
+    # The compressed bytes differ from the identity representation the ETag was computed on
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
 @app.route('/')
 def index():
     """Serve the main dashboard page"""
@@ -182,96 +914,291 @@ def static_files(filename):
 @app.route('/api/status')
 def api_status():
     """Get the current status of the AI4Bharat service"""
-    is_healthy = client.check_health(force=True)
-    
-    return jsonify({
-        'endpoint': CONFIG['model_endpoint'],
-        'model_name': CONFIG['model_name'],
-        'healthy': is_healthy,
-        'last_check': datetime.fromtimestamp(client.last_health_check).isoformat(),
-        'timestamp': datetime.now().isoformat(),
-        'status': 'connected' if is_healthy else 'fallback_to_mock'
-    })
+    return jsonify(get_status_payload())
 
 @app.route('/api/translate', methods=['POST'])
 def api_translate():
     """Translate text using the AI4Bharat model"""
+    start_time = time.time()
+    source_lang, target_lang = 'auto', 'en'
+    
+    with metrics.translate_in_flight.track():
+        try:
+            enforce_rate_limit()
+            with tracing.span('parse'):
+                data = request.get_json()
+                
+                if not data:
+                    metrics.observe_translate_error(source_lang, target_lang, 400)
+                    return jsonify({'success': False, 'error': 'No data provided'}), 400
+                
+                text = data.get('text', '').strip()
+                source_lang = data.get('source_language', 'auto')
+                target_lang = data.get('target_language', 'en')
+                fields, verbose = parse_shaping(request.args, data)
+            
+            if not text:
+                metrics.observe_translate_error(source_lang, target_lang, 400)
+                return jsonify({'success': False, 'error': 'No text provided'}), 400
+            
+            # Perform translation
+            result = client.translate(text, source_lang, target_lang)
+            
+            # Add metadata
+            add_translation_metadata(result, text, source_lang, target_lang)
+            
+            with tracing.span('serialize'):
+                response = jsonify(shape_result(result, fields, verbose))
+            duration = time.time() - start_time
+            metrics.observe_translation(
+                source_lang, target_lang, result,
+                duration,
+                len(text.encode('utf-8')),
+                response.content_length or 0
+            )
+            status_broadcaster.record_sample(
+                duration * 1000, metrics.language_pair(source_lang, target_lang), result.get('source'))
+            return response
+            
+        except AdmissionRejected as e:
+            metrics.observe_translate_error(source_lang, target_lang, e.status_code)
+            return rejection_response(e)
+        except Exception as e:
+            if CONFIG['debug']:
+                print(f"Translation API error: {e}")
+            
+            metrics.observe_translate_error(source_lang, target_lang, 500)
+            return jsonify({
+                'success': False,
+                'error': f'Internal server error: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }), 500
+
+@app.route('/api/translate/batch', methods=['POST'])
+def api_translate_batch():
+    """Translate a JSON array or JSONL upload, streaming NDJSON results per chunk"""
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'success': False, 'error': 'No data provided'}), 400
-        
-        text = data.get('text', '').strip()
-        source_lang = data.get('source_language', 'auto')
-        target_lang = data.get('target_language', 'en')
-        
-        if not text:
-            return jsonify({'success': False, 'error': 'No text provided'}), 400
-        
-        # Perform translation
-        result = client.translate(text, source_lang, target_lang)
-        
-        # Add metadata
-        result['timestamp'] = datetime.now().isoformat()
-        result['source_language'] = source_lang
-        result['target_language'] = target_lang
-        result['text_length'] = len(text)
-        
-        return jsonify(result)
-        
-    except Exception as e:
-        if CONFIG['debug']:
-            print(f"Translation API error: {e}")
-        
+        enforce_rate_limit()
+    except AdmissionRejected as e:
+        return rejection_response(e)
+    
+    defaults = {
+        'source_language': request.values.get('source_language', 'auto'),
+        'target_language': request.values.get('target_language', 'en')
+    }
+    text_field = request.values.get('field', 'text')
+    id_field = request.values.get('id_field', 'id')
+    fields, verbose = parse_shaping(request.values)
+    
+    try:
+        chunk_size = max(1, min(int(request.values.get('chunk_size', CONFIG['bulk_chunk_size'])), 256))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'chunk_size must be an integer'}), 400
+    
+    upload = request.files.get('file')
+    if upload is not None:
+        raw_items = iter_jsonl_items(upload.stream)
+    else:
+        data = request.get_json(silent=True)
+        if data is None:
+            return jsonify({'success': False, 'error': 'Provide a JSON array body or a JSONL file upload'}), 400
+        if isinstance(data, dict):
+            defaults['source_language'] = data.get('source_language', defaults['source_language'])
+            defaults['target_language'] = data.get('target_language', defaults['target_language'])
+            fields, verbose = parse_shaping(request.values, data)
+        try:
+            raw_items = iter_json_items(data)
+            # Surface a malformed body before the stream starts
+            raw_items = list(raw_items)
+        except BulkInputError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+    
+    jobs = iter_jobs(raw_items, defaults, text_field, id_field)
+    
+    def translate_fn(text, source_lang, target_lang):
+        return shape_result(client.translate(text, source_lang, target_lang, priority='bulk'), fields, verbose)
+    
+    lines = stream_translations(jobs, translate_fn, bulk_executor, chunk_size=chunk_size)
+    
+    return Response(
+        stream_with_context(lines),
+        mimetype='application/x-ndjson',
+        headers={'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/jobs', methods=['POST'])
+def api_submit_job():
+    """Queue a JSON array or JSONL upload for background translation; answers 202 with the job id"""
+    if job_store is None:
+        return jsonify({'success': False, 'error': 'Translation jobs are disabled'}), 404
+    try:
+        enforce_rate_limit()
+    except AdmissionRejected as e:
+        return rejection_response(e)
+    
+    defaults = {
+        'source_language': request.values.get('source_language', 'auto'),
+        'target_language': request.values.get('target_language', 'en')
+    }
+    text_field = request.values.get('field', 'text')
+    id_field = request.values.get('id_field', 'id')
+    
+    upload = request.files.get('file')
+    try:
+        if upload is not None:
+            raw_items = iter_jsonl_items(upload.stream)
+        else:
+            data = request.get_json(silent=True)
+            if data is None:
+                return jsonify({'success': False, 'error': 'Provide a JSON array body or a JSONL file upload'}), 400
+            if isinstance(data, dict):
+                defaults['source_language'] = data.get('source_language', defaults['source_language'])
+                defaults['target_language'] = data.get('target_language', defaults['target_language'])
+            raw_items = iter_json_items(data)
+        jobs = list(iter_jobs(raw_items, defaults, text_field, id_field))
+    except BulkInputError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    if not jobs:
+        return jsonify({'success': False, 'error': 'No items provided'}), 400
+    if len(jobs) > CONFIG['jobs_max_items']:
         return jsonify({
             'success': False,
-            'error': f'Internal server error: {str(e)}',
-            'timestamp': datetime.now().isoformat()
-        }), 500
+            'error': f"Jobs are limited to {CONFIG['jobs_max_items']} items"
+        }), 413
+    
+    job_id = job_store.submit(jobs, options=defaults)
+    job_workers.ensure_started()
+    job_workers.notify()
+    
+    response = jsonify(dict(job_store.get_job(job_id), success=True, **job_urls(job_id)))
+    response.status_code = 202
+    response.headers['Location'] = job_urls(job_id)['status_url']
+    return response
+
+@app.route('/api/jobs/<job_id>', methods=['GET', 'DELETE'])
+def api_job(job_id):
+    """Progress and throughput of a job; DELETE cancels it"""
+    if job_store is None:
+        return jsonify({'success': False, 'error': 'Translation jobs are disabled'}), 404
+    job_workers.ensure_started()
+    try:
+        job = job_store.cancel(job_id) if request.method == 'DELETE' else job_store.get_job(job_id)
+    except JobNotFound:
+        return jsonify({'success': False, 'error': 'Unknown job'}), 404
+    return jsonify(dict(job, success=True, **job_urls(job_id)))
+
+@app.route('/api/jobs/<job_id>/results')
+def api_job_results(job_id):
+    """Page through a job's results in submission order (?offset=&limit=)"""
+    if job_store is None:
+        return jsonify({'success': False, 'error': 'Translation jobs are disabled'}), 404
+    try:
+        offset = max(0, int(request.args.get('offset', 0)))
+        limit = max(1, min(int(request.args.get('limit', 100)), 1000))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'offset and limit must be integers'}), 400
+    fields, verbose = parse_shaping(request.args)
+    
+    try:
+        job = job_store.get_job(job_id)
+        items = job_store.get_results(job_id, offset, limit)
+    except JobNotFound:
+        return jsonify({'success': False, 'error': 'Unknown job'}), 404
+    return jsonify(job_results_payload(job, items, offset, fields, verbose))
+
+@app.route('/api/memory/search')
+def api_memory_search():
+    """Closest translation memory entries for a text"""
+    if client.memory is None:
+        return jsonify({'success': False, 'error': 'Translation memory is disabled'}), 404
+    
+    text = request.args.get('text', '').strip()
+    source_lang = request.args.get('source_language', '')
+    target_lang = request.args.get('target_language', 'en')
+    if not text or not source_lang:
+        return jsonify({'success': False, 'error': 'text and source_language are required'}), 400
+    try:
+        limit = max(1, min(int(request.args.get('limit', 5)), 50))
+        threshold = float(request.args.get('threshold', client.memory.fuzzy_threshold))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'limit and threshold must be numbers'}), 400
+    
+    matches = client.memory.search(text, source_lang, target_lang, limit=limit, threshold=threshold)
+    return jsonify(memory_search_payload(matches, source_lang, target_lang))
+
+@app.route('/api/memory/export')
+def api_memory_export():
+    """Download the translation memory as JSONL"""
+    if client.memory is None:
+        return jsonify({'success': False, 'error': 'Translation memory is disabled'}), 404
+    
+    return Response(
+        stream_with_context(client.memory.export(request.args.get('language_pair'))),
+        mimetype='application/x-ndjson',
+        headers={'Content-Disposition': 'attachment; filename=translation-memory.jsonl'}
+    )
+
+@app.route('/api/memory/import', methods=['POST'])
+def api_memory_import():
+    """Add JSONL records (body or 'file' upload) to the translation memory"""
+    if client.memory is None:
+        return jsonify({'success': False, 'error': 'Translation memory is disabled'}), 404
+    
+    upload = request.files.get('file')
+    stream = upload.stream if upload is not None else request.stream
+    imported, errors = client.memory.import_records(iter_jsonl_items(stream))
+    return jsonify({
+        'success': not errors,
+        'imported': imported,
+        'errors': errors[:100],
+        'error_count': len(errors)
+    }), 200 if imported or not errors else 400
 
 @app.route('/api/health')
 def api_health():
     """Health check endpoint"""
-    is_healthy = client.check_health(force=True)
-    
-    return jsonify({
-        'healthy': is_healthy,
-        'timestamp': datetime.now().isoformat(),
-        'endpoint': CONFIG['model_endpoint'],
-        'status': 'connected' if is_healthy else 'fallback_to_mock'
-    })
+    return jsonify(get_health_payload())
 
 @app.route('/api/languages')
 def api_languages():
     """Get supported languages"""
     languages = get_supported_languages()
     
-    return jsonify({
+    return cacheable_json({
         'languages': languages,
         'count': len(languages),
         'timestamp': datetime.now().isoformat()
-    })
+    }, languages)
+
+@app.route('/api/stream')
+def api_stream():
+    """Server-Sent Events feed of status, metrics and recent translate latencies"""
+    return Response(
+        stream_with_context(status_broadcaster.subscribe()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 @app.route('/api/metrics')
 def api_metrics():
     """Get current metrics"""
-    return jsonify({
-        'endpoint': CONFIG['model_endpoint'],
-        'model_name': CONFIG['model_name'],
-        'healthy': client.is_healthy,
-        'last_health_check': datetime.fromtimestamp(client.last_health_check).isoformat(),
-        'timestamp': datetime.now().isoformat(),
-        'status': 'connected' if client.is_healthy else 'fallback_to_mock'
-    })
+    return jsonify(get_metrics_payload())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus text exposition of the server-side metrics"""
+    return Response(metrics.registry.expose(), content_type=metrics.EXPOSITION_CONTENT_TYPE)
 
 @app.route('/api/samples')
 def api_samples():
     """Get sample texts for testing"""
-    return jsonify({
-        'samples': get_sample_texts(),
+    samples = get_sample_texts()
+    
+    return cacheable_json({
+        'samples': samples,
         'timestamp': datetime.now().isoformat()
-    })
+    }, samples)
 
 if __name__ == '__main__':
     print("🚀 Starting AI4Bharat Frontend Server")
@@ -280,8 +1207,11 @@ if __name__ == '__main__':
     print(f"🌐 Server will be available at: http://localhost:5000")
     print("=" * 50)
     
-    # Check initial health
+    # Check initial health, then keep probing in the background
     client.check_health(force=True)
+    client.health_monitor.ensure_started()
+    if job_workers is not None:
+        job_workers.ensure_started()
     
     app.run(
         host='0.0.0.0',
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Status Stream for AI4Bharat Dashboard
+One producer thread builds a status snapshot on a fixed interval and every connected
+dashboard receives it as a Server-Sent Event, so N viewers cost one snapshot, not N polls
+"""
+
+import asyncio
+import collections
+import json
+import os
+import threading
+import time
+
+
+def format_event(data, event=None, event_id=None):
+    """Encode one Server-Sent Event frame"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event is not None:
+        lines.append(f'event: {event}')
+    for line in json.dumps(data, ensure_ascii=False).splitlines() or ['']:
+        lines.append(f'data: {line}')
+    return '\n'.join(lines) + '\n\n'
+
+
+class StatusBroadcaster:
+    """Publishes snapshot_fn() to all subscribers; the producer idles while nobody listens"""
+
+    def __init__(self, snapshot_fn, interval=2.0, max_samples=200, heartbeat=15.0, retry_ms=3000):
+        # snapshot_fn() -> JSON-serialisable dict
+        self.snapshot_fn = snapshot_fn
+        self.interval = interval
+        self.heartbeat = heartbeat
+        self.retry_ms = retry_ms
+
+        self._condition = threading.Condition()
+        self._samples = collections.deque(maxlen=max_samples)
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._async_waiters = set()
+
+        self.sequence = 0
+        self.latest = None
+        self.subscribers = 0
+        self.stats = {
+            'events': 0,
+            'connections': 0,
+            'snapshot_errors': 0
+        }
+
+    def ensure_started(self):
+        """Start the producer once per process (forked workers get their own)"""
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='status-stream', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+
+    def record_sample(self, latency_ms, language_pair, source):
+        """Queue one translate latency sample for the next event"""
+        self._samples.append({
+            'latency_ms': round(latency_ms, 1),
+            'language_pair': language_pair,
+            'source': source,
+            'timestamp': time.time()
+        })
+
+    def _drain_samples(self):
+        samples = []
+        while True:
+            try:
+                samples.append(self._samples.popleft())
+            except IndexError:
+                return samples
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._condition:
+                while self.subscribers == 0 and not self._stop.is_set():
+                    self._condition.wait()
+            if self._stop.is_set():
+                return
+            self.publish()
+            self._stop.wait(self.interval)
+
+    def publish(self):
+        """Build one snapshot and wake every subscriber"""
+        try:
+            data = self.snapshot_fn()
+        except Exception as e:
+            self.stats['snapshot_errors'] += 1
+            data = {'error': str(e)}
+        data['samples'] = self._drain_samples()
+
+        with self._condition:
+            self.sequence += 1
+            self.latest = (self.sequence, data)
+            self.stats['events'] += 1
+            self._condition.notify_all()
+            waiters = list(self._async_waiters)
+
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def _connect(self):
+        with self._condition:
+            self.subscribers += 1
+            self.stats['connections'] += 1
+            self._condition.notify_all()
+        self.ensure_started()
+
+    def _disconnect(self):
+        with self._condition:
+            self.subscribers -= 1
+
+    def subscribe(self):
+        """Blocking generator of SSE frames for one client (threaded servers)"""
+        self._connect()
+        try:
+            last_sent = 0
+            yield f'retry: {self.retry_ms}\n\n'
+            while not self._stop.is_set():
+                with self._condition:
+                    self._condition.wait_for(
+                        lambda: self.sequence > last_sent or self._stop.is_set(), self.heartbeat)
+                    latest = self.latest
+                if latest is None or latest[0] <= last_sent:
+                    # Comment frame keeps proxies from closing an idle connection
+                    yield ': keep-alive\n\n'
+                    continue
+                last_sent, data = latest
+                yield format_event(data, event='status', event_id=last_sent)
+        finally:
+            self._disconnect()
+
+    async def asubscribe(self):
+        """Async generator of SSE frames for one client (asyncio server)"""
+        loop = asyncio.get_running_loop()
+        waiter = (loop, asyncio.Event())
+        with self._condition:
+            self._async_waiters.add(waiter)
+        self._connect()
+        try:
+            last_sent = 0
+            yield f'retry: {self.retry_ms}\n\n'
+            while not self._stop.is_set():
+                # Clear before reading so a publish in between is not missed
+                waiter[1].clear()
+                latest = self.latest
+                if latest is not None and latest[0] > last_sent:
+                    last_sent, data = latest
+                    yield format_event(data, event='status', event_id=last_sent)
+                    continue
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+        finally:
+            with self._condition:
+                self._async_waiters.discard(waiter)
+            self._disconnect()
+
+    def get_stats(self):
+        with self._condition:
+            stats = dict(self.stats)
+            stats['subscribers'] = self.subscribers
+            stats['sequence'] = self.sequence
+        stats['interval'] = self.interval
+        stats['running'] = self._thread is not None and self._thread.is_alive()
+        return stats
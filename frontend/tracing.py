@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Request Tracing for AI4Bharat Dashboard
+Times the stages of a request (parse, cache, queue, connection, upstream, extraction,
+serialization) into one trace per request, reported as a Server-Timing header and as
+sampled JSON log lines. Work done on other threads is attributed with attach().
+"""
+
+import contextvars
+import functools
+import json
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+_current = contextvars.ContextVar('ai4bharat_trace', default=None)
+
+
+class Trace:
+    """Span durations for one request, summed per stage name in first-seen order"""
+
+    def __init__(self, name, trace_id=None):
+        self.name = name
+        self.trace_id = (trace_id or uuid.uuid4().hex[:16])[:64]
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.duration_ms = None
+        self.attributes = {}
+        self._lock = threading.Lock()
+        self._spans = {}  # name -> [total ms, count]
+
+    def add(self, name, duration_ms):
+        with self._lock:
+            span = self._spans.get(name)
+            if span is None:
+                self._spans[name] = [duration_ms, 1]
+            else:
+                span[0] += duration_ms
+                span[1] += 1
+
+    def finish(self):
+        if self.duration_ms is None:
+            self.duration_ms = (time.perf_counter() - self.started) * 1000
+        return self.duration_ms
+
+    def spans(self):
+        with self._lock:
+            return {name: (total, count) for name, (total, count) in self._spans.items()}
+
+    def server_timing(self):
+        """Server-Timing header value; repeated stages (segments, hedges) carry their count"""
+        parts = []
+        for name, (total, count) in self.spans().items():
+            part = f'{name};dur={total:.2f}'
+            if count > 1:
+                part += f';desc="x{count}"'
+            parts.append(part)
+        parts.append(f'total;dur={self.finish():.2f}')
+        return ', '.join(parts)
+
+    def to_record(self):
+        return {
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'start': self.started_at,
+            'duration_ms': round(self.finish(), 3),
+            'spans': {name: {'ms': round(total, 3), 'count': count} for name, (total, count) in self.spans().items()},
+            'attributes': self.attributes
+        }
+
+
+class _Fanout:
+    """Stands in for the current trace when one piece of work serves several requests"""
+
+    def __init__(self, traces):
+        self.traces = traces
+
+    def add(self, name, duration_ms):
+        for trace in self.traces:
+            trace.add(name, duration_ms)
+
+
+def current():
+    return _current.get()
+
+
+def begin(name, trace_id=None):
+    """Start a trace for the running request; returns (trace, token) for end()"""
+    trace = Trace(name, trace_id)
+    return trace, _current.set(trace)
+
+
+def end(token):
+    _current.reset(token)
+
+
+def add_span(name, duration_ms):
+    """Record a stage measured elsewhere; a no-op outside a traced request"""
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, duration_ms)
+
+
+@contextmanager
+def span(name):
+    """Time the enclosed block as one stage of the current trace"""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, (time.perf_counter() - start_time) * 1000)
+
+
+@contextmanager
+def attach(traces):
+    """Attribute spans recorded in the block to every trace in `traces` (e.g. one batch)"""
+    # Segments of one request can share a batch; count the shared work once per trace
+    traces = list({id(trace): trace for trace in traces if trace is not None}.values())
+    if not traces:
+        yield
+        return
+    token = _current.set(traces[0] if len(traces) == 1 else _Fanout(traces))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def bind(fn):
+    """Wrap fn so it runs in the caller's context, for work handed to an executor thread"""
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+class TraceLogger:
+    """Writes a sample of finished traces, plus every slow one, as JSON lines"""
+
+    def __init__(self, sample_rate=0.01, slow_ms=1000.0, write=print):
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.write = write
+        self._lock = threading.Lock()
+        self.stats = {
+            'traces': 0,
+            'logged': 0
+        }
+
+    def record(self, trace):
+        slow = self.slow_ms is not None and trace.finish() >= self.slow_ms
+        logged = slow or random.random() < self.sample_rate
+        with self._lock:
+            self.stats['traces'] += 1
+            self.stats['logged'] += logged
+        if not logged:
+            return False
+        record = trace.to_record()
+        record['slow'] = slow
+        self.write(json.dumps({'trace': record}, ensure_ascii=False))
+        return True
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats.update({
+            'sample_rate': self.sample_rate,
+            'slow_ms': self.slow_ms
+        })
+        return stats
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Translation Cache for AI4Bharat Dashboard
+LRU + TTL caches in front of the model, keyed by normalized request.
+Backends: in-process memory, or a sqlite file shared by every worker on the host.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+def normalize_text(text):
+    """NFC-normalize and collapse whitespace so equivalent inputs share a key"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def make_cache_key(text, source_lang, target_lang, model_name):
+    """Build the cache key for one translation request"""
+    return (normalize_text(text), source_lang or 'auto', target_lang or '', model_name)
+
+
+def estimate_size(key, value):
+    """Approximate memory footprint of an entry in bytes"""
+    key_size = sum(len(str(part).encode('utf-8')) for part in key)
+    value_size = len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+    return key_size + value_size
+
+
+class CacheBackend(ABC):
+    """Interface every translation cache backend implements"""
+
+    name = 'base'
+
+    @abstractmethod
+    def get(self, key):
+        """Return a copy of the cached value, or None on miss/expiry"""
+
+    @abstractmethod
+    def set(self, key, value):
+        """Store a value, returning False if it was rejected"""
+
+    @abstractmethod
+    def clear(self):
+        """Drop every entry"""
+
+    @abstractmethod
+    def get_stats(self):
+        """Counters and sizes for /api/metrics"""
+
+    def close(self):
+        """Release any connections or files the backend holds"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Thread-safe in-process LRU cache with per-entry TTL and a total byte budget"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=10000, max_bytes=32 * 1024 * 1024, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'rejected': 0
+        }
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+
+            expires_at, size, value = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return dict(value)
+
+    def set(self, key, value):
+        size = estimate_size(key, value)
+        if size > self.max_bytes:
+            with self._lock:
+                self.stats['rejected'] += 1
+            return False
+
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (expires_at, size, dict(value))
+            self.current_bytes += size
+            self.stats['stores'] += 1
+
+            while self._entries and (len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats['evictions'] += 1
+        return True
+
+    def _remove(self, key):
+        # Caller must hold self._lock
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self.current_bytes
+
+        return _finish_stats(self, stats)
+
+
+class SqliteCacheBackend(CacheBackend):
+    """
+    On-disk cache in a sqlite file, safe to share between processes on one host.
+    Eviction is approximate LRU: access times are refreshed at most once per
+    touch_interval and the budget is enforced every evict_every writes.
+    A failing database (locked, full disk, corrupt file) degrades to cache misses
+    and skipped stores instead of failing the translation.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path, max_entries=10000, max_bytes=32 * 1024 * 1024, ttl_seconds=3600,
+                 touch_interval=1.0, evict_every=32):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.touch_interval = touch_interval
+        self.evict_every = max(1, evict_every)
+
+        self._conn = None
+        self._pid = None
+        self._db_lock = threading.Lock()  # guards self._conn; queries are sub-millisecond
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'rejected': 0,
+            'errors': 0
+        }
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._db_lock:
+            conn = self._connection()
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS translations ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, '
+                'expires_at REAL NOT NULL, last_access REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS translations_last_access ON translations (last_access)')
+
+    def _connection(self):
+        # Caller must hold self._db_lock. One connection per process, shared by every
+        # thread; a forked worker opens its own rather than reusing the parent's
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _failed(self, action, error):
+        self._count('errors')
+        print(f"Translation cache {action} failed ({self.path}): {error}")
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    @staticmethod
+    def _encode_key(key):
+        return json.dumps(list(key), ensure_ascii=False)
+
+    def get(self, key):
+        now = time.time()
+        encoded = self._encode_key(key)
+        try:
+            with self._db_lock:
+                conn = self._connection()
+                row = conn.execute(
+                    'SELECT value, expires_at, last_access FROM translations WHERE key = ?', (encoded,)
+                ).fetchone()
+                if row is not None:
+                    value, expires_at, last_access = row
+                    if expires_at <= now:
+                        conn.execute('DELETE FROM translations WHERE key = ?', (encoded,))
+                    elif now - last_access >= self.touch_interval:
+                        conn.execute('UPDATE translations SET last_access = ? WHERE key = ?', (now, encoded))
+        except sqlite3.Error as e:
+            self._failed('read', e)
+            self._count('misses')
+            return None
+
+        if row is None:
+            self._count('misses')
+            return None
+        if expires_at <= now:
+            self._count('expirations')
+            self._count('misses')
+            return None
+
+        self._count('hits')
+        return json.loads(value)
+
+    def set(self, key, value):
+        size = estimate_size(key, value)
+        if size > self.max_bytes:
+            self._count('rejected')
+            return False
+
+        now = time.time()
+        row = (self._encode_key(key), json.dumps(value, ensure_ascii=False, default=str),
+               size, now + self.ttl_seconds, now)
+        try:
+            with self._db_lock:
+                self._connection().execute(
+                    'INSERT OR REPLACE INTO translations (key, value, size, expires_at, last_access) '
+                    'VALUES (?, ?, ?, ?, ?)', row
+                )
+        except sqlite3.Error as e:
+            self._failed('store', e)
+            return False
+        self._count('stores')
+
+        with self._lock:
+            self._writes += 1
+            should_evict = self._writes % self.evict_every == 0
+        if should_evict:
+            try:
+                self.evict()
+            except sqlite3.Error as e:
+                self._failed('eviction', e)
+        return True
+
+    def evict(self):
+        """Drop expired rows, then least recently used rows until within budget"""
+        with self._db_lock:
+            evicted = self._evict(self._connection())
+        self._count('evictions', evicted)
+
+    def _evict(self, conn):
+        # Caller must hold self._db_lock
+        now = time.time()
+        expired = conn.execute('DELETE FROM translations WHERE expires_at <= ?', (now,)).rowcount
+        self._count('expirations', max(expired, 0))
+
+        count, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM translations').fetchone()
+        evicted = 0
+        while count > self.max_entries or total > self.max_bytes:
+            batch = max(1, count - self.max_entries, count // 10)
+            rows = conn.execute(
+                'SELECT key, size FROM translations ORDER BY last_access LIMIT ?', (batch,)
+            ).fetchall()
+            if not rows:
+                break
+            conn.executemany('DELETE FROM translations WHERE key = ?', [(row[0],) for row in rows])
+            count -= len(rows)
+            total -= sum(row[1] for row in rows)
+            evicted += len(rows)
+        return evicted
+
+    def clear(self):
+        with self._db_lock:
+            self._connection().execute('DELETE FROM translations')
+
+    def close(self):
+        with self._db_lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def get_stats(self):
+        try:
+            with self._db_lock:
+                count, total = self._connection().execute(
+                    'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM translations'
+                ).fetchone()
+        except sqlite3.Error as e:
+            self._failed('stats query', e)
+            count, total = None, None
+        with self._lock:
+            stats = dict(self.stats)
+        stats['entries'] = count
+        stats['bytes'] = total
+        stats['path'] = self.path
+        return _finish_stats(self, stats)
+
+
+def _finish_stats(backend, stats):
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = (stats['hits'] / lookups) if lookups else 0.0
+    stats['backend'] = backend.name
+    stats['max_entries'] = backend.max_entries
+    stats['max_bytes'] = backend.max_bytes
+    stats['ttl_seconds'] = backend.ttl_seconds
+    return stats
+
+
+CACHE_BACKENDS = {
+    'memory': MemoryCacheBackend,
+    'sqlite': SqliteCacheBackend
+}
+
+
+def default_cache_path():
+    return os.path.join(tempfile.gettempdir(), 'ai4bharat-translation-cache.sqlite3')
+
+
+def create_cache_backend(kind='memory', path=None, **options):
+    """Build a cache backend by name ('memory' or 'sqlite')"""
+    if kind not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown cache backend '{kind}', expected one of {sorted(CACHE_BACKENDS)}")
+    if kind == 'sqlite':
+        return SqliteCacheBackend(path or default_cache_path(), **options)
+    return MemoryCacheBackend(**options)
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Translation Memory for AI4Bharat Dashboard
+Durable store of known translations, consulted before the model. Exact matches are a
+dict hit on the normalized source; near matches come from a character-trigram index
+verified by edit distance. The store is an append-only JSONL journal shared by workers,
+rewritten (compacted) once it holds far more lines than live entries.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import Counter
+
+from mock_translations import SAMPLE_TRANSLATIONS, normalize_phrase
+
+GRAM_SIZE = 3
+# Bounds on the work one fuzzy search may do, whatever the size of the memory: postings read
+# by the prefix filter, candidates carried into the full count, and the posting size above
+# which a gram is too common to be worth checking
+PREFIX_BUDGET = 20000
+MAX_SCAN = 1000
+COMMON_GRAM_LIMIT = 2000
+DIGITS = re.compile(r'\d+')
+
+
+def fuzzy_form(text):
+    """Casefolded text without punctuation, the form near matches are compared on"""
+    text = unicodedata.normalize('NFC', text).casefold()
+    text = ''.join(' ' if unicodedata.category(char).startswith('P') else char for char in text)
+    return ' '.join(text.split())
+
+
+def char_grams(form):
+    padded = f' {form} '
+    return {padded[i:i + GRAM_SIZE] for i in range(max(1, len(padded) - GRAM_SIZE + 1))}
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance, or limit + 1 as soon as it is known to exceed limit"""
+    too_far = limit + 1
+    if abs(len(a) - len(b)) > limit:
+        return too_far
+    # Only cells within `limit` of the diagonal can stay under the limit
+    previous = [j if j <= limit else too_far for j in range(len(b) + 1)]
+    for i, char_a in enumerate(a, 1):
+        current = [too_far] * (len(b) + 1)
+        current[0] = i if i <= limit else too_far
+        best = current[0]
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != b[j - 1]))
+            current[j] = value
+            if value < best:
+                best = value
+        if best > limit:
+            return too_far
+        previous = current
+    return min(previous[-1], too_far)
+
+
+class MemoryEntry:
+    __slots__ = ('source', 'translation', 'confidence', 'origin', 'model', 'updated', 'form', 'digits')
+
+    def __init__(self, source, translation, confidence, origin, model=None, updated=None):
+        self.source = source
+        self.translation = translation
+        self.confidence = confidence
+        self.origin = origin
+        self.model = model
+        self.updated = time.time() if updated is None else updated
+        self.form = fuzzy_form(source)
+        # Near matches must carry the same numbers, or "pay 500" would answer "pay 600"
+        self.digits = DIGITS.findall(self.form)
+
+    def to_record(self, source_lang, target_lang):
+        return {
+            'source_language': source_lang,
+            'target_language': target_lang,
+            'source': self.source,
+            'translation': self.translation,
+            'confidence': self.confidence,
+            'origin': self.origin,
+            'model': self.model,
+            'updated': self.updated
+        }
+
+
+class TranslationMemory:
+    """
+    Exact and fuzzy lookup over every translation we have seen, per language pair.
+    Entries written by one worker reach the others when they next re-read the journal.
+    """
+
+    def __init__(self, path=None, seed=None, fuzzy_enabled=False, fuzzy_threshold=0.9,
+                 max_candidates=20, refresh_interval=1.0, max_entries=100000):
+        self.path = path
+        # Near matches are always offered by search(); lookup() only serves them when enabled,
+        # since a small edit ("can" vs "can't") can flip the meaning of the stored translation
+        self.fuzzy_enabled = fuzzy_enabled
+        self.fuzzy_threshold = fuzzy_threshold
+        self.max_candidates = max_candidates
+        self.refresh_interval = refresh_interval
+        self.max_entries = max(1, max_entries)
+
+        self._lock = threading.RLock()
+        self._pairs = {}  # "src-tgt" -> {normalized source: MemoryEntry}
+        self._grams = {}  # "src-tgt" -> {trigram: set of normalized sources}
+        self._size = 0
+        self._offset = 0
+        self._inode = None
+        self._journal_lines = 0
+        self._last_refresh = 0.0
+        self.stats = {
+            'exact_hits': 0,
+            'fuzzy_hits': 0,
+            'misses': 0,
+            'stored': 0,
+            'imported': 0,
+            'evicted': 0,
+            'compactions': 0,
+            'journal_errors': 0
+        }
+
+        if seed:
+            for lang_pair, phrases in seed.items():
+                source_lang, target_lang = lang_pair.split('-', 1)
+                for source_text, translation in phrases.items():
+                    # Timestamp 0 so any journal record (e.g. a user correction) wins over a seed
+                    self._index(source_lang, target_lang,
+                                MemoryEntry(source_text, translation, 0.95, 'seed', updated=0))
+        if self.path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            except OSError as e:
+                self._journal_failed('setup', e)
+            self.refresh(force=True)
+
+    def _journal_failed(self, action, error):
+        # The journal is an optimisation; losing a write must never fail the translation
+        with self._lock:
+            self.stats['journal_errors'] += 1
+        print(f"Translation memory journal {action} failed ({self.path}): {error}")
+
+    def _index(self, source_lang, target_lang, entry):
+        lang_pair = f"{source_lang}-{target_lang}"
+        key = normalize_phrase(entry.source)
+        with self._lock:
+            entries = self._pairs.setdefault(lang_pair, {})
+            previous = entries.get(key)
+            if previous is not None and previous.updated > entry.updated:
+                return previous
+            entries[key] = entry
+            if previous is None:
+                self._size += 1
+                grams = self._grams.setdefault(lang_pair, {})
+                for gram in char_grams(entry.form):
+                    grams.setdefault(gram, set()).add(key)
+                if self._size > self.max_entries:
+                    self._evict()
+            return entry
+
+    def _evict(self):
+        """Drop the least recently updated tenth of the entries; caller holds the lock"""
+        count = max(1, self.max_entries // 10)
+        oldest = sorted(
+            ((entry.updated, lang_pair, key) for lang_pair, entries in self._pairs.items()
+             for key, entry in entries.items()),
+            key=lambda item: item[0]
+        )[:count]
+        for _, lang_pair, key in oldest:
+            entry = self._pairs[lang_pair].pop(key)
+            grams = self._grams[lang_pair]
+            for gram in char_grams(entry.form):
+                posting = grams.get(gram)
+                if posting is not None:
+                    posting.discard(key)
+                    if not posting:
+                        del grams[gram]
+        self._size -= len(oldest)
+        self.stats['evicted'] += len(oldest)
+
+    def _append(self, records):
+        if not self.path:
+            return
+        data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records).encode('utf-8')
+        # One O_APPEND write per batch, so lines from concurrent workers never interleave
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            self._journal_failed('write', e)
+            return
+        # Lines are counted when refresh() reads them back, own appends included
+        with self._lock:
+            if self._journal_lines > max(1000, 2 * self._size):
+                self._compact()
+
+    def _compact(self):
+        """
+        Rewrite the journal with only the live entries; caller holds the lock.
+        The new file replaces the old one atomically and other workers re-read it from the
+        start. A line another worker appends during the swap is lost from the file, but
+        stays in that worker's memory and is written again when it next compacts.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix='.translation-memory-', dir=directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                pairs = [(pair, list(entries.values())) for pair, entries in self._pairs.items()]
+                for line in self._export_lines(pairs):
+                    f.write(line)
+            os.replace(temp_path, self.path)
+            stat = os.stat(self.path)
+        except OSError as e:
+            self._journal_failed('compaction', e)
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            return
+        self._inode = stat.st_ino
+        self._offset = stat.st_size
+        self._journal_lines = self._size
+        self.stats['compactions'] += 1
+
+    def refresh(self, force=False):
+        """Apply journal lines appended since the last read (by this or another worker)"""
+        if not self.path:
+            return 0
+        now = time.time()
+        if not force and now - self._last_refresh < self.refresh_interval:
+            return 0
+        self._last_refresh = now
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return 0
+        if stat.st_ino != self._inode:
+            # Another worker compacted the journal; read the new file from the start
+            with self._lock:
+                self._inode = stat.st_ino
+                self._offset = 0
+                self._journal_lines = 0
+        if stat.st_size <= self._offset:
+            return 0
+
+        applied = 0
+        with self._lock:
+            try:
+                with open(self.path, 'rb') as f:
+                    f.seek(self._offset)
+                    for line in f:
+                        # A half-written last line is picked up on the next refresh
+                        if not line.endswith(b'\n'):
+                            break
+                        self._offset += len(line)
+                        self._journal_lines += 1
+                        try:
+                            record = json.loads(line)
+                            self._index_record(record, record.get('origin', 'import'))
+                            applied += 1
+                        except (ValueError, KeyError, TypeError):
+                            self.stats['journal_errors'] += 1
+            except OSError as e:
+                self._journal_failed('read', e)
+        return applied
+
+    def _index_record(self, record, origin):
+        entry = MemoryEntry(
+            record['source'], record['translation'],
+            float(record.get('confidence', 0.9)), origin,
+            model=record.get('model'), updated=record.get('updated')
+        )
+        return self._index(record['source_language'], record['target_language'], entry)
+
+    def record(self, source_lang, target_lang, source_text, translation, confidence, model=None):
+        """Remember one model translation"""
+        if source_lang == 'auto' or not source_text.strip() or not translation:
+            return
+        entry = self._index(source_lang, target_lang, MemoryEntry(
+            source_text, translation, confidence, 'model', model=model))
+        with self._lock:
+            self.stats['stored'] += 1
+        self._append([entry.to_record(source_lang, target_lang)])
+
+    def import_records(self, items):
+        """
+        Add records shaped like export() lines; returns (imported, errors).
+        Items may be dicts or exceptions standing in for unparseable lines.
+        """
+        imported = []
+        errors = []
+        for position, item in enumerate(items, 1):
+            try:
+                if isinstance(item, Exception):
+                    raise item
+                if not isinstance(item, dict):
+                    raise ValueError('expected a JSON object')
+                entry = self._index_record(item, 'import')
+                imported.append(entry.to_record(item['source_language'], item['target_language']))
+            except (ValueError, KeyError, TypeError) as e:
+                errors.append({'item': position, 'error': str(e) if not isinstance(e, KeyError) else f'missing {e}'})
+        self._append(imported)
+        with self._lock:
+            self.stats['imported'] += len(imported)
+        return len(imported), errors
+
+    def export(self, lang_pair=None):
+        """Yield every entry as a JSONL line, optionally for one "src-tgt" pair"""
+        with self._lock:
+            pairs = [(pair, list(entries.values())) for pair, entries in self._pairs.items()
+                     if lang_pair is None or pair == lang_pair]
+        return self._export_lines(pairs)
+
+    @staticmethod
+    def _export_lines(pairs):
+        for pair, entries in pairs:
+            source_lang, target_lang = pair.split('-', 1)
+            for entry in entries:
+                yield json.dumps(entry.to_record(source_lang, target_lang), ensure_ascii=False) + '\n'
+
+    def search(self, text, source_lang, target_lang, limit=5, threshold=None, fuzzy=True):
+        """Best matches as [(entry, score)], best first; an exact match is returned alone"""
+        self.refresh()
+        lang_pair = f"{source_lang}-{target_lang}"
+        threshold = self.fuzzy_threshold if threshold is None else threshold
+        with self._lock:
+            entries = self._pairs.get(lang_pair)
+            if not entries:
+                return []
+            exact = entries.get(normalize_phrase(text))
+            if exact is not None:
+                return [(exact, 1.0)]
+            if not fuzzy:
+                return []
+
+            form = fuzzy_form(text)
+            if not form:
+                return []
+            index = self._grams.get(lang_pair, {})
+            # Each edit touches at most GRAM_SIZE grams, so a match within max_edits shares at
+            # least one of the query's GRAM_SIZE * max_edits + 1 rarest grams
+            max_edits = int(len(form) * (1.0 - threshold) / threshold)
+            query_grams = char_grams(form)
+            postings = sorted((index.get(gram, ()) for gram in query_grams), key=len)
+            prefix, rest = postings[:GRAM_SIZE * max_edits + 1], postings[GRAM_SIZE * max_edits + 1:]
+            if sum(len(posting) for posting in prefix) > PREFIX_BUDGET:
+                # Even the query's rarest grams are everywhere; there is no cheap way to narrow it
+                return []
+            overlap = Counter()
+            for posting in prefix:
+                overlap.update(posting)
+            shortest, longest = len(form) - max_edits, len(form) + max_edits
+            overlap = Counter({key: count for key, count in overlap.items()
+                               if shortest <= len(entries[key].form) <= longest})
+            if len(overlap) > MAX_SCAN:
+                overlap = Counter(dict(overlap.most_common(MAX_SCAN)))
+            # ...and all but GRAM_SIZE * max_edits of them overall. Common grams are not
+            # checked; they are assumed shared, which only loosens the filter
+            needed = len(query_grams) - GRAM_SIZE * max_edits
+            for posting in rest:
+                if len(posting) > COMMON_GRAM_LIMIT:
+                    needed -= 1
+                    continue
+                for key in overlap:
+                    if key in posting:
+                        overlap[key] += 1
+            candidates = [entries[key] for key, count in overlap.most_common(self.max_candidates) if count >= needed]
+
+        digits = DIGITS.findall(form)
+        matches = []
+        for entry in candidates:
+            if entry.digits != digits:
+                continue
+            longest = max(len(form), len(entry.form))
+            max_distance = int(longest * (1.0 - threshold))
+            distance = edit_distance(form, entry.form, max_distance)
+            if distance <= max_distance:
+                matches.append((entry, 1.0 - distance / longest))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches[:limit]
+
+    def lookup(self, text, source_lang, target_lang):
+        """Translate result from memory, or None when nothing is close enough"""
+        if source_lang == 'auto':
+            return None
+        start_time = time.perf_counter()
+        matches = self.search(text, source_lang, target_lang, limit=1, fuzzy=self.fuzzy_enabled)
+        if not matches:
+            with self._lock:
+                self.stats['misses'] += 1
+            return None
+
+        entry, score = matches[0]
+        exact = score >= 1.0 and normalize_phrase(entry.source) == normalize_phrase(text)
+        with self._lock:
+            self.stats['exact_hits' if exact else 'fuzzy_hits'] += 1
+        result = {
+            'success': True,
+            'translation': entry.translation,
+            'confidence': entry.confidence * score,
+            'response_time': (time.perf_counter() - start_time) * 1000,
+            'source': 'translation_memory',
+            'memory_match': 'exact' if exact else 'fuzzy',
+            'match_score': round(score, 4)
+        }
+        if not exact:
+            result['matched_source'] = entry.source
+        return result
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = self._size
+            stats['language_pairs'] = len(self._pairs)
+            stats['journal_lines'] = self._journal_lines
+        lookups = stats['exact_hits'] + stats['fuzzy_hits'] + stats['misses']
+        stats.update({
+            'hit_rate': ((stats['exact_hits'] + stats['fuzzy_hits']) / lookups) if lookups else 0.0,
+            'path': self.path,
+            'fuzzy_enabled': self.fuzzy_enabled,
+            'fuzzy_threshold': self.fuzzy_threshold,
+            'max_entries': self.max_entries
+        })
+        return stats
+
+
+def default_memory_path():
+    return os.path.join(tempfile.gettempdir(), 'ai4bharat-translation-memory.jsonl')
+
+
+def create_translation_memory(path=None, **options):
+    """Translation memory seeded from SAMPLE_TRANSLATIONS and backed by a JSONL journal"""
+    return TranslationMemory(path or default_memory_path(), seed=SAMPLE_TRANSLATIONS, **options)